@@ -1,2 +1,3 @@
 __version__ = "0.0.2"
-from .core import *
\ No newline at end of file
+from .core import *
+from .batch import *
\ No newline at end of file
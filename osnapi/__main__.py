@@ -0,0 +1,25 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 14_main.ipynb (unless otherwise specified).
+
+__all__ = ['main']
+
+# Cell
+import sys
+
+# Internal Cell
+from typing import List, Tuple, Dict, Union, Optional, Callable
+
+# Cell
+def main(argv:List[str]=None):
+    """ The command line of osnapi. The first argument picks the command, the rest are passed on to it:
+            python -m osnapi harvest --help
+            python -m osnapi bench --quick
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    command, argv = (argv[0], argv[1:]) if argv else (None, [])
+    # only the module of the command is imported, so each one starts as quickly as it can
+    if command == 'harvest': from .harvest import main as run
+    elif command == 'bench': from .bench import main as run
+    else: raise SystemExit('usage: python -m osnapi {harvest,bench} [--help]')
+    run(argv)
+
+if __name__ == '__main__' and 'ipykernel' not in sys.modules: main() # not when the notebook itself is run
\ No newline at end of file
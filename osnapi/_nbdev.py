@@ -8,33 +8,157 @@ index = {"Sensor": "00_core.ipynb",
          "License": "00_core.ipynb",
          "Settings": "00_core.ipynb",
          "retry_on": "00_core.ipynb",
+         "new_session": "01_aio.ipynb",
+         "get_session": "01_aio.ipynb",
+         "get_transport": "00_core.ipynb",
+         "close_session": "01_aio.ipynb",
          "generate_headers": "00_core.ipynb",
+         "token_expiry": "00_core.ipynb",
+         "set_token": "00_core.ipynb",
+         "token_needs_refresh": "00_core.ipynb",
+         "refresh_token": "00_core.ipynb",
+         "RequestTimeoutError": "00_core.ipynb",
+         "ConnectFailed": "00_core.ipynb",
+         "CircuitOpenError": "00_core.ipynb",
+         "RetryPolicy": "00_core.ipynb",
+         "endpoint_template": "00_core.ipynb",
+         "connection_error": "00_core.ipynb",
+         "parse_retry_after": "00_core.ipynb",
+         "Settings.retry_policy": "00_core.ipynb",
+         "RateLimiter": "00_core.ipynb",
+         "observe": "00_core.ipynb",
+         "record": "00_core.ipynb",
+         "JSONCodec": "00_core.ipynb",
+         "Settings.json_codec": "00_core.ipynb",
          "handle_response": "00_core.ipynb",
-         "send_get": "00_core.ipynb",
-         "send_post": "00_core.ipynb",
-         "send_delete": "00_core.ipynb",
+         "check_status": "00_core.ipynb",
+         "decode_body": "00_core.ipynb",
+         "send_request": "00_core.ipynb",
+         "request_key": "00_core.ipynb",
+         "get_body": "00_core.ipynb",
+         "Flight": "00_core.ipynb",
+         "coalesced_get": "00_core.ipynb",
+         "send_get": "01_aio.ipynb",
+         "send_post": "01_aio.ipynb",
+         "compress_body": "00_core.ipynb",
+         "send_delete": "01_aio.ipynb",
          "build_query": "00_core.ipynb",
-         "login": "00_core.ipynb",
-         "getSensors": "00_core.ipynb",
-         "getSensor": "00_core.ipynb",
-         "addSensor": "00_core.ipynb",
-         "deleteSensor": "00_core.ipynb",
-         "mySensors": "00_core.ipynb",
-         "mySensorIds": "00_core.ipynb",
-         "getFirstLastValueForSensor": "00_core.ipynb",
-         "getValues": "00_core.ipynb",
-         "getValuesForSensor": "00_core.ipynb",
-         "addValue": "00_core.ipynb",
-         "addMultipleValues": "00_core.ipynb",
-         "profile": "00_core.ipynb",
-         "getMeasurands": "00_core.ipynb",
-         "getMeasurand": "00_core.ipynb",
-         "getLicenses": "00_core.ipynb",
-         "getLicense": "00_core.ipynb",
-         "getUnits": "00_core.ipynb",
-         "getUnit": "00_core.ipynb"}
+         "parse_timestamp": "00_core.ipynb",
+         "format_timestamp": "00_core.ipynb",
+         "login": "01_aio.ipynb",
+         "getSensors": "01_aio.ipynb",
+         "getSensor": "01_aio.ipynb",
+         "addSensor": "01_aio.ipynb",
+         "deleteSensor": "01_aio.ipynb",
+         "mySensors": "01_aio.ipynb",
+         "mySensorIds": "01_aio.ipynb",
+         "getFirstLastValueForSensor": "01_aio.ipynb",
+         "getValues": "01_aio.ipynb",
+         "getValuesForSensor": "01_aio.ipynb",
+         "addValue": "01_aio.ipynb",
+         "addMultipleValues": "01_aio.ipynb",
+         "profile": "01_aio.ipynb",
+         "getMeasurands": "01_aio.ipynb",
+         "getMeasurand": "01_aio.ipynb",
+         "getLicenses": "01_aio.ipynb",
+         "getLicense": "01_aio.ipynb",
+         "getUnits": "01_aio.ipynb",
+         "getUnit": "01_aio.ipynb",
+         "set_session": "01_aio.ipynb",
+         "map_ids": "02_batch.ipynb",
+         "getSensorsByIds": "02_batch.ipynb",
+         "getFirstLastValueForSensors": "02_batch.ipynb",
+         "getValuesForSensors": "02_batch.ipynb",
+         "split_tile": "02_batch.ipynb",
+         "clip_polygon": "02_batch.ipynb",
+         "Tile": "02_batch.ipynb",
+         "split_task": "02_batch.ipynb",
+         "merge_sensors": "02_batch.ipynb",
+         "getValuesTiled": "02_batch.ipynb",
+         "ChunkSize": "03_ingest.ipynb",
+         "chunk_values": "03_ingest.ipynb",
+         "split_chunk": "03_ingest.ipynb",
+         "post_chunk": "03_ingest.ipynb",
+         "addValuesInChunks": "03_ingest.ipynb",
+         "ValueWriter": "03_ingest.ipynb",
+         "time_windows": "04_stream.ipynb",
+         "prefetch": "04_stream.ipynb",
+         "iter_json_array": "04_stream.ipynb",
+         "stream_get": "04_stream.ipynb",
+         "streamSensors": "04_stream.ipynb",
+         "streamMySensors": "04_stream.ipynb",
+         "iterValuesForSensor": "04_stream.ipynb",
+         "iterValues": "04_stream.ipynb",
+         "streamValues": "04_stream.ipynb",
+         "values_to_columns": "05_columnar.ipynb",
+         "to_columns": "05_columnar.ipynb",
+         "to_dataframe": "05_columnar.ipynb",
+         "as_columnar": "05_columnar.ipynb",
+         "ReferenceCache": "06_cache.ipynb",
+         "ResponseCache": "06_cache.ipynb",
+         "ValueStore": "07_store.ipynb",
+         "distance": "08_geo.ipynb",
+         "to_points": "08_geo.ipynb",
+         "in_polygon": "08_geo.ipynb",
+         "Grid": "08_geo.ipynb",
+         "SensorCatalog": "08_geo.ipynb",
+         "Histogram": "09_metrics.ipynb",
+         "Metrics": "09_metrics.ipynb",
+         "TracingHook": "09_metrics.ipynb",
+         "MockError": "10_mock.ipynb",
+         "MockServer": "10_mock.ipynb",
+         "percentile": "11_bench.ipynb",
+         "measure": "11_bench.ipynb",
+         "default_scenarios": "11_bench.ipynb",
+         "run_benchmarks": "11_bench.ipynb",
+         "format_results": "11_bench.ipynb",
+         "start": "11_bench.ipynb",
+         "imported": "11_bench.ipynb",
+         "done": "11_bench.ipynb",
+         "startup_benchmarks": "11_bench.ipynb",
+         "format_startup": "11_bench.ipynb",
+         "footprint_benchmarks": "11_bench.ipynb",
+         "format_footprint": "11_bench.ipynb",
+         "main": "14_main.ipynb",
+         "window_starts": "12_aggregate.ipynb",
+         "aggregate_columns": "12_aggregate.ipynb",
+         "aggregate": "12_aggregate.ipynb",
+         "write_columns": "13_harvest.ipynb",
+         "read_columns": "13_harvest.ipynb",
+         "load_checkpoint": "13_harvest.ipynb",
+         "harvest_shard": "13_harvest.ipynb",
+         "harvest": "13_harvest.ipynb",
+         "load_harvest": "13_harvest.ipynb",
+         "timed_adapter": "15_transport.ipynb",
+         "RequestsTransport": "15_transport.ipynb",
+         "RequestsResponse": "15_transport.ipynb",
+         "TimedHTTPConnection": "15_transport.ipynb",
+         "TimedHTTPSConnection": "15_transport.ipynb",
+         "HTTPClientTransport": "15_transport.ipynb",
+         "HTTPClientResponse": "15_transport.ipynb",
+         "Record": "16_records.ipynb",
+         "record_type": "16_records.ipynb",
+         "Values": "16_records.ipynb",
+         "to_records": "16_records.ipynb",
+         "to_dicts": "16_records.ipynb"}
 
-modules = ["core.py"]
+modules = ["core.py",
+           "aio.py",
+           "batch.py",
+           "ingest.py",
+           "stream.py",
+           "columnar.py",
+           "cache.py",
+           "store.py",
+           "geo.py",
+           "metrics.py",
+           "mock.py",
+           "bench.py",
+           "aggregate.py",
+           "harvest.py",
+           "__main__.py",
+           "transport.py",
+           "records.py"]
 
 doc_url = "https://flpeters.github.io/osnapi/"
 
@@ -0,0 +1,173 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 12_aggregate.ipynb (unless otherwise specified).
+
+__all__ = ['window_starts', 'aggregate_columns', 'aggregate']
+
+# Cell
+try: import numpy as np
+except ImportError as e: raise ImportError('osnapi.aggregate needs numpy: pip install osnapi[numpy]') from e
+from datetime import timedelta
+from .columnar import values_to_columns
+from .records import Record, Values, to_records
+
+# Internal Cell
+from typing import List, Tuple, Dict, Union, Optional, Callable, Iterable
+from .core import SensorWithValue, Value
+
+# Cell
+#######################################
+#               WINDOWS               #
+#######################################
+
+# Internal Cell
+_ranges = {'minute': 60_000, 'hour': 3_600_000, 'day': 86_400_000, 'week': 7 * 86_400_000,
+           'month': None, 'year': None}
+_range_aliases = {'minutely': 'minute', 'hourly': 'hour', 'daily': 'day', 'weekly': 'week',
+                  'monthly': 'month', 'yearly': 'year'}
+_monday = 3 * 86_400_000 # 1970-01-01 was a Thursday, so weeks counted from the epoch start on Thursdays
+
+def _range(every:Union[str, timedelta]) -> Union[str, int]:
+    """The name of a calendar range, or the length of a fixed window in milliseconds"""
+    if isinstance(every, timedelta):
+        ms = round(every.total_seconds() * 1000)
+        if ms <= 0: raise Exception(f'The window has to be longer than 0, not {every}')
+        return ms
+    name = str(every).strip().lower()
+    name = _range_aliases.get(name, name)
+    if name not in _ranges:
+        raise Exception(f'Unknown aggregation range {every!r}, use one of {", ".join(_ranges)} or a timedelta')
+    return name
+
+# Cell
+def window_starts(timestamps:np.ndarray, every:Union[str, timedelta]) -> np.ndarray:
+    """ The start of the window each of timestamps falls into, as datetime64[ms] (in UTC).
+        every is a calendar range ('minute', 'hour', 'day', 'week', 'month' or 'year'), where weeks start on Monday,
+        or a timedelta for fixed windows, which are counted from 1970-01-01, e.g. 15 minutes start at :00, :15, ...
+    """
+    timestamps = np.asarray(timestamps, dtype='datetime64[ms]')
+    every = _range(every)
+    if every == 'month': return timestamps.astype('datetime64[M]').astype('datetime64[ms]')
+    if every == 'year':  return timestamps.astype('datetime64[Y]').astype('datetime64[ms]')
+    size, offset = (every, 0) if isinstance(every, int) else (_ranges[every], _monday if every == 'week' else 0)
+    ms = timestamps.view('int64')
+    return ((ms + offset) // size * size - offset).view('datetime64[ms]')
+
+# Cell
+#######################################
+#             AGGREGATING             #
+#######################################
+
+# Internal Cell
+_hows = ('min', 'max', 'mean', 'sum', 'count', 'first', 'last')
+_how_aliases = {'avg': 'mean', 'average': 'mean', 'minimum': 'min', 'maximum': 'max'}
+
+def _how(how:str) -> str:
+    name = _how_aliases.get(how.strip().lower(), how.strip().lower())
+    if name not in _hows: raise Exception(f'Unknown aggregation type {how!r}, use one of {", ".join(_hows)}')
+    return name
+
+def _reduce(numbers:np.ndarray, starts:np.ndarray, how:str) -> np.ndarray:
+    """Reduce the segments of numbers that begin at starts (sorted, the first one 0) with how"""
+    if how == 'min':   return np.minimum.reduceat(numbers, starts)
+    if how == 'max':   return np.maximum.reduceat(numbers, starts)
+    if how == 'sum':   return np.add.reduceat(numbers, starts)
+    if how == 'first': return numbers[starts]
+    ends = np.append(starts[1:], len(numbers))
+    if how == 'last':  return numbers[ends - 1]
+    counts = ends - starts
+    if how == 'count': return counts
+    return np.add.reduceat(numbers, starts) / counts
+
+def _aggregate_many(columns:List[Dict[str, np.ndarray]], every:Union[str, timedelta],
+                    hows:Tuple[str, ...]) -> List[Dict[str, np.ndarray]]:
+    """ Aggregate the columns of many Sensors in one go: all values are sorted by (Sensor, time),
+        and every run of values with the same Sensor and window is reduced with each of hows.
+    """
+    lengths = [len(c['numberValue']) for c in columns]
+    if not sum(lengths):
+        empty = {h: np.array([], dtype=np.int64 if h == 'count' else np.float64) for h in hows}
+        return [{'timestamp': np.array([], dtype='datetime64[ms]'), **empty} for _ in columns]
+    group = np.repeat(np.arange(len(columns)), lengths)
+    timestamps = np.concatenate([np.asarray(c['timestamp'], dtype='datetime64[ms]') for c in columns])
+    numbers = np.concatenate([np.asarray(c['numberValue'], dtype=np.float64) for c in columns])
+    ms = timestamps.view('int64')
+    if not np.all((ms[1:] >= ms[:-1]) | (group[1:] != group[:-1])): # values from the Server are sorted already
+        order = np.lexsort((ms, group))
+        group, timestamps, numbers = group[order], timestamps[order], numbers[order]
+    windows = window_starts(timestamps, every).view('int64')
+    starts = np.flatnonzero(np.r_[True, (group[1:] != group[:-1]) | (windows[1:] != windows[:-1])])
+    reduced = {h: _reduce(numbers, starts, h) for h in hows}
+    # the segments are sorted by Sensor, so each Sensor's windows are one slice of them
+    bounds = np.searchsorted(group[starts], np.arange(len(columns) + 1))
+    return [{'timestamp': windows[starts[a:b]].view('datetime64[ms]'), **{h: r[a:b] for h, r in reduced.items()}}
+            for a, b in zip(bounds[:-1], bounds[1:])]
+
+# Cell
+def aggregate_columns(columns:Dict[str, np.ndarray], every:Union[str, timedelta],
+                      how:Union[str, Iterable[str]]='mean') -> Dict[str, np.ndarray]:
+    """ Aggregate the values of one Sensor, given as columns (see osnapi.columnar), into windows.
+        how is one of 'min', 'max', 'mean' (or 'avg'), 'sum', 'count', 'first' or 'last', or a List of them.
+        See aggregate() for the details.
+
+        Output:
+            - {'timestamp': the start of each window that has values, 'numberValue': the aggregate of each window}
+              If how is a List, there is one array per aggregation type instead of 'numberValue'.
+        Example:
+            aggregate_columns(getValuesForSensor(14, columnar=True), 'day', how=['min', 'max'])
+    """
+    hows = (_how(how),) if isinstance(how, str) else tuple(_how(h) for h in how)
+    result = _aggregate_many([columns], every, hows)[0]
+    if isinstance(how, str): result['numberValue'] = result.pop(hows[0])
+    return result
+
+# Internal Cell
+def _to_values(columns:Dict[str, np.ndarray], like:Union[List[Value], Values]) -> Union[List[Value], Values]:
+    """columns as Values in the form of like: a List of dicts, a List of Records, or Values"""
+    if isinstance(like, Values): return Values.from_columns(columns)
+    timestamps = np.datetime_as_string(columns['timestamp'], unit='ms', timezone='UTC').tolist()
+    values = [{'timestamp': t, 'numberValue': v} for t, v in zip(timestamps, columns['numberValue'].tolist())]
+    return to_records(values) if like and isinstance(like[0], Record) else values
+
+def _with_values(sensor:Union[SensorWithValue, Record], values) -> Union[SensorWithValue, Record]:
+    """A copy of sensor with other values, that is a Record if sensor is one"""
+    if isinstance(sensor, Record): return type(sensor)(*(values if f == 'values' else sensor[f] for f in sensor))
+    return {**sensor, 'values': values}
+
+# Cell
+def aggregate(data:Union[List[Value], SensorWithValue, List[SensorWithValue], Dict],
+              every:Union[str, timedelta], how:str='mean') -> Union[List[Value], SensorWithValue,
+                                                                     List[SensorWithValue], Dict]:
+    """ Aggregate raw values locally, like aggregationType and aggregationRange do on the Server,
+        so trying out other windows or aggregation types doesn't download the same values again.
+
+        Input:
+            - data: What the value functions return, or a part of it:
+              A List of Values, a Sensor with values, a List of Sensors, or the columnar form of any of them.
+            - every: 'minute', 'hour', 'day', 'week' (starting on Monday), 'month' or 'year', in UTC,
+              or a timedelta for windows of that length, counted from 1970-01-01.
+            - how: 'min', 'max', 'mean' (or 'avg'), 'sum', 'count', 'first' or 'last'.
+        Note: Each window is reported with the timestamp of its start, oldest first.
+              Windows without values are left out.
+              All Sensors are aggregated together in a single vectorized pass.
+        Output:
+            - data in the same form, with one value per window. Sensors keep their other attributes.
+              Records and Values (see Settings.records) stay Records and Values.
+        Example:
+            raw = getValuesForSensor(14, minTimestamp='2019-11-01', columnar=True)
+            hourly = aggregate(raw, 'hour')
+            daily_max = aggregate(raw, 'day', how='max')   # no new request
+    """
+    how = _how(how)
+    if isinstance(data, dict) and 'numberValue' in data: # the columns of one Sensor
+        return aggregate_columns(data, every, how)
+    if isinstance(data, dict) and 'values' not in data:  # Sensor ids mapped to their columns
+        ids = list(data)
+        return {id: {'timestamp': r['timestamp'], 'numberValue': r[how]}
+                for id, r in zip(ids, _aggregate_many([data[id] for id in ids], every, (how,)))}
+    if isinstance(data, (dict, Record)):                 # a Sensor with values
+        return aggregate([data], every, how)[0]
+    if isinstance(data, Values) or (data and 'values' not in data[0]): # a List of Values
+        return _to_values(aggregate_columns(values_to_columns(data), every, how), data)
+    values = [s.get('values', []) for s in data]
+    results = _aggregate_many([values_to_columns(v) for v in values], every, (how,))
+    return [_with_values(s, _to_values({'timestamp': r['timestamp'], 'numberValue': r[how]}, v))
+            for s, v, r in zip(data, values, results)]
\ No newline at end of file
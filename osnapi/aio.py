@@ -0,0 +1,481 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 01_aio.ipynb (unless otherwise specified).
+
+__all__ = ['new_session', 'set_session', 'close_session', 'login', 'getSensors', 'getSensor', 'addSensor',
+           'deleteSensor', 'mySensors', 'mySensorIds', 'getFirstLastValueForSensor', 'getValues', 'getValuesForSensor',
+           'addValue', 'addMultipleValues', 'profile', 'getMeasurands', 'getMeasurand', 'getLicenses', 'getLicense',
+           'getUnits', 'getUnit']
+
+# Cell
+import time
+import asyncio
+try: import aiohttp
+except ImportError as e: raise ImportError('osnapi.aio needs aiohttp: pip install osnapi[aio]') from e
+from collections import defaultdict
+from .core import Settings, generate_headers, check_status, build_query, set_token, token_needs_refresh, request_key
+from .core import observe, decode_body, compress_body, _records
+
+# Internal Cell
+from typing import List, Tuple, Dict, Union, Optional, Callable
+from .core import Sensor, SensorWithValue, Value, Measurand, Unit, License
+
+# Cell
+#######################################
+#               HELPERS               #
+#######################################
+
+# Cell
+def new_session(limit:int=None, limit_per_host:int=0, keep_alive:bool=None) -> aiohttp.ClientSession:
+    """ Create an aiohttp.ClientSession with a connection pool, configured by the Settings.
+        limit is the total number of connections, and defaults to Settings.max_concurrency.
+        limit_per_host of 0 means no extra limit per host.
+        Note: Has to be called from within a running event loop.
+    """
+    if limit      is None: limit      = Settings.max_concurrency
+    if keep_alive is None: keep_alive = Settings.keep_alive
+    connector = aiohttp.TCPConnector(limit=limit, limit_per_host=limit_per_host, force_close=not keep_alive)
+    return aiohttp.ClientSession(connector=connector, timeout=_client_timeout(), trace_configs=[_connect_timer()])
+
+# Internal Cell
+def _client_timeout() -> aiohttp.ClientTimeout:
+    """Translate Settings.timeout, which follows the requests conventions, into an aiohttp.ClientTimeout"""
+    timeout = Settings.timeout
+    if timeout is None: return aiohttp.ClientTimeout(total=None)
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    return aiohttp.ClientTimeout(total=None, sock_connect=connect, sock_read=read)
+
+# Internal Cell
+def _connect_timer() -> aiohttp.TraceConfig:
+    """Adds the time it takes to open a connection to the info of the request, see osnapi.core.observe()"""
+    async def on_start(session, context, params): context.connect_start = time.perf_counter()
+    async def on_end(session, context, params):
+        if context.trace_request_ctx is not None:
+            context.trace_request_ctx['connect'] += time.perf_counter() - context.connect_start
+    config = aiohttp.TraceConfig()
+    config.on_connection_create_start.append(on_start)
+    config.on_connection_create_end.append(on_end)
+    return config
+
+# Internal Cell
+_session, _semaphore, _loop, _token_lock = None, None, None, None
+
+def get_session() -> aiohttp.ClientSession:
+    """ Return the ClientSession shared by all requests on the current event loop.
+        A new one is created if there is none yet, or if it belongs to a different loop.
+    """
+    loop = asyncio.get_event_loop()
+    if _session is None or _session.closed or _loop is not loop:
+        set_session(new_session())
+    return _session
+
+# Cell
+def set_session(session:aiohttp.ClientSession):
+    """ Use session for all following requests made on the current event loop.
+        This also resets the limit of concurrent requests to Settings.max_concurrency.
+    """
+    global _session, _semaphore, _loop, _token_lock
+    _session, _loop = session, asyncio.get_event_loop()
+    _semaphore = asyncio.Semaphore(Settings.max_concurrency)
+    _token_lock = asyncio.Lock()
+
+# Cell
+async def close_session():
+    """Close the shared ClientSession and all of its connections."""
+    global _session, _semaphore, _loop, _token_lock
+    session, _session, _semaphore, _loop, _token_lock = _session, None, None, None, None
+    if session is not None: await session.close()
+
+# Internal Cell
+async def _try_login(stale:Optional[str], info:Dict=None) -> bool:
+    """ Attempts to re-authenticate by using stored Settings, because the token stale didn't work (anymore).
+        Like osnapi.core.refresh_token(), only one task logs in, and the others wait for it and use the new token.
+        If this task logs in itself, that's counted in info['token_refreshes'].
+    """
+    get_session()
+    async with _token_lock:
+        if Settings.auth_token != stale and Settings.auth_token is not None: return True
+        if not (Settings.username and Settings.password): return False
+        if info is not None: info['token_refreshes'] += 1
+        try: await login(Settings.username, Settings.password)
+        except: return False
+        else: return True
+
+try:    from aiohttp import compression_utils as _compression
+except ImportError: _compression = None # older versions, only ask for gzip and deflate
+_accept_encoding = ','.join(['gzip', 'deflate'] + ['br'] * getattr(_compression, 'HAS_BROTLI', False)
+                            + ['zstd'] * getattr(_compression, 'HAS_ZSTD', False)) # the encodings aiohttp can decode
+
+def _decode(raw:bytes, info:Dict=None) -> Union[Dict, str]:
+    start = time.perf_counter()
+    try: return decode_body(raw)
+    finally:
+        if info is not None: info['decode'] += time.perf_counter() - start
+
+async def _send(method:str, query:str, body:Dict=None, requires_auth:bool=False, retries:int=1,
+                info:Dict=None) -> bytes:
+    """ Sends an HTTP request, at most Settings.max_concurrency at the same time,
+        and returns the raw body of the response. Raises like check_status() if the status code is not 200.
+        Like the send_* functions in osnapi.core, failures are retried according to Settings.retry_policy,
+        and a PermissionError triggers a login and one retry. retries is the number of logins to try.
+        info collects timings and sizes of the request, see osnapi.core.observe().
+    """
+    session, policy, attempt, again, probe = get_session(), Settings.retry_policy, 0, False, False
+    data, encoding = (None, {}) if body is None else compress_body(Settings.json_codec.encode(body))
+    if info is None: info = defaultdict(float)
+    try:
+        while True:
+            if requires_auth and token_needs_refresh(): await _try_login(Settings.auth_token, info)
+            token = Settings.auth_token if requires_auth else None
+            # the login retry below is the same request, which passed the circuit already
+            if policy is not None and not again: probe = policy.before(query)
+            again = False
+            if attempt: info['retries'] += 1
+            limiter = Settings.rate_limiter
+            try:
+                async with _semaphore:
+                    if limiter is not None: started = await limiter.acquire_async()
+                    try:
+                        sent, connected = time.perf_counter(), info['connect']
+                        request_headers = {**generate_headers(requires_auth), 'accept-encoding': _accept_encoding,
+                                           **encoding}
+                        async with session.request(method, query, data=data, headers=request_headers,
+                                                   trace_request_ctx=info) as response:
+                            status, headers, first = response.status, response.headers, time.perf_counter()
+                            raw = await response.read()
+                    except BaseException as e:
+                        broken = isinstance(e, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+                        if limiter is not None: limiter.release(started, error=broken)
+                        raise
+                    if limiter is not None: limiter.release(started, status)
+                info['status'] = status
+                info['ttfb'] += max(0.0, first - sent - (info['connect'] - connected))
+                info['download'] += time.perf_counter() - first
+                info['request_bytes'] += len(data or b'')
+                info['response_bytes'] += int(headers.get('Content-Length', len(raw))) # before decompression
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                kind = 'connect' if isinstance(e, aiohttp.ClientConnectorError) else 'connection'
+                wait = None if policy is None else policy.delay(query, method, attempt, error=kind)
+                if wait is None: raise
+            else:
+                wait = None
+                if policy is not None and status in policy.retry_statuses:
+                    wait = policy.delay(query, method, attempt, status, headers)
+                elif policy is not None: policy.success(query)
+                if wait is None:
+                    if status == 200: return raw
+                    try: check_status(query, status, _decode(raw))
+                    except PermissionError:
+                        if retries > 0 and await _try_login(token, info):
+                            retries -= 1
+                            again = True
+                            continue
+                        raise
+            attempt += 1
+            await asyncio.sleep(wait)
+    finally:
+        if probe: policy.probed(query)
+
+_flights = {} # request_key() -> (asyncio.Future, loop.time() when it finished, or None)
+
+async def _get(query:str, requires_auth:bool, info:Dict) -> bytes:
+    """ Sends a GET request and returns the raw body of the response.
+        If Settings.coalesce_gets is set, and the same request is in flight already, waits for that one instead.
+    """
+    if not Settings.coalesce_gets: return await _send('GET', query, requires_auth=requires_auth, info=info)
+    key, loop, memo = request_key(query, requires_auth), asyncio.get_event_loop(), Settings.coalesce_memo
+    future, finished = _flights.get(key, (None, None))
+    if future is not None and future.get_loop() is not loop: future = None
+    if finished is not None and loop.time() - finished > memo: future = None
+    leader = future is None
+    if leader:
+        future = loop.create_future()
+        _flights[key] = (future, None)
+        try: future.set_result(await _send('GET', query, requires_auth=requires_auth, info=info))
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e: future.set_exception(e)
+        except BaseException: # interrupted, so the followers send the request themselves
+            future.cancel()
+            raise
+        finally:
+            if memo and future.done() and not future.cancelled() and future.exception() is None:
+                _flights[key] = (future, loop.time())
+            elif _flights.get(key, (None,))[0] is future: del _flights[key]
+    else: info['source'] = 'coalesced'
+    try: return await asyncio.shield(future)
+    except asyncio.CancelledError:
+        if leader or not future.cancelled(): raise
+    return await _get(query, requires_auth, info) # the task that sent the request was cancelled, so send it again
+
+async def send_get(query:str, requires_auth:bool=False) -> Dict:
+    """ Sends an HTTP GET request using query as URL.
+        Like in osnapi.core, identical requests in flight at the same time share one download,
+        if Settings.coalesce_gets is set. Each caller gets its own copy of the result.
+    """
+    with observe('GET', query, local=False) as info:
+        return _decode(await _get(query, requires_auth, info), info)
+
+async def send_post(query:str, body:Dict, requires_auth:bool=False) -> Dict:
+    """ Sends an HTTP POST request using query as URL and body as json content.
+    """
+    with observe('POST', query, local=False) as info:
+        return _decode(await _send('POST', query, body, requires_auth=requires_auth, info=info), info)
+
+async def send_delete(query:str, requires_auth:bool=False) -> Dict:
+    """ Sends an HTTP DELETE request using query as URL.
+    """
+    with observe('DELETE', query, local=False) as info:
+        return _decode(await _send('DELETE', query, requires_auth=requires_auth, info=info), info)
+
+# Cell
+async def login(username:str, password:str) -> str:
+    """ HTTP: POST
+        Awaitable version of osnapi.core.login()
+    """
+    query = build_query(target='/users/login')
+    body = {'username': username, 'password': password}
+    token = _decode(await _send('POST', query, body, retries=0))['id'] # a failed login must not try to log in again
+    Settings.username, Settings.password = username, password
+    set_token(token)
+    return token
+
+# Cell
+#######################################
+#              SENSORS                #
+#######################################
+
+# Cell
+async def getSensors(measurandId:int=None,
+                     refPoint:List[float]=None,
+                     maxDistance:float=None,
+                     numNearest:int=None,
+                     boundingBox:List[float]=None,
+                     boundingPolygon:List[float]=None,
+                     minAccuracy:int=None,
+                     maxAccuracy:int=None,
+                     maxSensors:int=None,
+                     allowsDerivatives:bool=None,
+                     allowsRedistribution:bool=None,
+                     requiresAttribution:bool=None,
+                     requiresChangeNote:bool=None,
+                     requiresShareAlike:bool=None,
+                     requiresKeepOpen:bool=None) -> List[Sensor]:
+    """ HTTP: GET
+        Awaitable version of osnapi.core.getSensors()
+    """
+    args = locals()
+    query = build_query(target='/sensors', **args)
+    return _records(await send_get(query))
+
+# Cell
+async def getSensor(id:int) -> Sensor:
+    """ HTTP: GET
+        Awaitable version of osnapi.core.getSensor()
+    """
+    query = build_query(target=f'/sensors/{id}')
+    return _records(await send_get(query))
+
+# Cell
+async def addSensor(body:Sensor) -> Sensor:
+    """ HTTP: POST
+        Note: This function requires previous authentication.
+        Awaitable version of osnapi.core.addSensor()
+    """
+    query = build_query(target='/sensors/addSensor')
+    return _records(await send_post(query, body, requires_auth=True))
+
+# Cell
+async def deleteSensor(id:int) -> str:
+    """ HTTP: DELETE
+        Note: This function requires previous authentication.
+        Awaitable version of osnapi.core.deleteSensor()
+    """
+    query = build_query(target=f'/sensors/{id}')
+    return _records(await send_delete(query, requires_auth=True))
+
+# Cell
+async def mySensors() -> List[Sensor]:
+    """ HTTP: GET
+        Note: This function requires previous authentication.
+        Awaitable version of osnapi.core.mySensors()
+    """
+    query = build_query(target='/sensors/mysensors')
+    return _records(await send_get(query, requires_auth=True))
+
+# Cell
+async def mySensorIds() -> List[int]:
+    """ HTTP: GET
+        Note: This function requires previous authentication.
+        Awaitable version of osnapi.core.mySensorIds()
+    """
+    query = build_query(target='/sensors/mysensorids')
+    return _records(await send_get(query, requires_auth=True))
+
+# Cell
+#######################################
+#                VALUES               #
+#######################################
+
+# Cell
+async def getFirstLastValueForSensor(id:int,
+                                     first:bool,
+                                     last:bool) -> SensorWithValue:
+    """ HTTP: GET
+        Awaitable version of osnapi.core.getFirstLastValueForSensor()
+    """
+    if first and last:
+        query = build_query(target=f'/sensors/{id}/values/firstlast')
+    elif first:
+        query = build_query(target=f'/sensors/{id}/values/first')
+    elif last:
+        query = build_query(target=f'/sensors/{id}/values/last')
+    else:
+        raise Exception(f'At least one of the options has to be true:\
+        \nfirst: {first}\nlast: {last}')
+    return _records(await send_get(query))
+
+# Cell
+async def getValues(measurandId:int=None,
+                    refPoint:List[float]=None,
+                    maxDistance:float=None,
+                    boundingBox:List[float]=None,
+                    boundingPolygon:List[float]=None,
+                    maxSensors:int=None,
+                    minTimestamp:str=None,
+                    maxTimestamp:str=None,
+                    aggregationType:str=None,
+                    aggregationRange:str=None,
+                    minValue:float=None,
+                    maxValue:float=None,
+                    allowsDerivatives:bool=None,
+                    allowsRedistribution:bool=None,
+                    requiresAttribution:bool=None,
+                    requiresChangeNote:bool=None,
+                    requiresShareAlike:bool=None,
+                    requiresKeepOpen:bool=None) -> List[SensorWithValue]:
+    """ HTTP: GET
+        Awaitable version of osnapi.core.getValues()
+    """
+    args = locals()
+    query = build_query(target='/values', **args)
+    return _records(await send_get(query))
+
+# Cell
+async def getValuesForSensor(id:int,
+                             minTimestamp:str=None,
+                             maxTimestamp:str=None,
+                             aggregationType:str=None,
+                             aggregationRange:str=None,
+                             minValue:float=None,
+                             maxValue:float=None) -> SensorWithValue:
+    """ HTTP: GET
+        Awaitable version of osnapi.core.getValuesForSensor()
+    """
+    args = locals()
+    query = build_query(target=f'/sensors/{args.pop("id")}/values', **args)
+    return _records(await send_get(query))
+
+# Cell
+async def addValue(body:Value) -> str:
+    """ HTTP: POST
+        Note: This function requires previous authentication.
+        Awaitable version of osnapi.core.addValue()
+    """
+    query = build_query(target='/sensors/addValue')
+    return _records(await send_post(query, body, requires_auth=True))
+
+# Cell
+async def addMultipleValues(body:Dict[str, List[Value]]) -> str:
+    """ HTTP: POST
+        Note: This function requires previous authentication.
+        Awaitable version of osnapi.core.addMultipleValues()
+    """
+    query = build_query(target='/sensors/addMultipleValues')
+    return _records(await send_post(query, body, requires_auth=True))
+
+# Cell
+#######################################
+#                USERS                #
+#######################################
+
+# Cell
+async def profile() -> List[Dict[str, Union[str, int]]]:
+    """ HTTP: GET
+        Note: This function requires previous authentication.
+        Awaitable version of osnapi.core.profile()
+    """
+    query = build_query(target='/users/profile')
+    return _records(await send_get(query, requires_auth=True))
+
+# Cell
+#######################################
+#              MEASURANDS             #
+#######################################
+
+# Cell
+async def getMeasurands(name:str=None) -> List[Measurand]:
+    """ HTTP: GET
+        Awaitable version of osnapi.core.getMeasurands()
+    """
+    args = locals()
+    query = build_query(target='/measurands', **args)
+    return _records(await send_get(query))
+
+# Cell
+async def getMeasurand(id:int) -> Measurand:
+    """ HTTP: GET
+        Awaitable version of osnapi.core.getMeasurand()
+    """
+    query = build_query(target=f'/measurands/{id}')
+    return _records(await send_get(query))
+
+# Cell
+#######################################
+#               LICENSES              #
+#######################################
+
+# Cell
+async def getLicenses(shortName:str=None,
+                      allowsDerivatives:bool=None,
+                      allowsRedistribution:bool=None,
+                      requiresAttribution:bool=None,
+                      requiresChangeNote:bool=None,
+                      requiresShareAlike:bool=None,
+                      requiresKeepOpen:bool=None) -> List[License]:
+    """ HTTP: GET
+        Awaitable version of osnapi.core.getLicenses()
+    """
+    args = locals()
+    query = build_query(target='/licenses', **args)
+    return _records(await send_get(query))
+
+# Cell
+async def getLicense(id:int) -> License:
+    """ HTTP: GET
+        Awaitable version of osnapi.core.getLicense()
+    """
+    query = build_query(target=f'/licenses/{id}')
+    return _records(await send_get(query))
+
+# Cell
+#######################################
+#                UNITS                #
+#######################################
+
+# Cell
+async def getUnits(name:str=None,
+                   measurandId:int=None) -> List[Unit]:
+    """ HTTP: GET
+        Awaitable version of osnapi.core.getUnits()
+    """
+    args = locals()
+    query = build_query(target='/units', **args)
+    return _records(await send_get(query))
+
+# Cell
+async def getUnit(id:int) -> Unit:
+    """ HTTP: GET
+        Awaitable version of osnapi.core.getUnit()
+    """
+    query = build_query(target=f'/units/{id}')
+    return _records(await send_get(query))
\ No newline at end of file
@@ -0,0 +1,285 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 02_batch.ipynb (unless otherwise specified).
+
+__all__ = ['getSensorsByIds', 'getFirstLastValueForSensors', 'getValuesForSensors', 'getValuesTiled']
+
+# Cell
+import math
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .core import Settings, RequestTimeoutError, getSensor, getValues, getValuesForSensor, getFirstLastValueForSensor
+
+# Internal Cell
+from typing import List, Tuple, Dict, Union, Optional, Callable, Iterable
+from datetime import datetime, timedelta, timezone
+from .core import Sensor, SensorWithValue, parse_timestamp, format_timestamp, _columnar
+
+# Cell
+#######################################
+#               HELPERS               #
+#######################################
+
+# Internal Cell
+def map_ids(func:Callable, ids:List[int], max_workers:int=None, **kwargs) -> Tuple[List, Dict[int, Exception]]:
+    """ Call func(id, **kwargs) for every id in ids, using a pool of at most max_workers threads.
+        max_workers defaults to Settings.pool_maxsize, so that every thread can keep its connection alive.
+        Returns the results in the same order as ids, with None for every id that failed,
+        and a Dict mapping each failed id to the Exception it raised.
+    """
+    if max_workers is None: max_workers = Settings.pool_maxsize
+    ids = list(ids)
+    results, errors = [None] * len(ids), {}
+    if not ids: return results, errors
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(ids))) as pool:
+        futures = [pool.submit(func, id, **kwargs) for id in ids]
+        for i, (id, future) in enumerate(zip(ids, futures)):
+            try: results[i] = future.result()
+            except Exception as e: errors[id] = e
+    return results, errors
+
+# Cell
+#######################################
+#              SENSORS                #
+#######################################
+
+# Cell
+def getSensorsByIds(ids:List[int], max_workers:int=None) -> Tuple[List[Optional[Sensor]], Dict[int, Exception]]:
+    """ HTTP: GET
+        Like getSensor(), but for many ids at once, using up to max_workers parallel requests.
+
+        Input:
+            - ids: The ids of the Sensors you want.
+            - max_workers: How many requests to send at the same time. Defaults to Settings.pool_maxsize
+        Note: A failing id does not stop the other ids from being requested.
+
+        Output:
+            - A List of Sensors, in the same order as ids. Failed ids have None in their place.
+            - A Dict mapping each failed id to the Exception that was raised for it.
+        Example:
+            ([{'id': 14, 'userId': 1, ...}, None],
+             {-1: Exception('Something went wrong with your request. ...')})
+    """
+    return map_ids(getSensor, ids, max_workers)
+
+# Cell
+#######################################
+#                VALUES               #
+#######################################
+
+# Cell
+def getFirstLastValueForSensors(ids:List[int],
+                                first:bool,
+                                last:bool,
+                                max_workers:int=None) -> Tuple[List[Optional[SensorWithValue]], Dict[int, Exception]]:
+    """ HTTP: GET
+        Like getFirstLastValueForSensor(), but for many ids at once, using up to max_workers parallel requests.
+
+        Input:
+            - ids: The ids of the Sensors you want to get values from
+            - first: whether or not to get their first value
+            - last:  whether or not to get their last value
+            - max_workers: How many requests to send at the same time. Defaults to Settings.pool_maxsize
+        Note: At least one of either first or last must be True, or both.
+        Note: A failing id does not stop the other ids from being requested.
+
+        Output:
+            - A List of Sensors with values, in the same order as ids. Failed ids have None in their place.
+            - A Dict mapping each failed id to the Exception that was raised for it.
+    """
+    if not (first or last):
+        raise Exception(f'At least one of the options has to be true:\
+        \nfirst: {first}\nlast: {last}')
+    return map_ids(getFirstLastValueForSensor, ids, max_workers, first=first, last=last)
+
+# Cell
+def getValuesForSensors(ids:List[int],
+                        minTimestamp:str=None,
+                        maxTimestamp:str=None,
+                        aggregationType:str=None,
+                        aggregationRange:str=None,
+                        minValue:float=None,
+                        maxValue:float=None,
+                        max_workers:int=None) -> Tuple[List[Optional[SensorWithValue]], Dict[int, Exception]]:
+    """ HTTP: GET
+        Like getValuesForSensor(), but for many ids at once, using up to max_workers parallel requests.
+
+        Input:
+            - ids: The ids of the Sensors you want to get values from
+            - max_workers: How many requests to send at the same time. Defaults to Settings.pool_maxsize
+        Note: All other parameters are optional, and are used for every id.
+        Note: A failing id does not stop the other ids from being requested.
+
+        Output:
+            - A List of Sensors with values, in the same order as ids. Failed ids have None in their place.
+            - A Dict mapping each failed id to the Exception that was raised for it.
+    """
+    return map_ids(getValuesForSensor, ids, max_workers,
+                   minTimestamp=minTimestamp, maxTimestamp=maxTimestamp,
+                   aggregationType=aggregationType, aggregationRange=aggregationRange,
+                   minValue=minValue, maxValue=maxValue)
+
+# Cell
+#######################################
+#                TILES                #
+#######################################
+
+# Internal Cell
+Tile = Tuple[float, float, float, float] # south, west, north, east
+_overlap = 1e-7 # degrees. Neighbouring tiles overlap by this, so Sensors right on their edge are in both.
+
+def split_tile(tile:Tile, rows:int, columns:int) -> List[Tile]:
+    """ Split tile (south, west, north, east) into rows x columns tiles of the same size.
+        Inner edges overlap by _overlap, the outer ones stay where they are.
+    """
+    south, west, north, east = tile
+    height, width = (north - south) / rows, (east - west) / columns
+    return [(max(south, south + r * height - _overlap), max(west, west + c * width - _overlap),
+             min(north, south + (r + 1) * height + _overlap), min(east, west + (c + 1) * width + _overlap))
+            for r in range(rows) for c in range(columns)]
+
+def clip_polygon(polygon:List[Tuple[float, float]], tile:Tile) -> List[Tuple[float, float]]:
+    """ The part of polygon that lies within tile (south, west, north, east), using Sutherland-Hodgman clipping.
+        Returns an empty List if they don't overlap.
+    """
+    south, west, north, east = tile
+    def _cross(p, q, axis, bound): # where the edge p -> q crosses the line axis == bound
+        t = (bound - p[axis]) / (q[axis] - p[axis])
+        return tuple(bound if a == axis else p[a] + t * (q[a] - p[a]) for a in (0, 1))
+    for axis, bound, keep in ((0, south, 1), (0, north, -1), (1, west, 1), (1, east, -1)):
+        points, polygon = polygon, []
+        for i, q in enumerate(points):
+            p = points[i - 1]
+            q_in, p_in = (q[axis] - bound) * keep >= 0, (p[axis] - bound) * keep >= 0
+            if q_in != p_in: polygon.append(_cross(p, q, axis, bound))
+            if q_in: polygon.append(q)
+    return polygon if len(polygon) >= 3 else []
+
+# Internal Cell
+def split_task(task:Dict, min_tile_size:float, min_window:Optional[timedelta]) -> List[Dict]:
+    """ Split the area or time range of a tile that was too large into smaller ones.
+        Area and time are split in turns, as long as they are larger than min_tile_size degrees / min_window.
+        min_window None means the time range can't be split. Returns an empty List if nothing can be split anymore.
+    """
+    south, west, north, east = task['tile']
+    start, stop = task['minTimestamp'], task['maxTimestamp']
+    area = max(north - south, east - west) > min_tile_size
+    time = (min_window is not None and start is not None and stop is not None
+            and parse_timestamp(stop) - parse_timestamp(start) > min_window)
+    if area and (task['depth'] % 2 == 0 or not time):
+        tiles = split_tile(task['tile'], 2 if north - south > min_tile_size else 1,
+                           2 if east - west > min_tile_size else 1)
+        tasks = [{**task, 'tile': t, 'polygon': task['polygon'] and clip_polygon(task['polygon'], t)} for t in tiles]
+        return [{**t, 'depth': task['depth'] + 1} for t in tasks if t['polygon'] is None or t['polygon']]
+    if time:
+        start, stop = parse_timestamp(start), parse_timestamp(stop)
+        middle = start + (stop - start) // 2
+        return [{**task, 'minTimestamp': format_timestamp(a), 'maxTimestamp': format_timestamp(b),
+                 'depth': task['depth'] + 1}
+                for a, b in ((start, middle), (middle + timedelta(milliseconds=1), stop))]
+    return []
+
+def merge_sensors(results:Iterable[List[SensorWithValue]]) -> List[SensorWithValue]:
+    """ Merge the Sensors of many getValues() results into one List, ordered by id.
+        Sensors found more than once are merged into one, with each of their values only once, oldest first.
+    """
+    sensors, values = {}, {}
+    for result in results:
+        for sensor in result:
+            sensors.setdefault(sensor['id'], sensor)
+            values.setdefault(sensor['id'], {}).update((v['timestamp'], v) for v in sensor.get('values', []))
+    # timestamps from the api all have the same format, so they sort like the times they stand for
+    return [{**sensors[id], 'values': [values[id][t] for t in sorted(values[id])]} for id in sorted(sensors)]
+
+# Cell
+def getValuesTiled(measurandId:int=None,
+                   boundingBox:List[float]=None,
+                   boundingPolygon:List[float]=None,
+                   minTimestamp:Union[str, datetime]=None,
+                   maxTimestamp:Union[str, datetime]=None,
+                   aggregationType:str=None,
+                   aggregationRange:str=None,
+                   minValue:float=None,
+                   maxValue:float=None,
+                   allowsDerivatives:bool=None,
+                   allowsRedistribution:bool=None,
+                   requiresAttribution:bool=None,
+                   requiresChangeNote:bool=None,
+                   requiresShareAlike:bool=None,
+                   requiresKeepOpen:bool=None,
+                   tile_size:float=2.0,
+                   window:timedelta=None,
+                   min_tile_size:float=0.01,
+                   min_window:timedelta=timedelta(minutes=10),
+                   max_workers:int=None,
+                   columnar:Union[bool, str]=False) -> List[SensorWithValue]:
+    """ HTTP: GET
+        Like getValues(), but a large area and time range is split into tiles, which are requested in parallel.
+        A tile the Server rejects as too large (408) is split again, alternating between its area and its time range,
+        until it goes through.
+
+        Input:
+            - boundingBox / boundingPolygon: The area to get values for. Its bounding box is cut into tiles
+              of at most tile_size x tile_size degrees. A boundingPolygon is clipped to each tile.
+            - minTimestamp / maxTimestamp: The time range. maxTimestamp defaults to now, if minTimestamp is given.
+            - window: If given, the time range is also cut into windows of at most this length from the start.
+              Can't be combined with aggregationType.
+            - min_tile_size / min_window: Tiles aren't split further than this. A tile that still gets a 408
+              at that size raises the RequestTimeoutError.
+            - max_workers: How many tiles to request at the same time. Defaults to Settings.pool_maxsize
+        Note: All other parameters are the same as for getValues().
+              refPoint, maxDistance and maxSensors are missing, because they can't be split into tiles.
+        Note: With aggregationType, the time range is never split, so that no aggregation window is cut in two.
+              Passing a window as well raises an Exception.
+        Note: Any error other than a 408 stops the remaining tiles and is raised.
+
+        Output:
+            - A List of Sensors, ordered by id, each including all its matching values in the 'values' attribute,
+              like getValues() returns it. A Sensor found in more than one tile is only listed once.
+        Example:
+            getValuesTiled(boundingBox=[47.3, 5.9, 55.0, 15.0], minTimestamp='2019-11-01',
+                           maxTimestamp='2019-12-01', window=timedelta(days=7))
+    """
+    args = locals()
+    for key in ('boundingBox', 'boundingPolygon', 'minTimestamp', 'maxTimestamp', 'tile_size', 'window',
+                'min_tile_size', 'min_window', 'max_workers', 'columnar'): args.pop(key)
+    from .geo import to_points        # imported here, because geo needs the cache and sqlite3
+    from .stream import time_windows
+    if max_workers is None: max_workers = Settings.pool_maxsize
+    if aggregationType:
+        if window is not None: raise Exception('getValuesTiled() can\'t cut the time range into windows with an '
+                                               'aggregationType, because that would cut aggregation windows in two')
+        min_window = None
+    if minTimestamp is not None and maxTimestamp is None: maxTimestamp = datetime.now(timezone.utc)
+    polygon = to_points(boundingPolygon) if boundingPolygon else None
+    corners = to_points(boundingBox) if boundingBox else polygon
+    if not corners: raise Exception('getValuesTiled() needs a boundingBox or a boundingPolygon to cut into tiles')
+    lats, lngs = [lat for lat, _ in corners], [lng for _, lng in corners]
+    area = (min(lats), min(lngs), max(lats), max(lngs))
+    rows = max(1, math.ceil((area[2] - area[0]) / tile_size))
+    columns = max(1, math.ceil((area[3] - area[1]) / tile_size))
+    if window is None or minTimestamp is None:
+        windows = [tuple(t if t is None else format_timestamp(t) for t in (minTimestamp, maxTimestamp))]
+    else: windows = list(time_windows(minTimestamp, maxTimestamp, window))
+    tiles = [(t, clip_polygon(polygon, t) if polygon else None) for t in split_tile(area, rows, columns)]
+    tasks = [{'tile': t, 'polygon': p, 'minTimestamp': start, 'maxTimestamp': stop, 'depth': 0}
+             for t, p in tiles if p is None or p for start, stop in windows]
+
+    def _get(task):
+        where = ({'boundingPolygon': [c for point in task['polygon'] for c in point]} if task['polygon']
+                 else {'boundingBox': list(task['tile'])})
+        return getValues(**args, **where, minTimestamp=task['minTimestamp'], maxTimestamp=task['maxTimestamp'])
+
+    results, pending = [], {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        def _submit(task): pending[pool.submit(_get, task)] = task
+        try:
+            for task in tasks: _submit(task)
+            while pending:
+                for future in wait(pending, return_when=FIRST_COMPLETED).done:
+                    task = pending.pop(future)
+                    try: results.append(future.result())
+                    except RequestTimeoutError:
+                        parts = split_task(task, min_tile_size, min_window)
+                        if not parts: raise
+                        for part in parts: _submit(part)
+        finally:
+            for future in pending: future.cancel()
+    return _columnar(merge_sensors(results), columnar)
\ No newline at end of file
@@ -0,0 +1,431 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 11_bench.ipynb (unless otherwise specified).
+
+__all__ = ['measure', 'default_scenarios', 'run_benchmarks', 'format_results', 'startup_benchmarks', 'format_startup',
+           'footprint_benchmarks', 'format_footprint', 'main']
+
+# Cell
+import gc
+import os
+import sys
+import json
+import math
+import time
+import subprocess
+import random
+import asyncio
+import argparse
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from .core import Settings, login, close_session, getSensors, getSensor, getValues, getValuesForSensor
+from .core import addMultipleValues
+from .mock import MockServer
+from .records import Record, to_records
+
+# Internal Cell
+from typing import List, Tuple, Dict, Union, Optional, Callable, Iterable, Iterator
+from datetime import timedelta
+from .core import Value
+from .mock import _timestamp
+
+# Cell
+#######################################
+#               MEASURING             #
+#######################################
+
+# Internal Cell
+def percentile(ordered:List[float], q:float) -> Optional[float]:
+    """The q-quantile (0 <= q <= 1) of an already sorted List, using the nearest rank"""
+    if not ordered: return None
+    rank = math.ceil(q * len(ordered) - 1e-9) # the small margin keeps e.g. 0.07 * 100 from rounding up to 8
+    return ordered[min(len(ordered) - 1, max(0, rank - 1))]
+
+# Cell
+def measure(func:Callable[[], Optional[int]], calls:int=10, threads:int=1, warmup:int=1,
+            memory:bool=True) -> Dict[str, float]:
+    """ Call func() calls times, spread over threads threads, and measure how fast that is.
+        func may return how many items (e.g. values) it handled, to also get the items per second.
+        Calls that raise an Exception are counted as errors, and don't stop the measurement.
+
+        Input:
+            - warmup: How many calls to make first, without measuring them, e.g. to open connections.
+            - memory: Whether to make one more call under tracemalloc, to find out how much memory it needs at most.
+              This is done on its own, since tracemalloc slows everything down.
+
+        Output:
+            - calls, errors, items and seconds (wall time for all calls), calls_per_second and items_per_second,
+              the p50, p90, p99 and max latency of a single call in seconds,
+              and peak_memory, the most bytes a single call had allocated at once.
+        Example:
+            measure(lambda: len(getSensors()), calls=20, threads=4)
+    """
+    latencies, items, errors = [], [], []
+    def _call(_):
+        start = time.perf_counter()
+        try: n = func()
+        except Exception as e: n = errors.append(e)
+        latencies.append(time.perf_counter() - start)
+        items.append(n or 0)
+
+    for i in range(warmup): _call(i)
+    for measured in (latencies, items, errors): measured.clear()
+
+    start = time.perf_counter()
+    if threads <= 1:
+        for i in range(calls): _call(i)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as pool: list(pool.map(_call, range(calls)))
+    seconds = time.perf_counter() - start
+    latencies.sort()
+    result = {'calls': calls, 'errors': len(errors), 'items': sum(items), 'seconds': seconds,
+              'calls_per_second': calls / seconds, 'items_per_second': sum(items) / seconds,
+              'p50': percentile(latencies, 0.5), 'p90': percentile(latencies, 0.9),
+              'p99': percentile(latencies, 0.99), 'max': latencies[-1] if latencies else None,
+              'peak_memory': None}
+
+    if memory:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            _call(0)
+            result['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        finally: tracemalloc.stop()
+    return result
+
+# Cell
+#######################################
+#              SCENARIOS              #
+#######################################
+
+# Internal Cell
+def _count_values(result) -> int:
+    """How many values there are in result, as returned by the value functions"""
+    if isinstance(result, (dict, Record)):
+        if 'values' in result: return len(result['values'])
+        if 'numberValue' in result: return len(result['numberValue'])
+        return sum(_count_values(r) for r in result.values())
+    if hasattr(result, '__len__') and not isinstance(result, list): return len(result) # a DataFrame
+    return sum(_count_values(r) for r in result)
+
+def _new_values(server:MockServer, count:int, offset:int) -> Iterator[Value]:
+    """count values for the Sensors that the first user of server owns, none of which exist yet"""
+    owned = [id for id, s in server.sensors.items() if s['userId'] == 1]
+    first = server.start_ms + server.values_per_sensor * server.interval + offset * 1000
+    for i in range(count):
+        yield {'sensorId': owned[i % len(owned)], 'timestamp': _timestamp(first + i * 1000), 'numberValue': i % 100}
+
+# Cell
+def default_scenarios(server:MockServer, quick:bool=False) -> List[Dict]:
+    """ The benchmarks run by run_benchmarks(), for the read and the ingest path.
+        Each is a Dict with a name, the path ('read' or 'ingest'), a func without arguments
+        and the calls and threads to measure it with, see measure().
+        With quick, fewer calls are made, e.g. to check that everything works.
+    """
+    from .batch import getValuesForSensors, getValuesTiled
+    from .stream import streamValues, iterValuesForSensor
+    from .ingest import addValuesInChunks, ValueWriter
+    from .aggregate import aggregate
+    rng, ids = random.Random(0), sorted(server.sensors)
+    box = [51.0, 8.0, 53.0, 12.0]
+    offset = iter(range(1, 10**9, 10**6)) # every ingest call writes new values
+
+    raw = {}
+    def _aggregate(every, how):
+        if not raw: raw.update(getValues(boundingBox=box, columnar=True)) # downloaded once, in the warmup call
+        aggregate(raw, every, how)
+        return sum(len(c['numberValue']) for c in raw.values())
+
+    def _as_records(func):
+        records, Settings.records = Settings.records, True
+        try: return func()
+        finally: Settings.records = records
+
+    def _writer(count):
+        with ValueWriter(max_values=1000, max_delay=0.1) as writer:
+            for value in _new_values(server, count, next(offset)): writer.write(value)
+        return count
+
+    scenarios = [
+        {'name': 'getSensors (all)', 'path': 'read', 'calls': 10,
+         'func': lambda: len(getSensors())},
+        {'name': 'getSensor', 'path': 'read', 'calls': 400, 'threads': 8,
+         'func': lambda: getSensor(rng.choice(ids)) and 1},
+        {'name': 'getSensors (nearest 10)', 'path': 'read', 'calls': 100, 'threads': 4,
+         'func': lambda: len(getSensors(refPoint=[52.5, 13.4], numNearest=10))},
+        {'name': 'getValuesForSensor', 'path': 'read', 'calls': 100, 'threads': 4,
+         'func': lambda: _count_values(getValuesForSensor(rng.choice(ids)))},
+        {'name': 'getValuesForSensor columnar', 'path': 'read', 'calls': 100, 'threads': 4,
+         'func': lambda: _count_values(getValuesForSensor(rng.choice(ids), columnar=True))},
+        {'name': 'getValues (box)', 'path': 'read', 'calls': 10,
+         'func': lambda: _count_values(getValues(boundingBox=box))},
+        {'name': 'getValues (box) records', 'path': 'read', 'calls': 10,
+         'func': lambda: _as_records(lambda: _count_values(getValues(boundingBox=box)))},
+        {'name': 'getValuesTiled (box, 1 degree tiles)', 'path': 'read', 'calls': 10,
+         'func': lambda: _count_values(getValuesTiled(boundingBox=box, tile_size=1))},
+        {'name': 'streamValues (box)', 'path': 'read', 'calls': 10,
+         'func': lambda: sum(len(s['values']) for s in streamValues(boundingBox=box))},
+        {'name': 'iterValuesForSensor (1 day windows)', 'path': 'read', 'calls': 20,
+         'func': lambda: sum(1 for _ in iterValuesForSensor(
+             rng.choice(ids), _timestamp(server.start_ms),
+             _timestamp(server.start_ms + server.values_per_sensor * server.interval), window=timedelta(days=1)))},
+        {'name': 'getValuesForSensors (50 ids)', 'path': 'read', 'calls': 10,
+         'func': lambda: _count_values([s for s in getValuesForSensors(rng.sample(ids, min(50, len(ids))))[0] if s])},
+        {'name': 'aggregate (box, hourly mean)', 'path': 'read', 'calls': 20,
+         'func': lambda: _aggregate('hour', 'mean')},
+        {'name': 'aggregate (box, daily max)', 'path': 'read', 'calls': 20,
+         'func': lambda: _aggregate('day', 'max')},
+        {'name': 'addMultipleValues (1000)', 'path': 'ingest', 'calls': 50, 'threads': 4,
+         'func': lambda: addMultipleValues(
+             {'collapsedMessages': list(_new_values(server, 1000, next(offset)))}) and 1000},
+        {'name': 'addValuesInChunks (50000)', 'path': 'ingest', 'calls': 5,
+         'func': lambda: sum(r['count'] for r in addValuesInChunks(_new_values(server, 50_000, next(offset))))},
+        {'name': 'ValueWriter (20000)', 'path': 'ingest', 'calls': 5,
+         'func': lambda: _writer(20_000)},
+    ]
+    try:
+        from .aio import getValuesForSensor as getValuesForSensorAsync, close_session as close_async_session
+        async def _gather(count):
+            try: return _count_values(await asyncio.gather(*[getValuesForSensorAsync(id)
+                                                             for id in rng.sample(ids, count)]))
+            finally: await close_async_session()
+        scenarios.insert(13, {'name': 'aio getValuesForSensor (50 at once)', 'path': 'read', 'calls': 10,
+                             'func': lambda: asyncio.run(_gather(min(50, len(ids))))})
+    except ImportError: pass # aiohttp is not installed
+    if quick:
+        for s in scenarios: s['calls'] = max(1, s['calls'] // 5)
+    return scenarios
+
+# Cell
+#######################################
+#               RUNNING               #
+#######################################
+
+# Internal Cell
+_traffic = {'up_bytes': 'bytes_in', 'up_bytes_uncompressed': 'bytes_in_uncompressed',
+            'down_bytes': 'bytes_out', 'down_bytes_uncompressed': 'bytes_out_uncompressed'}
+
+# Cell
+def run_benchmarks(only:str=None, quick:bool=False, memory:bool=True, scenarios:List[Dict]=None,
+                   **server_options) -> List[Dict]:
+    """ Start a MockServer, point Settings.api_endpoint at it, log in, and measure every scenario.
+        Settings are restored afterwards. The data and the random choices are seeded,
+        so runs with the same arguments make the same requests and can be compared.
+
+        Input:
+            - only: Only run scenarios whose name contains this.
+            - quick: Make fewer calls per scenario.
+            - memory: Whether to measure the peak memory of a call, see measure().
+            - scenarios: The scenarios to run. Defaults to default_scenarios().
+            - server_options: Passed on to MockServer(), e.g. latency=0.02 or errors={408: 0.01}.
+
+        Output:
+            - One Dict per scenario with its name and path, and the results of measure().
+              Also the bytes sent (up) and received (down) per call, as counted by the server,
+              both on the wire and uncompressed, to see what compression saves.
+        Example:
+            print(format_results(run_benchmarks(sensors=2000, latency=0.01)))
+    """
+    saved = {k: getattr(Settings, k) for k in ('api_endpoint', 'username', 'password', 'auth_token',
+                                                'auth_token_expiry')}
+    with MockServer(**server_options) as server:
+        Settings.api_endpoint = server.url
+        username, password = next(iter(server.users.items()))
+        try:
+            login(username, password)
+            results = []
+            for s in scenarios or default_scenarios(server, quick):
+                if only and only not in s['name']: continue
+                before = dict(server.stats)
+                result = measure(s['func'], s['calls'], s.get('threads', 1), warmup=1, memory=memory)
+                made = s['calls'] + 1 + memory # the warmup and the memory call count too
+                for name, key in _traffic.items(): result[name] = (server.stats[key] - before[key]) / made
+                results.append({'name': s['name'], 'path': s['path'], 'threads': s.get('threads', 1), **result})
+        finally:
+            for k, v in saved.items(): setattr(Settings, k, v)
+            close_session() # its connections point at the server that is about to stop
+    return results
+
+# Cell
+def format_results(results:List[Dict]) -> str:
+    """Turn the output of run_benchmarks() into a table"""
+    def _ms(s): return '-' if s is None else f'{s * 1000:.1f}'
+    def _mb(b): return '-' if b is None else f'{b / 2**20:.1f}'
+    def _kb(r, name): # on the wire / uncompressed
+        if r.get(name) is None: return '-'
+        return f'{r[name] / 1024:.1f}/{r[name + "_uncompressed"] / 1024:.1f}'
+    rows = [('scenario', 'path', 'threads', 'errors', 'calls/s', 'items/s',
+             'p50 ms', 'p90 ms', 'p99 ms', 'max ms', 'peak MB', 'up KB/call', 'down KB/call')]
+    for r in results:
+        rows.append((r['name'], r['path'], str(r['threads']), str(r['errors']), f'{r["calls_per_second"]:.1f}',
+                     f'{r["items_per_second"]:.0f}', _ms(r['p50']), _ms(r['p90']), _ms(r['p99']), _ms(r['max']),
+                     _mb(r['peak_memory']), _kb(r, 'up_bytes'), _kb(r, 'down_bytes')))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return '\n'.join('  '.join(c.ljust(w) if i < 2 else c.rjust(w) for i, (c, w) in enumerate(zip(row, widths)))
+                     for row in rows)
+
+# Cell
+#######################################
+#               STARTUP               #
+#######################################
+
+# Internal Cell
+_startup_script = '''
+import sys, time
+start = time.perf_counter()
+import osnapi
+imported = time.perf_counter()
+osnapi.Settings.api_endpoint, osnapi.Settings.transport = sys.argv[1], sys.argv[2]
+osnapi.getMeasurands()
+done = time.perf_counter()
+print(imported - start, done - imported, len(sys.modules), 'requests' in sys.modules)
+'''
+
+# Cell
+def startup_benchmarks(runs:int=5, transports:Iterable[str]=('requests', 'http.client')) -> List[Dict]:
+    """ Measure how long a fresh python process takes to import osnapi and to make its first request,
+        with each of transports, against a MockServer. This is what a short script, a CLI call or a
+        serverless function pays on every cold start.
+
+        Output:
+            - One Dict per transport with the medians over runs of: the whole process ('process'),
+              'import osnapi', the 'first request' (including the import of the transport), all in seconds,
+              the number of 'modules' loaded in the end, and whether requests was imported.
+        Example:
+            print(format_startup(startup_benchmarks()))
+    """
+    import osnapi # its __file__, since a notebook has none of its own
+    package = os.path.dirname(os.path.dirname(os.path.abspath(osnapi.__file__)))
+    env = {**os.environ, 'PYTHONPATH': os.pathsep.join(p for p in (package, os.environ.get('PYTHONPATH')) if p)}
+    def _median(numbers): return sorted(numbers)[len(numbers) // 2]
+    results = []
+    with MockServer(sensors=10, values_per_sensor=1) as server:
+        for transport in transports:
+            measured = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                out = subprocess.run([sys.executable, '-c', _startup_script, server.url, transport], env=env,
+                                     stdout=subprocess.PIPE, check=True, universal_newlines=True).stdout.split()
+                measured.append((time.perf_counter() - start, float(out[0]), float(out[1]), int(out[2]), out[3]))
+            results.append({'transport': transport, 'process': _median([m[0] for m in measured]),
+                            'import osnapi': _median([m[1] for m in measured]),
+                            'first request': _median([m[2] for m in measured]),
+                            'modules': _median([m[3] for m in measured]), 'requests': measured[0][4] == 'True'})
+    return results
+
+def format_startup(results:List[Dict]) -> str:
+    """Turn the output of startup_benchmarks() into a table"""
+    rows = [('transport', 'process ms', 'import osnapi ms', 'first request ms', 'modules', 'requests imported')]
+    for r in results:
+        rows.append((r['transport'], f'{r["process"] * 1000:.1f}', f'{r["import osnapi"] * 1000:.1f}',
+                     f'{r["first request"] * 1000:.1f}', str(r['modules']), 'yes' if r['requests'] else 'no'))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return '\n'.join('  '.join(c.ljust(w) if i < 1 else c.rjust(w) for i, (c, w) in enumerate(zip(row, widths)))
+                     for row in rows)
+
+# Cell
+#######################################
+#              FOOTPRINT              #
+#######################################
+
+# Cell
+def footprint_benchmarks(sensors:int=100, values_per_sensor:int=10_000) -> List[Dict]:
+    """ Measure how much memory the values of many Sensors take while they are kept around:
+        as the usual dicts, as Records (see Settings.records) and as numpy columns (columnar=True).
+        All are made from the same response body of getValues(), downloaded once from a MockServer.
+
+        Output:
+            - One Dict per form with the 'bytes' it takes, as counted by tracemalloc, the 'bytes_per_value',
+              and the 'seconds' it took to make it from the response body, including decoding the json.
+        Example:
+            print(format_footprint(footprint_benchmarks(sensors=1000, values_per_sensor=1000)))
+    """
+    from .columnar import to_columns
+    with MockServer(sensors=sensors, values_per_sensor=values_per_sensor,
+                    max_values=sensors * values_per_sensor) as server:
+        saved, Settings.api_endpoint = Settings.api_endpoint, server.url
+        try: body = Settings.json_codec.encode(getValues(boundingBox=[-90, -180, 90, 180]))
+        finally:
+            Settings.api_endpoint = saved
+            close_session()
+    decode = Settings.json_codec.decode
+    count = _count_values(decode(body))
+    forms = {'dicts':    lambda: decode(body),
+             'records':  lambda: to_records(decode(body)),
+             'columnar': lambda: to_columns(decode(body))}
+    results = []
+    for form, make in forms.items():
+        gc.collect()
+        start = time.perf_counter()
+        kept = make()
+        seconds = time.perf_counter() - start
+        del kept
+        gc.collect()
+        tracemalloc.start() # only what is still allocated in the end counts, not what was freed on the way
+        kept = make()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del kept
+        results.append({'form': form, 'values': count, 'bytes': size, 'bytes_per_value': size / max(1, count),
+                        'seconds': seconds})
+    return results
+
+def format_footprint(results:List[Dict]) -> str:
+    """Turn the output of footprint_benchmarks() into a table"""
+    rows = [('form', 'values', 'MB', 'bytes/value', 'make ms')]
+    for r in results:
+        rows.append((r['form'], str(r['values']), f'{r["bytes"] / 2**20:.1f}', f'{r["bytes_per_value"]:.1f}',
+                     f'{r["seconds"] * 1000:.1f}'))
+    widths = [max(len(row[i]) for row in rows) for i in range(len(rows[0]))]
+    return '\n'.join('  '.join(c.ljust(w) if i < 1 else c.rjust(w) for i, (c, w) in enumerate(zip(row, widths)))
+                     for row in rows)
+
+# Cell
+def main(argv:List[str]=None):
+    """ Run the benchmarks from the command line:
+            python -m osnapi.bench --quick
+            python -m osnapi.bench --only getValues --latency 0.02 --json results.json
+            python -m osnapi.bench --only add --compress gzip
+            python -m osnapi.bench --transport http.client
+            python -m osnapi.bench --startup
+            python -m osnapi.bench --footprint --sensors 100 --values 10000
+    """
+    parser = argparse.ArgumentParser(prog='python -m osnapi.bench', description=main.__doc__.split('\n')[0])
+    parser.add_argument('--only', help='only run scenarios whose name contains this')
+    parser.add_argument('--quick', action='store_true', help='make fewer calls per scenario')
+    parser.add_argument('--no-memory', action='store_true', help="don't measure the peak memory")
+    parser.add_argument('--sensors', type=int, default=1000, help='number of Sensors on the mock server')
+    parser.add_argument('--values', type=int, default=1000, help='number of values per Sensor')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds the mock server waits per request')
+    parser.add_argument('--errors', type=json.loads, default={},
+                        help='error rates per status code as json, e.g. \'{"408": 0.01}\'')
+    parser.add_argument('--compress', choices=['gzip', 'zstd'], help='compress request bodies with this')
+    parser.add_argument('--plain-responses', action='store_true', help="the mock server doesn't compress responses")
+    parser.add_argument('--transport', choices=['requests', 'http.client'], help='send the requests with this')
+    parser.add_argument('--startup', action='store_true',
+                        help='measure importing osnapi and the first request in a new process instead')
+    parser.add_argument('--json', help='also write the results to this file')
+    parser.add_argument('--footprint', action='store_true',
+                        help='measure the memory the values take as dicts, Records and columns instead')
+    args = parser.parse_args(argv)
+    if args.footprint:
+        results = footprint_benchmarks(sensors=max(1, args.sensors // 10) if args.quick else args.sensors,
+                                       values_per_sensor=args.values)
+        print(format_footprint(results))
+    elif args.startup:
+        results = startup_benchmarks(runs=3 if args.quick else 9,
+                                     transports=[args.transport] if args.transport else ('requests', 'http.client'))
+        print(format_startup(results))
+    else:
+        compress, Settings.compress_requests = Settings.compress_requests, args.compress
+        transport, Settings.transport = Settings.transport, args.transport or Settings.transport
+        try:
+            results = run_benchmarks(only=args.only, quick=args.quick, memory=not args.no_memory,
+                                     sensors=args.sensors, values_per_sensor=args.values, latency=args.latency,
+                                     errors={int(k): v for k, v in args.errors.items()},
+                                     compress_responses=not args.plain_responses)
+        finally: Settings.compress_requests, Settings.transport = compress, transport
+        print(format_results(results))
+    if args.json:
+        with open(args.json, 'w') as f: json.dump(results, f, indent=1)
+
+if __name__ == '__main__' and 'ipykernel' not in sys.modules: main() # not when the notebook itself is run
\ No newline at end of file
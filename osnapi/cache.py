@@ -0,0 +1,300 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 06_cache.ipynb (unless otherwise specified).
+
+__all__ = ['ReferenceCache', 'ResponseCache']
+
+# Cell
+import os
+import json
+import copy
+import time
+import sqlite3
+import threading
+from collections import OrderedDict
+from .core import Settings, getMeasurands, getMeasurand, getUnits, getUnit, getLicenses, getLicense
+from .core import _records, _to_builtin
+
+# Internal Cell
+from typing import List, Tuple, Dict, Union, Optional, Callable
+from .core import Measurand, Unit, License
+
+# Cell
+#######################################
+#          REFERENCE DATA             #
+#######################################
+
+# Internal Cell
+def _matches(record:Dict, **filters) -> bool:
+    """ Whether record has the given value for every filter.
+        Like build_query(), filters that are None or False are ignored,
+        so the results are the same as the Server would return.
+    """
+    return all(record.get(key) == value for key, value in filters.items() if value)
+
+# Cell
+class ReferenceCache():
+    """ Keeps Measurands, Units and Licenses in memory, since they almost never change.
+        Each kind is downloaded as a whole with a single request the first time it's needed,
+        and again once it is older than ttl seconds. Lookups by id and filters are then answered locally.
+        Ids that are not part of the downloaded List are requested one by one,
+        and the maxsize most recently used of them are kept as well.
+        Every lookup returns copies, so changing a result doesn't change the cache.
+
+        Input:
+            - ttl: How many seconds the data is used before it's downloaded again.
+            - maxsize: How many single ids to keep around, per kind.
+            - path: A json file to save the data to and load it from, so that new processes can start warm.
+        Example:
+            ref = ReferenceCache(ttl=24*60*60, path='~/.osnapi_reference.json')
+            ref.getUnits(measurandId=1)
+            ref.getLicense(4)
+    """
+    kinds = {'measurands': (getMeasurands, getMeasurand),
+             'units'     : (getUnits,      getUnit),
+             'licenses'  : (getLicenses,   getLicense)}
+
+    def __init__(self, ttl:float=24 * 60 * 60, maxsize:int=1024, path:str=None):
+        self.ttl, self.maxsize = ttl, maxsize
+        self.path = os.path.expanduser(path) if path else None
+        self.lock = threading.RLock()
+        self.fetching = {kind: threading.Lock() for kind in self.kinds} # one download per kind at a time
+        self.clear()
+        if self.path and os.path.exists(self.path): self.load()
+
+    def clear(self):
+        """Forget everything"""
+        with self.lock:
+            self.tables  = {kind: None for kind in self.kinds} # kind -> {id: record}
+            self.loaded  = {kind: 0.0  for kind in self.kinds} # kind -> time.time() of the download
+            self.singles = {kind: OrderedDict() for kind in self.kinds} # kind -> {id: (time.time(), record)}
+
+    def warm(self):
+        """Download all Measurands, Units and Licenses now, if they are not fresh already"""
+        for kind in self.kinds: self._table(kind)
+
+    def _fresh(self, kind:str) -> bool:
+        return self.tables[kind] is not None and time.time() - self.loaded[kind] <= self.ttl
+
+    def _table(self, kind:str) -> Dict[int, Dict]:
+        """ The shared table of kind, downloaded if needed. The lock isn't held during the download,
+            so lookups of fresh data don't wait for it, and of the threads that need the same kind, only one downloads.
+        """
+        with self.lock:
+            if self._fresh(kind): return self.tables[kind]
+        with self.fetching[kind]:
+            with self.lock:
+                if self._fresh(kind): return self.tables[kind] # another thread downloaded it meanwhile
+            table = {r['id']: r for r in self.kinds[kind][0]()}
+            with self.lock:
+                self.tables[kind], self.loaded[kind] = table, time.time()
+                self.singles[kind].clear()
+                if self.path: self.save()
+            return table
+
+    def table(self, kind:str) -> Dict[int, Dict]:
+        """Return all records of kind ('measurands', 'units' or 'licenses') by id, downloading them if needed"""
+        return copy.deepcopy(self._table(kind))
+
+    def get(self, kind:str, id:int) -> Dict:
+        """Return the record of kind with the given id, requesting it on its own if it's not in the table"""
+        table = self._table(kind)
+        if id in table: return copy.deepcopy(table[id])
+        with self.lock:
+            singles = self.singles[kind]
+            if id in singles and time.time() - singles[id][0] <= self.ttl:
+                singles.move_to_end(id)
+                return copy.deepcopy(singles[id][1])
+        record = self.kinds[kind][1](id) # raises for unknown ids, just like the uncached function
+        with self.lock:
+            singles[id] = (time.time(), record)
+            singles.move_to_end(id)
+            while len(singles) > self.maxsize: singles.popitem(last=False)
+        return copy.deepcopy(record)
+
+    def find(self, kind:str, **filters) -> List[Dict]:
+        """Return all records of kind that match the filters"""
+        return [copy.deepcopy(r) for r in self._table(kind).values() if _matches(r, **filters)]
+
+    def getMeasurands(self, name:str=None) -> List[Measurand]:
+        """Cached version of osnapi.core.getMeasurands()"""
+        return self.find('measurands', name=name)
+
+    def getMeasurand(self, id:int) -> Measurand:
+        """Cached version of osnapi.core.getMeasurand()"""
+        return self.get('measurands', id)
+
+    def getUnits(self, name:str=None, measurandId:int=None) -> List[Unit]:
+        """Cached version of osnapi.core.getUnits()"""
+        return self.find('units', name=name, measurandId=measurandId)
+
+    def getUnit(self, id:int) -> Unit:
+        """Cached version of osnapi.core.getUnit()"""
+        return self.get('units', id)
+
+    def getLicenses(self,
+                    shortName:str=None,
+                    allowsDerivatives:bool=None,
+                    allowsRedistribution:bool=None,
+                    requiresAttribution:bool=None,
+                    requiresChangeNote:bool=None,
+                    requiresShareAlike:bool=None,
+                    requiresKeepOpen:bool=None) -> List[License]:
+        """Cached version of osnapi.core.getLicenses()"""
+        filters = locals()
+        filters.pop('self')
+        return self.find('licenses', **filters)
+
+    def getLicense(self, id:int) -> License:
+        """Cached version of osnapi.core.getLicense()"""
+        return self.get('licenses', id)
+
+    def save(self):
+        """Write the downloaded tables to path"""
+        with self.lock:
+            data = {kind: {'loaded': self.loaded[kind], 'records': list(table.values())}
+                    for kind, table in self.tables.items() if table is not None}
+            tmp = f'{self.path}.tmp{os.getpid()}'
+            with open(tmp, 'w') as f: json.dump(data, f, default=_to_builtin) # Records, see Settings.records
+            os.replace(tmp, self.path) # so that other processes never see half a file
+
+    def load(self):
+        """Read the tables saved at path. Tables older than ttl are downloaded again when they are needed."""
+        with open(self.path) as f: data = json.load(f)
+        with self.lock:
+            for kind, saved in data.items():
+                if kind not in self.kinds: continue
+                self.tables[kind] = {r['id']: r for r in _records(saved['records'])}
+                self.loaded[kind] = saved['loaded']
+
+# Cell
+#######################################
+#             RESPONSES               #
+#######################################
+
+# Cell
+class ResponseCache():
+    """ A cache for the raw responses of all GET requests, keyed by the request URL and the logged in user.
+        To use it, assign it to Settings.response_cache, e.g.:
+            Settings.response_cache = ResponseCache(ttl=60, policies={'/measurands': 24*60*60, '/values': 0})
+
+        A response is served from the cache without asking the Server while it's younger than its ttl.
+        After that, it is revalidated using its ETag / Last-Modified headers, if the Server sent any.
+        If the Server answers with 304 (not modified), the cached response is used and counts as fresh again.
+
+        Input:
+            - ttl: How many seconds a response is fresh, if no policy matches.
+            - policies: A Dict mapping the start of an endpoint, e.g. '/sensors', to the ttl for it.
+              The longest matching one is used. A ttl of 0 means always revalidate.
+            - max_bytes: How large all responses held in memory may be, together.
+              The least recently used ones are dropped first.
+            - path: An sqlite file to also keep responses in, so they survive restarts.
+            - max_disk_bytes: How large all responses in the file may be, together.
+        Note: stats counts hits (fresh from the cache), revalidated (304), misses and evictions.
+              A stale response that the Server sends anew, instead of a 304, is a miss.
+    """
+    def __init__(self, ttl:float=60, policies:Dict[str, float]=None, max_bytes:int=64 * 2**20,
+                 path:str=None, max_disk_bytes:int=1024 * 2**20):
+        self.ttl, self.max_bytes, self.max_disk_bytes = ttl, max_bytes, max_disk_bytes
+        self.policies = sorted(((k.strip('/'), v) for k, v in (policies or {}).items()), key=lambda p: -len(p[0]))
+        self.lock = threading.RLock()
+        self.entries, self.size = OrderedDict(), 0 # key -> {'body', 'etag', 'modified', 'stored'}
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0, 'evictions': 0}
+        self.db = None
+        if path:
+            self.db = sqlite3.connect(os.path.expanduser(path), check_same_thread=False)
+            with self.db:
+                self.db.execute('CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, body BLOB, etag TEXT,'
+                                ' modified TEXT, stored REAL, used REAL)')
+                self.db.execute('CREATE INDEX IF NOT EXISTS responses_used ON responses (used)')
+            # kept up to date on every change, so that storing a response doesn't have to sum up the whole file
+            self.disk_size = self.db.execute('SELECT SUM(LENGTH(body)) FROM responses').fetchone()[0] or 0
+
+    def ttl_for(self, query:str) -> float:
+        """Return the ttl of the longest policy that matches the endpoint of query"""
+        target = query[len(Settings.api_endpoint):] if query.startswith(Settings.api_endpoint) else query
+        target = target.lstrip('/')
+        for prefix, ttl in self.policies:
+            if target.startswith(prefix): return ttl
+        return self.ttl
+
+    def lookup(self, key:str, query:str) -> Tuple[Optional[bytes], Dict[str, str]]:
+        """ Return the cached body for key if it's still fresh, and no headers.
+            If it's stale but can be revalidated, return it together with the headers needed for that.
+            Otherwise return None and no headers.
+        """
+        with self.lock:
+            entry = self._get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None, {}
+            if time.time() - entry['stored'] < self.ttl_for(query):
+                self.stats['hits'] += 1
+                return entry['body'], {}
+            validators = {}
+            if entry['etag']:     validators['If-None-Match']     = entry['etag']
+            if entry['modified']: validators['If-Modified-Since'] = entry['modified']
+            if not validators:
+                self.stats['misses'] += 1
+                return None, {}
+            return entry['body'], validators
+
+    def revalidated(self, key:str, body:bytes, headers:Dict[str, str]):
+        """The Server said that body, the response for key, has not changed, so it's fresh again"""
+        with self.lock:
+            entry = self._get(key) or {'etag': None, 'modified': None}
+            self.stats['revalidated'] += 1
+            self._put(key, body, headers.get('ETag') or entry['etag'],
+                      headers.get('Last-Modified') or entry['modified'])
+
+    def store(self, key:str, body:bytes, headers:Dict[str, str], changed:bool=False):
+        """ Remember body as the response for key.
+            changed means that it replaces a stale response, which lookup() returned for revalidation.
+        """
+        with self.lock:
+            if changed: self.stats['misses'] += 1
+            self._put(key, body, headers.get('ETag'), headers.get('Last-Modified'))
+
+    def clear(self):
+        """Forget all responses, including the ones on disk"""
+        with self.lock:
+            self.entries, self.size = OrderedDict(), 0
+            if self.db is not None:
+                with self.db: self.db.execute('DELETE FROM responses')
+                self.disk_size = 0
+
+    def _get(self, key:str) -> Optional[Dict]:
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+            return entry
+        if self.db is None: return None
+        row = self.db.execute('SELECT body, etag, modified, stored FROM responses WHERE key = ?', (key,)).fetchone()
+        if row is None: return None
+        with self.db: self.db.execute('UPDATE responses SET used = ? WHERE key = ?', (time.time(), key))
+        entry = dict(zip(('body', 'etag', 'modified', 'stored'), row))
+        self._remember(key, entry)
+        return entry
+
+    def _put(self, key:str, body:bytes, etag:str, modified:str):
+        entry = {'body': body, 'etag': etag, 'modified': modified, 'stored': time.time()}
+        self._remember(key, entry)
+        if self.db is None: return
+        with self.db:
+            old = self.db.execute('SELECT LENGTH(body) FROM responses WHERE key = ?', (key,)).fetchone()
+            self.db.execute('INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)',
+                            (key, body, etag, modified, entry['stored'], entry['stored']))
+            self.disk_size += len(body) - ((old[0] or 0) if old else 0)
+            while self.disk_size > self.max_disk_bytes:
+                key, size = self.db.execute('SELECT key, LENGTH(body) FROM responses ORDER BY used LIMIT 1').fetchone()
+                self.db.execute('DELETE FROM responses WHERE key = ?', (key,))
+                self.disk_size -= size or 0
+
+    def _remember(self, key:str, entry:Dict):
+        old = self.entries.pop(key, None)
+        if old is not None: self.size -= len(old['body'])
+        if len(entry['body']) > self.max_bytes: return
+        self.entries[key] = entry
+        self.size += len(entry['body'])
+        while self.size > self.max_bytes:
+            _, old = self.entries.popitem(last=False)
+            self.size -= len(old['body'])
+            self.stats['evictions'] += 1
\ No newline at end of file
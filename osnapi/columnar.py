@@ -0,0 +1,65 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 05_columnar.ipynb (unless otherwise specified).
+
+__all__ = ['values_to_columns', 'to_columns', 'to_dataframe']
+
+# Cell
+try: import numpy as np
+except ImportError as e: raise ImportError('osnapi.columnar needs numpy: pip install osnapi[numpy]') from e
+from .records import Record, Values
+
+# Internal Cell
+from typing import List, Tuple, Dict, Union, Optional, Callable
+from .core import SensorWithValue, Value
+
+# Cell
+def values_to_columns(values:List[Value]) -> Dict[str, np.ndarray]:
+    """ Turn a List of Values into one array per attribute.
+        'timestamp' becomes a datetime64[ms] array (in UTC), 'numberValue' a float64 array.
+        Note: Use .view('int64') on the timestamps to get milliseconds since the epoch.
+              Values from osnapi.records are not copied, the arrays share their memory.
+        Example:
+            {'timestamp': array(['2019-11-23T01:23:45.678', '2019-11-23T11:23:45.678'], dtype='datetime64[ms]'),
+             'numberValue': array([1., 2.])}
+    """
+    if isinstance(values, Values): return values.to_columns()
+    # numpy parses the iso strings itself, it only doesn't want the timezone
+    timestamps = np.array([v['timestamp'].rstrip('Z') for v in values], dtype='datetime64[ms]')
+    numbers = np.fromiter((v['numberValue'] for v in values), dtype=np.float64, count=len(values))
+    return {'timestamp': timestamps, 'numberValue': numbers}
+
+# Cell
+def to_columns(sensors:Union[SensorWithValue, List[SensorWithValue]]) -> Dict:
+    """ Turn the values of a Sensor into columns using values_to_columns().
+        For a List of Sensors, returns a Dict that maps each Sensor id to its columns.
+        If the same Sensor appears more than once, its values are concatenated.
+    """
+    if isinstance(sensors, (dict, Record)): return values_to_columns(sensors.get('values', []))
+    columns = {}
+    for sensor in sensors:
+        new = values_to_columns(sensor.get('values', []))
+        old = columns.get(sensor['id'])
+        columns[sensor['id']] = new if old is None else {k: np.concatenate([old[k], new[k]]) for k in new}
+    return columns
+
+# Cell
+def to_dataframe(sensors:Union[SensorWithValue, List[SensorWithValue]]):
+    """ Turn the values of one or many Sensors into a pandas DataFrame,
+        with the columns sensorId, timestamp and numberValue.
+        Note: This requires pandas to be installed.
+    """
+    import pandas as pd
+    if isinstance(sensors, (dict, Record)): sensors = [sensors]
+    columns = to_columns(sensors)
+    ids = [np.full(len(c['numberValue']), id, dtype=np.int64) for id, c in columns.items()]
+    def _cat(arrays, dtype): return np.concatenate(arrays) if arrays else np.array([], dtype=dtype)
+    return pd.DataFrame({'sensorId'   : _cat(ids, np.int64),
+                         'timestamp'  : _cat([c['timestamp'] for c in columns.values()], 'datetime64[ms]'),
+                         'numberValue': _cat([c['numberValue'] for c in columns.values()], np.float64)})
+
+# Internal Cell
+def as_columnar(result:Union[SensorWithValue, List[SensorWithValue]], columnar:Union[bool, str]):
+    """Convert result according to the columnar option of the value functions in osnapi.core"""
+    if not columnar: return result
+    if columnar == 'pandas': return to_dataframe(result)
+    if columnar is True or columnar == 'numpy': return to_columns(result)
+    raise Exception(f'columnar has to be one of False, True, \'numpy\' or \'pandas\', not {columnar!r}')
\ No newline at end of file
@@ -1,12 +1,25 @@
 # AUTOGENERATED! DO NOT EDIT! File to edit: 00_core.ipynb (unless otherwise specified).
 
-__all__ = ['Settings', 'retry_on', 'login', 'getSensors', 'getSensor', 'addSensor', 'deleteSensor', 'mySensors',
-           'mySensorIds', 'getFirstLastValueForSensor', 'getValues', 'getValuesForSensor', 'addValue',
+__all__ = ['Settings', 'retry_on', 'new_session', 'close_session', 'RequestTimeoutError', 'CircuitOpenError',
+           'RetryPolicy', 'RateLimiter', 'JSONCodec', 'login', 'getSensors', 'getSensor', 'addSensor', 'deleteSensor',
+           'mySensors', 'mySensorIds', 'getFirstLastValueForSensor', 'getValues', 'getValuesForSensor', 'addValue',
            'addMultipleValues', 'profile', 'getMeasurands', 'getMeasurand', 'getLicenses', 'getLicense', 'getUnits',
            'getUnit']
 
 # Cell
-import requests
+import re
+import sys
+import gzip
+import json
+import time
+import base64
+import random
+import socket
+import threading
+import importlib.util
+import logging
+from contextlib import contextmanager
+from collections import deque
 
 # Internal Cell
 from typing import List, Tuple, Dict, Union, Optional, Callable
@@ -21,6 +34,27 @@ class Settings():
     username     = None
     password     = None
     auth_token   = None
+    auth_token_expiry    = None   # time.time() at which auth_token runs out, None if unknown
+    token_refresh_margin = 5 * 60 # refresh auth_token this long (max. half its lifetime) before it expires. None: never
+    background_refresh   = True   # do that refresh on a timer thread, instead of in the next request
+    transport        = None  # 'requests', 'http.client', or an object like them. None: requests if it's installed
+    session          = None  # the requests.Session used by the requests transport, created on first use if None
+    pool_connections = 10    # number of per-host connection pools to keep around
+    pool_maxsize     = 10    # maximum number of connections kept alive per host
+    keep_alive       = True
+    timeout          = None  # seconds, or a (connect, read) tuple. None waits forever
+    max_concurrency  = 100   # maximum number of requests in flight at once when using osnapi.aio
+    response_cache   = None  # e.g. an osnapi.cache.ResponseCache, used by all GET requests if set
+    retry_policy     = None  # the RetryPolicy used by all requests, see below. None only retries after a login
+    rate_limiter     = None  # a RateLimiter that all requests go through, e.g. RateLimiter(rate=50, max_in_flight=20)
+    json_codec       = None  # the JSONCodec for all request and response bodies, see below. The fastest one installed
+    records          = False # return compact Records instead of dicts from all api functions, see osnapi.records
+    compress_requests  = None # 'gzip' or 'zstd' to compress POST bodies. Only if the Server accepts them!
+    compress_min_bytes = 1024 # POST bodies smaller than this are sent uncompressed
+    coalesce_gets    = True  # identical GET requests that are in flight at the same time share one download
+    coalesce_memo    = 0     # seconds for which the result of a finished GET request is reused as well
+    before_request   = []    # functions called as f(info) before each request, see observe()
+    after_request    = []    # functions called as f(info) after each request, see observe()
 
     def __repr__(self):
         return f'api_endpoint:\t{self.api_endpoint}\nusername:\t{self.username}\npassword:\t{self.password}\nauth_token:\t{self.auth_token}'
@@ -50,74 +84,777 @@ def retry_on(EX:Exception, retries:int=1, on_failure:Callable=None): # TODO(flor
         return _wrapper
     return _retry_on
 
+# Cell
+def new_session(pool_connections:int=None, pool_maxsize:int=None, keep_alive:bool=None) -> 'requests.Session':
+    """ Create a requests.Session with a connection pool, configured by the Settings.
+        Any argument that is not given is taken from the Settings.
+        The Session keeps connections alive between requests, so that not every request
+        has to pay for a new TCP and TLS handshake.
+    """
+    import requests
+    from .transport import timed_adapter
+    if pool_connections is None: pool_connections = Settings.pool_connections
+    if pool_maxsize     is None: pool_maxsize     = Settings.pool_maxsize
+    if keep_alive       is None: keep_alive       = Settings.keep_alive
+    session = requests.Session()
+    adapter = timed_adapter()(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if not keep_alive: session.headers['Connection'] = 'close'
+    return session
+
+# Internal Cell
+_session_lock = threading.Lock()
+
+def get_session() -> 'requests.Session':
+    """ Return the Session shared by all requests sent with requests.
+        If Settings.session is None, a new one is created using new_session().
+    """
+    if Settings.session is None:
+        with _session_lock:
+            if Settings.session is None: Settings.session = new_session()
+    return Settings.session
+
+_transport = (None, None) # (Settings.transport, the transport made for it)
+
+def get_transport():
+    """ Return the transport that sends all requests, according to Settings.transport.
+        The transport module, and requests or http.client, are only imported by the first request.
+    """
+    choice, transport = _transport
+    if transport is None or choice != Settings.transport:
+        with _session_lock:
+            choice, transport = _transport
+            if transport is None or choice != Settings.transport: transport = _new_transport(Settings.transport)
+    return transport
+
+def _new_transport(choice):
+    """Make the transport for choice, and close the one made for the previous Settings.transport"""
+    global _transport
+    from .transport import RequestsTransport, HTTPClientTransport
+    name = choice
+    if name is None: name = 'requests' if importlib.util.find_spec('requests') else 'http.client'
+    if   name == 'requests':         transport = RequestsTransport()
+    elif name == 'http.client':      transport = HTTPClientTransport()
+    elif hasattr(choice, 'request'): transport = choice
+    else: raise Exception(f"Settings.transport has to be None, 'requests', 'http.client' or a transport, "
+                          f"not {choice!r}")
+    (old_choice, old), _transport = _transport, (choice, transport)
+    if old is not None and old is not old_choice: old.close() # transports of the user are theirs to close
+    return transport
+
+# Cell
+def close_session():
+    """ Close the shared Session and all of its connections, and those of the transport.
+        The next request creates a new one, which picks up changes to the pool Settings.
+    """
+    global _transport
+    with _session_lock:
+        session, Settings.session = Settings.session, None
+        (choice, transport), _transport = _transport, (None, None)
+    if session is not None: session.close()
+    if transport is not None and transport is not choice: transport.close()
+
 # Internal Cell
+_headers = {'accept'         : 'application/json',
+            'content-type'   : 'application/json',
+            'cache-control'  : 'no-cache'}
+
 def generate_headers(requires_auth:bool) -> Dict:
     """ Return Headers to be used in HTTP requests.
         If requires_auth, the headers will contain a login token,
         but only if a token was previously generated by calling login().
+        Note: The returned dict is shared between requests and must not be modified.
+        Note: The token is remembered, so that a failing request only logs in again if no other one did already.
     """
-    headers = {'accept'         : 'application/json',
-               'accept-encoding': 'gzip, deflate',
-               'content-type'   : 'application/json',
-               'cache-control'  : 'no-cache'}
-    if requires_auth:
-        headers['Authorization'] = Settings.auth_token
-    return headers
+    _token_local.sent = Settings.auth_token if requires_auth else None
+    if requires_auth and Settings.auth_token is not None:
+        return {**_headers, 'Authorization': Settings.auth_token}
+    return _headers
 
 # Internal Cell
-def handle_response(query:str, response:requests.Response) -> Union[Dict, str]:
+_token_lock = threading.Lock()
+_token_local = threading.local() # the token each thread sent last, and whether it is logging in right now
+_token_timer = None
+_token_lifetime = None # how many seconds the current token was valid for, when it was set
+
+def token_expiry(token:str) -> Optional[float]:
+    """Return the time.time() at which token runs out, read from the exp claim of the JSON Web Token, or None"""
+    try:
+        payload = token.split('.')[1]
+        return float(json.loads(base64.urlsafe_b64decode(payload + '=' * (-len(payload) % 4)))['exp'])
+    except: return None
+
+def set_token(token:str):
+    """ Make token the one used by all requests, and remember when it runs out.
+        Tokens are valid for one hour, if the token itself doesn't say otherwise.
+        If Settings.background_refresh is set, a timer is started that refreshes the token shortly before that.
+    """
+    global _token_timer, _token_lifetime
+    Settings.auth_token = token
+    Settings.auth_token_expiry = token_expiry(token) or time.time() + 60 * 60
+    _token_lifetime = max(0.0, Settings.auth_token_expiry - time.time())
+    if _token_timer is not None: _token_timer.cancel()
+    _token_timer = None
+    if Settings.background_refresh and Settings.token_refresh_margin is not None:
+        delay = max(0, Settings.auth_token_expiry - _refresh_margin() - time.time())
+        _token_timer = threading.Timer(delay, refresh_token, args=(token,))
+        _token_timer.daemon = True
+        _token_timer.start()
+
+def _refresh_margin() -> float:
+    """Settings.token_refresh_margin, but at most half the token's lifetime, so short lived ones aren't always due"""
+    margin = Settings.token_refresh_margin
+    return margin if _token_lifetime is None else min(margin, _token_lifetime / 2)
+
+def token_needs_refresh() -> bool:
+    """Whether the current token runs out within Settings.token_refresh_margin and can be refreshed"""
+    return (Settings.token_refresh_margin is not None and Settings.auth_token is not None
+            and Settings.auth_token_expiry is not None and bool(Settings.username and Settings.password)
+            and time.time() >= Settings.auth_token_expiry - _refresh_margin())
+
+def refresh_token(stale:Optional[str]) -> bool:
+    """ Log in again using the credentials stored in the Settings, because the token stale didn't work (anymore).
+        Only one thread logs in at a time. The others wait for it, and then find that
+        the token has changed already, so that many failing requests lead to a single login.
+        Returns whether there is a new token to try.
+    """
+    if getattr(_token_local, 'refreshing', False): return False # login() itself failed
+    with _token_lock:
+        if Settings.auth_token != stale and Settings.auth_token is not None: return True
+        if not (Settings.username and Settings.password): return False
+        _token_local.refreshing = True
+        record('token_refreshes', 1)
+        try: login(Settings.username, Settings.password)
+        except: return False
+        else: return True
+        finally: _token_local.refreshing = False
+
+# Cell
+class RequestTimeoutError(Exception):
+    """Raised on HTTP 408, when the Server closed the connection, usually because the request was too large."""
+
+# Internal Cell
+class ConnectFailed(ConnectionError):
+    """Raised by the http.client transport when no connection to the Server could be made"""
+
+# Cell
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request, while too many requests to the same endpoint have failed in a row."""
+
+# Cell
+class RetryPolicy():
+    """ Decides whether, and after how long, a failed request is sent again.
+        Retried are connection errors and the status codes in retry_statuses, which mean that the Server is
+        overloaded or unavailable for a moment. A 401 / 500 is handled by logging in again instead, see refresh_token().
+        Other errors are raised right away, since sending the same request again won't change the answer.
+
+        Input:
+            - retries: How often a single request is retried at most.
+            - backoff: The delay before the first retry, in seconds. It doubles with every further retry,
+              up to max_backoff, and a random part of it is used (full jitter), so that clients don't retry in lockstep.
+            - retry_statuses: The status codes to retry. 408 is not part of it by default, because for this api
+              it usually means that the request was too large, which is handled by osnapi.ingest.
+            - max_retry_after: If the Server asks to wait longer than this in its Retry-After header, give up instead.
+            - budget: Retries may add at most this fraction to the requests sent in the last budget_window seconds,
+              plus min_retries. This is shared by all requests, so that a failing Server doesn't get
+              retries on top of the regular load.
+            - breaker_threshold: After this many failures in a row, the endpoint's circuit opens,
+              and requests to it raise a CircuitOpenError for breaker_timeout seconds.
+              After that, a single request is let through to probe whether the endpoint works again.
+        Note: POST requests are only retried if the Server did not accept them (429 and 503), or the connection
+              could not be established, so that values are never added twice.
+        Example:
+            Settings.retry_policy = RetryPolicy(retries=5, backoff=1, breaker_threshold=10)
+    """
+    def __init__(self, retries:int=3, backoff:float=0.5, max_backoff:float=30,
+                 retry_statuses:Tuple[int, ...]=(429, 502, 503, 504), max_retry_after:float=120,
+                 budget:float=0.2, min_retries:int=10, budget_window:float=10,
+                 breaker_threshold:int=5, breaker_timeout:float=30):
+        assert retries >= 0, 'can\'t have negative retries'
+        self.retries, self.backoff, self.max_backoff = retries, backoff, max_backoff
+        self.retry_statuses, self.max_retry_after = set(retry_statuses), max_retry_after
+        self.budget, self.min_retries, self.budget_window = budget, min_retries, budget_window
+        self.breaker_threshold, self.breaker_timeout = breaker_threshold, breaker_timeout
+        self.lock = threading.Lock()
+        self.sent, self.retried = deque(), deque() # time.monotonic() of each request / retry in the window
+        self.circuits = {} # endpoint -> {'failures': int, 'opened': time.monotonic() or None, 'probing': bool}
+
+    @staticmethod
+    def endpoint(query:str) -> str:
+        """The endpoint of query, without the query string and with ids replaced, e.g. /sensors/{id}/values"""
+        return endpoint_template(query)
+
+    def _trim(self, now:float):
+        """Forget the requests and retries that are older than budget_window. Call with the lock held."""
+        for times in (self.sent, self.retried):
+            while times and now - times[0] > self.budget_window: times.popleft()
+
+    def before(self, query:str) -> bool:
+        """ Called before every request. Raises a CircuitOpenError if the endpoint's circuit is open.
+            Returns True if the request is the probe of a half open circuit, see probed().
+        """
+        now = time.monotonic()
+        with self.lock:
+            self._trim(now)
+            self.sent.append(now)
+            circuit = self.circuits.get(self.endpoint(query))
+            if circuit is None or circuit['opened'] is None: return False
+            if now - circuit['opened'] < self.breaker_timeout or circuit['probing']:
+                raise CircuitOpenError(f'Not sending the request, because the last {circuit["failures"]} requests '
+                                       f'to {self.endpoint(query)} failed.\n--Request to    : {query}')
+            circuit['probing'] = True # half open: let this one request through
+            return True
+
+    def probed(self, query:str):
+        """ Called when a probe is done, however it ended. If neither success() nor failure() was called for it,
+            e.g. because it raised some other error, the next request after it is let through as the probe.
+        """
+        with self.lock:
+            circuit = self.circuits.get(self.endpoint(query))
+            if circuit is not None: circuit['probing'] = False
+
+    def success(self, query:str):
+        """Called after a request that the Server answered properly, even if with an error like 404"""
+        with self.lock: self.circuits.pop(self.endpoint(query), None)
+
+    def failure(self, query:str):
+        """Called after a request that failed because of the connection or an overloaded Server"""
+        with self.lock:
+            circuit = self.circuits.setdefault(self.endpoint(query), {'failures': 0, 'opened': None, 'probing': False})
+            circuit['failures'] += 1
+            if circuit['probing'] or circuit['failures'] >= self.breaker_threshold:
+                circuit['opened'], circuit['probing'] = time.monotonic(), False
+
+    def retryable(self, method:str, status_code:int=None, error:str=None) -> bool:
+        """ Whether a request that got status_code, or failed with an error of the given kind, may be sent again.
+            error is 'connect' if no connection could be made, or 'connection' if it broke during the request.
+        """
+        if error is not None: return method != 'POST' or error == 'connect'
+        if status_code not in self.retry_statuses: return False
+        return method != 'POST' or status_code in (429, 503)
+
+    def delay(self, query:str, method:str, attempt:int, status_code:int=None, headers:Dict=None,
+              error:str=None) -> Optional[float]:
+        """ Return how many seconds to wait before retrying a failed request, or None to give up.
+            attempt is the number of retries done so far for this request. For error, see retryable().
+            Failures also count towards the endpoint's circuit breaker.
+        """
+        if error is not None or status_code in self.retry_statuses: self.failure(query)
+        if attempt >= self.retries or not self.retryable(method, status_code, error): return None
+        wait = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        retry_after = parse_retry_after((headers or {}).get('Retry-After'))
+        if retry_after is not None:
+            if retry_after > self.max_retry_after: return None
+            wait = max(wait, retry_after)
+        now = time.monotonic()
+        with self.lock:
+            self._trim(now)
+            if len(self.retried) >= self.min_retries + self.budget * len(self.sent): return None
+            self.retried.append(now)
+        return wait
+
+# Internal Cell
+def endpoint_template(query:str) -> str:
+    """The endpoint of query, without the query string and with ids replaced, e.g. /sensors/{id}/values"""
+    path = query.split('?', 1)[0][len(Settings.api_endpoint):] if query.startswith(Settings.api_endpoint) else query
+    return re.sub(r'/\d+(?=/|$)', '/{id}', '/' + path.split('?', 1)[0].strip('/'))
+
+def connection_error(error:Exception) -> Optional[str]:
+    """ Return 'connect' if error means that no connection to the Server could be made,
+        'connection' if it broke down or timed out during the request, and None for any other error.
+    """
+    requests = sys.modules.get('requests') # if it isn't imported, error can't be one of its exceptions
+    if requests is not None:
+        if isinstance(error, requests.ConnectTimeout): return 'connect'
+        if isinstance(error, requests.ConnectionError):
+            from urllib3.exceptions import NewConnectionError
+            reason = getattr(error.args[0], 'reason', None) if error.args else None
+            return 'connect' if isinstance(reason, NewConnectionError) else 'connection'
+        if isinstance(error, requests.Timeout): return 'connection'
+    if isinstance(error, ConnectFailed): return 'connect'
+    if isinstance(error, (ConnectionError, TimeoutError, socket.timeout)): return 'connection'
+    client = sys.modules.get('http.client')
+    if client is not None and isinstance(error, client.HTTPException): return 'connection'
+
+def parse_retry_after(value:Optional[str]) -> Optional[float]:
+    """Turn the value of a Retry-After header, either seconds or an HTTP date, into seconds from now"""
+    if not value: return None
+    try: return max(0.0, float(value))
+    except ValueError: pass
+    from email.utils import parsedate_to_datetime
+    try: return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError): return None
+
+Settings.retry_policy = RetryPolicy()
+
+# Cell
+class RateLimiter():
+    """ Limits how hard all requests together hit the Server, from any thread and from osnapi.aio.
+        A request has to wait for a token from a bucket that refills at rate tokens per second (holding at most burst),
+        and for one of max_in_flight slots. Either limit can be None, which means no limit.
+        To use it, assign it to Settings.rate_limiter.
+
+        If adaptive, both limits follow the Server's capacity (AIMD):
+        When the Server signals that it's overloaded (congestion_statuses, or a broken connection),
+        they are cut by the factor decrease. Only requests that started after the last cut can cause another one,
+        so a burst of errors from requests sent at the old limit counts as one. If max_in_flight was None,
+        it starts out at the number of requests that were in flight at that point. A rate that is None stays so,
+        since limiting the requests in flight is enough to follow the Server.
+        After every request that went through, they grow by a little, adding about 1 per rate / max_in_flight requests,
+        but only while they are what holds the requests back: all slots in use, or the bucket empty.
+        So without a max_rate / max_in_flight_limit, they stay close to what the requests actually need.
+        They never go below min_rate / min_in_flight, or above max_rate / max_in_flight_limit.
+        Example:
+            Settings.rate_limiter = RateLimiter(rate=20, max_in_flight=10, max_rate=200)
+    """
+    def __init__(self, rate:float=None, max_in_flight:int=None, burst:float=None, adaptive:bool=True,
+                 decrease:float=0.5, min_rate:float=1.0, min_in_flight:int=1,
+                 max_rate:float=None, max_in_flight_limit:int=None,
+                 congestion_statuses:Tuple[int, ...]=(408, 429, 502, 503, 504)):
+        self.rate, self.max_in_flight, self.burst = rate, max_in_flight, burst
+        self.adaptive, self.decrease = adaptive, decrease
+        self.min_rate, self.min_in_flight = min_rate, min_in_flight
+        self.max_rate, self.max_in_flight_limit = max_rate, max_in_flight_limit
+        self.congestion_statuses = set(congestion_statuses)
+        self.condition = threading.Condition()
+        self.in_flight, self.tokens, self.refilled = 0, self._capacity(), time.monotonic()
+        self.last_cut = None
+        self.growth = 0.0 # growth of max_in_flight, that hasn't added up to a whole slot yet
+
+    def _capacity(self) -> float:
+        return self.burst if self.burst is not None else max(1.0, self.rate or 1.0)
+
+    def _refill(self, now:float):
+        if self.rate is not None:
+            self.tokens = min(self._capacity(), self.tokens + (now - self.refilled) * self.rate)
+        self.refilled = now
+
+    def try_acquire(self) -> Tuple[bool, float]:
+        """ Take a token and a slot if both are available, and return True and the time.monotonic() of that.
+            Otherwise take nothing, and return False and how many seconds to wait before trying again.
+        """
+        with self.condition:
+            now = time.monotonic()
+            self._refill(now)
+            if self.max_in_flight is not None and self.in_flight >= self.max_in_flight: return False, 0.01
+            if self.rate is not None and self.tokens < 1: return False, (1 - self.tokens) / self.rate
+            if self.rate is not None: self.tokens -= 1
+            self.in_flight += 1
+            return True, now
+
+    def acquire(self) -> float:
+        """ Block until the request may be sent, and return when that was.
+            Every acquire() has to be followed by a release() that gets the returned time.
+        """
+        with self.condition:
+            while True:
+                acquired, value = self.try_acquire()
+                if acquired: return value
+                self.condition.wait(value) # woken up early by release()
+
+    async def acquire_async(self) -> float:
+        """Awaitable version of acquire(), which lets other tasks run while waiting"""
+        import asyncio
+        while True:
+            acquired, value = self.try_acquire()
+            if acquired: return value
+            await asyncio.sleep(value)
+
+    def release(self, started:float, status_code:int=None, error:bool=False):
+        """ Give back the slot of a request that started at the time returned by acquire(),
+            and adapt the limits to how it went. error means that the connection broke down, and counts as congestion.
+        """
+        with self.condition:
+            # whether the limits held the requests back, before this one makes room
+            self._refill(time.monotonic())
+            full = self.max_in_flight is not None and self.in_flight >= self.max_in_flight
+            empty = self.rate is not None and self.tokens < 1
+            self.in_flight -= 1
+            if self.adaptive:
+                if error or status_code in self.congestion_statuses: self._cut(started)
+                elif status_code is not None: self._grow(full, empty)
+            self.condition.notify_all()
+
+    def _cut(self, started:float):
+        if self.last_cut is not None and started < self.last_cut: return
+        self.last_cut = time.monotonic()
+        in_flight = self.max_in_flight if self.max_in_flight is not None else self.in_flight + 1
+        self.max_in_flight = max(self.min_in_flight, int(in_flight * self.decrease))
+        if self.rate is not None:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.tokens = min(self.tokens, self._capacity())
+
+    def _grow(self, full:bool, empty:bool):
+        if empty:
+            self.rate += 1 / self.rate
+            if self.max_rate is not None: self.rate = min(self.rate, self.max_rate)
+        if full:
+            self.growth += 1 / self.max_in_flight
+            if self.growth >= 1:
+                self.growth -= 1
+                self.max_in_flight += 1
+                if self.max_in_flight_limit is not None:
+                    self.max_in_flight = min(self.max_in_flight, self.max_in_flight_limit)
+
+# Internal Cell
+_observed = threading.local()
+
+@contextmanager
+def observe(method:str, query:str, local:bool=True):
+    """ Collect information about one call to a send_* function, and pass it to the hooks in the Settings.
+        The functions in Settings.before_request are called with it before anything is sent,
+        the ones in Settings.after_request once the result is decoded, or an error was raised.
+        Hooks may add their own keys, e.g. to remember a tracing span between the two calls.
+        info is a Dict with:
+            - method, url, endpoint: e.g. 'GET', the full URL and the endpoint template like '/sensors/{id}'
+            - start: time.time() when the call started, duration: how many seconds it took in total
+            - connect, ttfb, download, decode: seconds spent on opening connections, waiting for the first byte
+              of the response (including sending the request), downloading the rest, and decoding the json.
+              All are summed over retries. connect is 0 when a kept alive connection was reused.
+            - status: the status code of the last response, or None if there was none
+            - request_bytes, response_bytes: the size of the bodies
+            - retries, token_refreshes: how often the request was sent again, and how often that needed a login
+            - source: 'network', 'cache' (Settings.response_cache) or 'coalesced' (shared with another request)
+            - error: the Exception raised, or None
+        Note: Hooks are called on the thread that sends the request, so they should be quick.
+              A hook that raises is logged to the 'osnapi' logger, and doesn't affect the request.
+        If local, info is also made available to record() for everything this thread does meanwhile.
+        osnapi.aio, where many requests share a thread, passes info along explicitly instead.
+    """
+    info = {'method': method, 'url': query, 'endpoint': endpoint_template(query), 'start': time.time(),
+            'duration': 0.0, 'connect': 0.0, 'ttfb': 0.0, 'download': 0.0, 'decode': 0.0, 'status': None,
+            'request_bytes': 0, 'response_bytes': 0, 'retries': 0, 'token_refreshes': 0,
+            'source': 'network', 'error': None}
+    if local: outer, _observed.info = getattr(_observed, 'info', None), info
+    _call_hooks(Settings.before_request, info)
+    start = time.perf_counter()
+    try: yield info
+    except Exception as e:
+        info['error'] = e
+        raise
+    finally:
+        info['duration'] = time.perf_counter() - start
+        if local: _observed.info = outer
+        _call_hooks(Settings.after_request, info)
+
+_log = logging.getLogger('osnapi')
+
+def _call_hooks(hooks:List[Callable], info:Dict):
+    """Call each hook with info. One that fails is logged, so it never hides the result or error of the request."""
+    for hook in hooks:
+        try: hook(info)
+        except Exception: _log.exception(f'The request hook {hook!r} failed')
+
+@contextmanager
+def _observing(info:Dict):
+    """Make info available to record() on this thread meanwhile, for a request observed with local=False"""
+    outer, _observed.info = getattr(_observed, 'info', None), info
+    try: yield info
+    finally: _observed.info = outer
+
+def record(key:str, value:float) -> float:
+    """Add value to key in the info of the request that this thread is sending right now, if any, and return the sum"""
+    info = getattr(_observed, 'info', None)
+    if info is None: return 0.0
+    info[key] += value
+    return info[key]
+
+# Cell
+class JSONCodec():
+    """ Encodes request bodies to json bytes, and decodes response bodies straight from the raw bytes,
+        using the fastest json library that is installed: orjson, msgspec or ujson, or else the json module.
+        Bodies are encoded compactly, without the spaces that json.dumps() puts between items.
+        To use a specific library, assign a new codec to Settings.json_codec, e.g.:
+            Settings.json_codec = JSONCodec('json')
+
+        Input:
+            - library: One of 'orjson', 'msgspec', 'ujson' or 'json'. None picks the first one that can be imported.
+        Note: numpy numbers and arrays are encoded as the numbers and lists they hold, whatever the library.
+        Note: decode() raises a ValueError for anything that is not valid json, whatever the library.
+    """
+    libraries = ('orjson', 'msgspec', 'ujson', 'json')
+
+    def __init__(self, library:str=None):
+        if library is not None and library not in self.libraries:
+            raise Exception(f'library has to be one of {", ".join(self.libraries)}, not {library!r}')
+        for name in [library] if library else self.libraries:
+            try: self._encode, self._decode, self._errors = getattr(self, f'_{name}')()
+            except ImportError:
+                if library: raise
+                continue
+            self.library = name
+            break
+
+    def __repr__(self): return f'JSONCodec({self.library!r})'
+
+    def encode(self, obj) -> bytes:
+        """Return obj as utf-8 encoded json"""
+        return self._encode(obj)
+
+    def decode(self, data:bytes):
+        """Return the python object that data, utf-8 encoded json, stands for"""
+        try: return self._decode(data)
+        except self._errors as e: raise ValueError(str(e)) from e
+
+    # each returns encode(), decode() and the errors of decode() that are no ValueErrors
+    @staticmethod
+    def _orjson():
+        import orjson
+        option = orjson.OPT_SERIALIZE_NUMPY
+        return lambda obj: orjson.dumps(obj, default=_to_builtin, option=option), orjson.loads, ()
+
+    @staticmethod
+    def _msgspec():
+        import msgspec
+        return msgspec.json.Encoder(enc_hook=_to_builtin).encode, msgspec.json.Decoder().decode, (msgspec.DecodeError,)
+
+    @staticmethod
+    def _ujson():
+        import ujson
+        return lambda obj: ujson.dumps(obj, ensure_ascii=False, default=_to_builtin).encode(), ujson.loads, ()
+
+    @staticmethod
+    def _json():
+        encoder = json.JSONEncoder(separators=(',', ':'), allow_nan=False, default=_to_builtin)
+        return lambda obj: encoder.encode(obj).encode(), json.loads, ()
+
+def _to_builtin(obj):
+    """Turn objects the json libraries don't know, like numpy numbers and arrays, into ones they do"""
+    if hasattr(obj, 'tolist'): return obj.tolist()
+    if hasattr(obj, 'to_dict'): return obj.to_dict() # osnapi.records
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+Settings.json_codec = JSONCodec()
+
+# Internal Cell
+def handle_response(query:str, response) -> Union[Dict, str]:
     """ If the HTTPS Status Code is 200, the json response will be returned as a dictionary.
         Otherwise an Exception with some information about the query is raised.
         If for some reason a conversion to json is not possible, uses the raw text representation.
     """
-    try:    text = response.json()
-    except: text = response.text
-    if response.status_code == 200: return text
+    return check_status(query, response.status_code, decode_body(response.content))
+
+def check_status(query:str, status_code:int, text:Union[Dict, str]) -> Union[Dict, str]:
+    """ Return text if status_code is 200, otherwise raise an Exception that fits the status_code.
+        Used by handle_response, and by other transports that decode the response themselves.
+    """
+    if status_code == 200: return text
 
-    info = f'\n--Status Code   : {response.status_code}\n--Request to    : {query}\n--Response Body : {text}'
+    info = f'\n--Status Code   : {status_code}\n--Request to    : {query}\n--Response Body : {text}'
 
-    if response.status_code == 500 or response.status_code == 401:
+    if status_code == 500 or status_code == 401:
         raise PermissionError(f'The Server has refused this request, due to you attempting something that requires authorization.\
         Try logging in and repeating the Request.{info}')
 
-    if response.status_code == 408:
-        raise Exception(f'The Server has closed this connection, probably due to the request being too large,\
+    if status_code == 408:
+        raise RequestTimeoutError(f'The Server has closed this connection, probably due to the request being too large,\
         or the server being under heavy load. Try sending less data at once.{info}')
 
     raise Exception(f'Something went wrong with your request.{info}')
 
+# Internal Cell
+def decode_body(body:bytes) -> Union[Dict, str]:
+    """Decode a raw response body as json using Settings.json_codec, or as text if it's not json, e.g. 'OK'"""
+    try:    return Settings.json_codec.decode(body)
+    except ValueError: return body.decode(errors='replace')
+
 # Internal Cell
 def _try_login(_):
-    """Callback that attempts to re-authenticate by using stored Settings"""
-    if Settings.username and Settings.password:
-        try: login(Settings.username, Settings.password)
-        except: return False
-        else: return True
-    else: return False
+    """Callback that attempts to re-authenticate by using stored Settings, see refresh_token()"""
+    return refresh_token(getattr(_token_local, 'sent', None))
+
+def _ensure_token(requires_auth:bool):
+    """Refresh the token before a request that needs it, if it's about to run out"""
+    if requires_auth and token_needs_refresh(): refresh_token(Settings.auth_token)
+
+def send_request(method:str, query:str, requires_auth:bool=False, headers:Dict=None, **kwargs):
+    """ Sends an HTTP request and returns the final response, after all retries.
+        Connection errors and overloaded Servers are retried according to Settings.retry_policy,
+        and every try waits for Settings.rate_limiter, if there is one.
+        A 401 / 500 leads to a login using the stored Settings, and one more try.
+        kwargs (data and stream) are passed on to the request() of the transport, see Settings.transport.
+    """
+    policy, attempt, logged_in, again, probe = Settings.retry_policy, 0, False, False, False
+    try:
+        while True:
+            _ensure_token(requires_auth)
+            request_headers = generate_headers(requires_auth)
+            if headers: request_headers = {**request_headers, **headers}
+            # the login retry below is the same request, which passed the circuit already
+            if policy is not None and not again: probe = policy.before(query)
+            again = False
+            limiter = Settings.rate_limiter
+            if limiter is not None: started = limiter.acquire()
+            if attempt: record('retries', 1)
+            sent, connected = time.perf_counter(), record('connect', 0)
+            try:
+                response = get_transport().request(method, query, request_headers, timeout=Settings.timeout, **kwargs)
+            except Exception as e:
+                kind = connection_error(e)
+                if limiter is not None: limiter.release(started, error=kind is not None)
+                wait = None if policy is None or kind is None else policy.delay(query, method, attempt, error=kind)
+                if wait is None: raise
+            except BaseException: # e.g. a KeyboardInterrupt, the slot is given back without adapting the limits
+                if limiter is not None: limiter.release(started)
+                raise
+            else:
+                status = response.status_code
+                _record_response(response, time.perf_counter() - sent, record('connect', 0) - connected)
+                if limiter is not None: limiter.release(started, status)
+                if status in (401, 500) and not logged_in and _try_login(None):
+                    response.close()
+                    logged_in = again = True
+                    continue
+                if policy is None: return response
+                if status not in policy.retry_statuses:
+                    policy.success(query)
+                    return response
+                wait = policy.delay(query, method, attempt, status, response.headers)
+                if wait is None: return response
+                response.close()
+            attempt += 1
+            time.sleep(wait)
+    finally:
+        if probe: policy.probed(query)
+
+def _record_response(response, seconds:float, connect:float):
+    """Add the timings and sizes of response to the info of the current request. connect is part of seconds."""
+    info = getattr(_observed, 'info', None)
+    if info is None: return
+    elapsed = min(seconds, response.elapsed) # ends when the headers are parsed
+    info['status'] = response.status_code
+    info['ttfb'] += max(0.0, elapsed - connect)
+    info['download'] += seconds - elapsed
+    info['request_bytes'] += response.request_bytes
+    info['response_bytes'] += response.received() # as sent by the Server, before it's decompressed
+
+def request_key(query:str, requires_auth:bool) -> str:
+    """The key under which a GET request is cached and coalesced: its URL, and the user if it needs authorization"""
+    return f'{Settings.username if requires_auth else ""} {query}'
+
+def get_body(query:str, requires_auth:bool=False) -> bytes:
+    """ Sends an HTTP GET request using query as URL, and returns the raw body of the response.
+        Raises like handle_response() if the status code is not 200.
+        If Settings.response_cache is set, fresh responses are taken from the cache,
+        and stale ones are revalidated with the Server if possible.
+    """
+    cache = Settings.response_cache
+    if cache is None:
+        response = send_request('GET', query, requires_auth)
+        if response.status_code != 200: handle_response(query, response)
+        return response.content
+    key = request_key(query, requires_auth)
+    body, validators = cache.lookup(key, query)
+    if body is not None and not validators:
+        _set_source('cache')
+        return body
+    response = send_request('GET', query, requires_auth, headers=validators)
+    if response.status_code == 304 and validators:
+        cache.revalidated(key, body, response.headers)
+        _set_source('cache')
+        return body
+    if response.status_code != 200: handle_response(query, response)
+    cache.store(key, response.content, response.headers, changed=bool(validators))
+    return response.content
+
+def _set_source(source:str):
+    info = getattr(_observed, 'info', None)
+    if info is not None: info['source'] = source
+
+class Flight():
+    """A GET request that is in flight, or finished less than Settings.coalesce_memo seconds ago"""
+    def __init__(self):
+        self.done, self.body, self.error, self.finished = threading.Event(), None, None, None
+
+_flights, _flights_lock = {}, threading.Lock()
+
+def coalesced_get(query:str, requires_auth:bool=False) -> bytes:
+    """ Like get_body(), but if the same request is in flight already, waits for it and shares its body,
+        instead of sending another one. Errors are shared as well.
+    """
+    key, now, memo = request_key(query, requires_auth), time.monotonic(), Settings.coalesce_memo
+    with _flights_lock:
+        flight = _flights.get(key)
+        if flight is not None and flight.finished is not None and now - flight.finished > memo: flight = None
+        leader = flight is None
+        if leader: flight = _flights[key] = Flight()
+    if not leader:
+        _set_source('coalesced')
+        flight.done.wait()
+        if flight.error is not None: raise flight.error
+        return flight.body
+    try: flight.body = get_body(query, requires_auth)
+    except BaseException as e: flight.error = e # even e.g. a KeyboardInterrupt, so the followers don't wait forever
+    finally:
+        with _flights_lock:
+            flight.finished = time.monotonic()
+            if not memo or flight.error is not None: del _flights[key]
+            else: # forget the ones that ran out
+                for k in [k for k, f in _flights.items()
+                          if f.finished is not None and flight.finished - f.finished > memo]:
+                    del _flights[k]
+        flight.done.set()
+    if flight.error is not None: raise flight.error
+    return flight.body
 
-@retry_on(PermissionError, retries=1, on_failure=_try_login)
 def send_get(query:str, requires_auth:bool=False) -> Dict:
     """ Sends an HTTP GET request using query as URL.
+        If Settings.coalesce_gets is set, identical requests in flight at the same time share one download.
+        Each caller gets its own decoded result, so changing it doesn't affect the others.
     """
-    headers = generate_headers(requires_auth)
-    response = requests.get(url=query,headers=headers)
-    return handle_response(query, response)
+    get = coalesced_get if Settings.coalesce_gets else get_body
+    with observe('GET', query) as info:
+        body = get(query, requires_auth)
+        return _decode(info, body)
 
-@retry_on(PermissionError, retries=1, on_failure=_try_login)
-def send_post(query:str, body:Dict, requires_auth:bool=False) -> Dict:
+def _decode(info:Dict, body:bytes) -> Union[Dict, str]:
+    start = time.perf_counter()
+    try: return decode_body(body)
+    finally: info['decode'] += time.perf_counter() - start
+
+def send_post(query:str, body:Union[Dict, bytes], requires_auth:bool=False) -> Dict:
     """ Sends an HTTP POST request using query as URL and body as json content.
+        body can also be json that is encoded already, as bytes.
+        The body is compressed if Settings.compress_requests is set, see compress_body().
+    """
+    with observe('POST', query) as info:
+        data, headers = compress_body(body if isinstance(body, bytes) else Settings.json_codec.encode(body))
+        response = send_request('POST', query, requires_auth, headers=headers, data=data)
+        if response.status_code != 200: handle_response(query, response)
+        return _decode(info, response.content)
+
+def _zstd():
+    """The zstd module that is installed, zstandard or compression.zstd (python 3.14), or None"""
+    try: import zstandard as zstd
+    except ImportError:
+        try: from compression import zstd
+        except ImportError: return None
+    return zstd
+
+def compress_body(data:bytes) -> Tuple[bytes, Dict[str, str]]:
+    """ Compress a request body with Settings.compress_requests, if it has at least Settings.compress_min_bytes.
+        Returns the body to send, and the headers that say how it's encoded.
+        'zstd' falls back to gzip if no zstd library is installed.
+        If compressing doesn't make the body smaller, it's sent as it is.
     """
-    headers = generate_headers(requires_auth)
-    response = requests.post(url=query, json=body, headers=headers)
-    return handle_response(query, response)
+    method = Settings.compress_requests
+    if not method or len(data) < Settings.compress_min_bytes: return data, {}
+    if method not in ('gzip', 'zstd'):
+        raise Exception(f'Settings.compress_requests has to be None, \'gzip\' or \'zstd\', not {method!r}')
+    zstd = _zstd() if method == 'zstd' else None
+    if zstd is not None: compressed, encoding = zstd.compress(data), 'zstd'
+    else:                compressed, encoding = gzip.compress(data), 'gzip'
+    if len(compressed) >= len(data): return data, {}
+    return compressed, {'content-encoding': encoding}
 
-@retry_on(PermissionError, retries=1, on_failure=_try_login)
 def send_delete(query:str, requires_auth:bool=False) -> Dict:
     """ Sends an HTTP DELETE request using query as URL.
     """
-    headers = generate_headers(requires_auth)
-    response = requests.delete(url=query, headers=headers)
-    return handle_response(query, response)
+    with observe('DELETE', query) as info:
+        response = send_request('DELETE', query, requires_auth)
+        if response.status_code != 200: handle_response(query, response)
+        return _decode(info, response.content)
 
 # Internal Cell
 def build_query(target:str, **kwargs):
@@ -130,6 +867,37 @@ def build_query(target:str, **kwargs):
         if value and key != 'self': query += f'{key}={value}&'
     return query
 
+# Internal Cell
+from datetime import datetime, timedelta, timezone
+
+def parse_timestamp(timestamp:Union[str, datetime]) -> datetime:
+    """ Turn a timestamp as used by the api, e.g. '2019-11-23T01:23:45.678Z', into a timezone aware datetime.
+        The date alone, or the time without milliseconds also work.
+        datetimes are passed through, naive ones are assumed to be in UTC.
+    """
+    if isinstance(timestamp, datetime):
+        return timestamp if timestamp.tzinfo else timestamp.replace(tzinfo=timezone.utc)
+    ts = timestamp.rstrip('Z')
+    fmt = '%Y-%m-%dT%H:%M:%S.%f' if '.' in ts else '%Y-%m-%dT%H:%M:%S' if 'T' in ts else '%Y-%m-%d'
+    return datetime.strptime(ts, fmt).replace(tzinfo=timezone.utc)
+
+def format_timestamp(timestamp:Union[str, datetime]) -> str:
+    """Turn a datetime into a timestamp as used by the api, e.g. '2019-11-23T01:23:45.678Z'"""
+    return parse_timestamp(timestamp).astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%f')[:-3] + 'Z'
+
+# Internal Cell
+def _columnar(result:Union[SensorWithValue, List[SensorWithValue]], columnar:Union[bool, str]):
+    """Apply the columnar option of the value functions. numpy is only imported when it's used."""
+    if not columnar: return _records(result)
+    from .columnar import as_columnar
+    return as_columnar(result, columnar)
+
+def _records(result):
+    """Apply Settings.records to what an api function returns. osnapi.records is only imported when it's used."""
+    if not Settings.records: return result
+    from .records import to_records
+    return to_records(result)
+
 # Cell
 def login(username:str, password:str) -> str:
     """ HTTP: POST
@@ -141,6 +909,7 @@ def login(username:str, password:str) -> str:
         Output:
              - A login Token that can be used for 1 hour.
         Note: The Token is automatically added to the Settings and used whenever one is needed.
+              Shortly before it runs out, a new one is requested in the background, see Settings.token_refresh_margin.
         Note: username and password are also stored in the Settings.
         Example:
             {'id': '...'}
@@ -149,7 +918,7 @@ def login(username:str, password:str) -> str:
     body = {'username': username, 'password': password}
     token = send_post(query, body)['id']
     Settings.username, Settings.password = username, password
-    Settings.auth_token = token
+    set_token(token)
     return token
 
 # Cell
@@ -221,7 +990,7 @@ def getSensors(measurandId:int=None,
     """
     args = locals()
     query = build_query(target='/sensors', **args)
-    return send_get(query)
+    return _records(send_get(query))
 
 # Cell
 def getSensor(id:int) -> Sensor:
@@ -251,7 +1020,7 @@ def getSensor(id:int) -> Sensor:
             }
     """
     query = build_query(target=f'/sensors/{id}')
-    return send_get(query)
+    return _records(send_get(query))
 
 # Cell
 def addSensor(body:Sensor) -> Sensor:
@@ -295,7 +1064,7 @@ def addSensor(body:Sensor) -> Sensor:
             }
     """
     query = build_query(target='/sensors/addSensor')
-    return send_post(query, body, requires_auth=True)
+    return _records(send_post(query, body, requires_auth=True))
 
 # Cell
 def deleteSensor(id:int) -> str:
@@ -311,7 +1080,7 @@ def deleteSensor(id:int) -> str:
         Note: weird status codes cause an Exception() to be thrown.
     """
     query = build_query(target=f'/sensors/{id}')
-    return send_delete(query, requires_auth=True)
+    return _records(send_delete(query, requires_auth=True))
 
 # Cell
 def mySensors() -> List[Sensor]:
@@ -341,7 +1110,7 @@ def mySensors() -> List[Sensor]:
             ]
     """
     query = build_query(target='/sensors/mysensors')
-    return send_get(query, requires_auth=True)
+    return _records(send_get(query, requires_auth=True))
 
 # Cell
 def mySensorIds() -> List[int]:
@@ -354,7 +1123,7 @@ def mySensorIds() -> List[int]:
             [61, 62, 63]
     """
     query = build_query(target='/sensors/mysensorids')
-    return send_get(query, requires_auth=True)
+    return _records(send_get(query, requires_auth=True))
 
 # Cell
 #######################################
@@ -364,13 +1133,15 @@ def mySensorIds() -> List[int]:
 # Cell
 def getFirstLastValueForSensor(id:int,
                                first:bool,
-                               last:bool) -> SensorWithValue:
+                               last:bool,
+                               columnar:Union[bool, str]=False) -> SensorWithValue:
     """ HTTP: GET
 
         Input:
             - id: The id of the Sensor you want to get values from
             - first: whether or not to get its first value
             - last:  whether or not to get its last value
+            - columnar: see getValuesForSensor()
         Note: At least one of either first or last must be True, or both.
 
         Output:
@@ -403,7 +1174,7 @@ def getFirstLastValueForSensor(id:int,
     else:
         raise Exception(f'At least one of the options has to be true:\
         \nfirst: {first}\nlast: {last}')
-    return send_get(query)
+    return _columnar(send_get(query), columnar)
 
 # Cell
 def getValues(measurandId:int=None,
@@ -423,11 +1194,15 @@ def getValues(measurandId:int=None,
               requiresAttribution:bool=None,
               requiresChangeNote:bool=None,
               requiresShareAlike:bool=None,
-              requiresKeepOpen:bool=None) -> List[SensorWithValue]:
+              requiresKeepOpen:bool=None,
+              columnar:Union[bool, str]=False) -> List[SensorWithValue]:
     """ HTTP: GET
 
         Input:
         Note: All parameters are optional.
+        Note: If columnar is True or 'numpy', a Dict mapping each Sensor id to its values as numpy arrays is returned.
+              If columnar is 'pandas', a DataFrame with the columns sensorId, timestamp and numberValue is returned.
+              See osnapi.columnar for details.
 
         Output:
             - A List of Sensors, each including its matching values in the 'values' attribute.
@@ -454,8 +1229,9 @@ def getValues(measurandId:int=None,
             ]
     """
     args = locals()
+    columnar = args.pop('columnar')
     query = build_query(target='/values', **args)
-    return send_get(query)
+    return _columnar(send_get(query), columnar)
 
 # Cell
 def getValuesForSensor(id:int,
@@ -464,11 +1240,15 @@ def getValuesForSensor(id:int,
                        aggregationType:str=None,
                        aggregationRange:str=None,
                        minValue:float=None,
-                       maxValue:float=None) -> SensorWithValue:
+                       maxValue:float=None,
+                       columnar:Union[bool, str]=False) -> SensorWithValue:
     """ HTTP: GET
 
         Input:
         Note: All values except for id are optional.
+        Note: If columnar is True or 'numpy', only the values are returned, as numpy arrays:
+              {'timestamp': datetime64[ms] array, 'numberValue': float64 array}
+              If columnar is 'pandas', a DataFrame with the columns sensorId, timestamp and numberValue is returned.
 
         Output:
             - A Sensor, including all its values stored in the 'values' attribute.
@@ -493,8 +1273,9 @@ def getValuesForSensor(id:int,
             }
     """
     args = locals()
+    columnar = args.pop('columnar')
     query = build_query(target=f'/sensors/{args.pop("id")}/values', **args)
-    return send_get(query)
+    return _columnar(send_get(query), columnar)
 
 # Cell
 def addValue(body:Value) -> str:
@@ -516,7 +1297,7 @@ def addValue(body:Value) -> str:
         Note: weird status codes cause an Exception() to be thrown.
     """
     query = build_query(target='/sensors/addValue')
-    return send_post(query, body, requires_auth=True)
+    return _records(send_post(query, body, requires_auth=True))
 
 # Cell
 def addMultipleValues(body:Dict[str, List[Value]]) -> str:
@@ -548,7 +1329,7 @@ def addMultipleValues(body:Dict[str, List[Value]]) -> str:
         Note: weird status codes cause an Exception() to be thrown.
     """
     query = build_query(target='/sensors/addMultipleValues')
-    return send_post(query, body, requires_auth=True)
+    return _records(send_post(query, body, requires_auth=True))
 
 # Cell
 #######################################
@@ -566,7 +1347,7 @@ def profile() -> List[Dict[str, Union[str, int]]]:
             [{'username': 'yourname', 'id': 123}]
     """
     query = build_query(target='/users/profile')
-    return send_get(query, requires_auth=True)
+    return _records(send_get(query, requires_auth=True))
 
 # Cell
 #######################################
@@ -593,7 +1374,7 @@ def getMeasurands(name:str=None) -> List[Measurand]:
     """
     args = locals()
     query = build_query(target='/measurands', **args)
-    return send_get(query)
+    return _records(send_get(query))
 
 # Cell
 def getMeasurand(id:int) -> Measurand:
@@ -610,7 +1391,7 @@ def getMeasurand(id:int) -> Measurand:
             {'id': 1, 'name': 'temperature', 'defaultUnitId': 1}
     """
     query = build_query(target=f'/measurands/{id}')
-    return send_get(query)
+    return _records(send_get(query))
 
 # Cell
 #######################################
@@ -654,7 +1435,7 @@ def getLicenses(shortName:str=None,
     """
     args = locals()
     query = build_query(target='/licenses', **args)
-    return send_get(query)
+    return _records(send_get(query))
 
 # Cell
 def getLicense(id:int) -> License:
@@ -684,7 +1465,7 @@ def getLicense(id:int) -> License:
             }
     """
     query = build_query(target=f'/licenses/{id}')
-    return send_get(query)
+    return _records(send_get(query))
 
 # Cell
 #######################################
@@ -719,7 +1500,7 @@ def getUnits(name:str=None,
     """
     args = locals()
     query = build_query(target='/units', **args)
-    return send_get(query)
+    return _records(send_get(query))
 
 # Cell
 def getUnit(id:int) -> Unit:
@@ -740,4 +1521,4 @@ def getUnit(id:int) -> Unit:
             }
     """
     query = build_query(target=f'/units/{id}')
-    return send_get(query)
\ No newline at end of file
+    return _records(send_get(query))
\ No newline at end of file
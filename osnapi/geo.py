@@ -0,0 +1,270 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 08_geo.ipynb (unless otherwise specified).
+
+__all__ = ['SensorCatalog']
+
+# Cell
+import math
+import time
+import threading
+from .core import getSensor
+from .stream import streamSensors
+from .cache import ReferenceCache
+
+# Internal Cell
+from typing import List, Tuple, Dict, Union, Optional, Callable, Iterable, Iterator
+from .core import Sensor
+
+# Cell
+#######################################
+#               HELPERS               #
+#######################################
+
+# Internal Cell
+_earth_radius = 6_371_008.8 # meters
+_meters_per_degree = math.pi * _earth_radius / 180
+
+def distance(lat1:float, lng1:float, lat2:float, lng2:float) -> float:
+    """The great circle distance between two points in meters (haversine formula)"""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    a = math.sin((p2 - p1) / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(math.radians(lng2 - lng1) / 2) ** 2
+    return 2 * _earth_radius * math.asin(min(1.0, math.sqrt(a)))
+
+# Internal Cell
+def to_points(coordinates:Union[List[float], List[List[float]]]) -> List[Tuple[float, float]]:
+    """Turn [lat1, lng1, lat2, lng2, ...] or [[lat1, lng1], [lat2, lng2], ...] into a List of (lat, lng) pairs"""
+    flat = [float(c) for point in coordinates for c in (point if isinstance(point, (list, tuple)) else [point])]
+    if len(flat) % 2: raise Exception(f'Coordinates have to come in (lat, lng) pairs, got {coordinates!r}')
+    return list(zip(flat[0::2], flat[1::2]))
+
+# Internal Cell
+def in_polygon(lat:float, lng:float, polygon:List[Tuple[float, float]]) -> bool:
+    """Whether the point lies inside polygon, using the even-odd rule on the plain lat / lng coordinates"""
+    inside, j = False, len(polygon) - 1
+    for i in range(len(polygon)):
+        (lat_i, lng_i), (lat_j, lng_j) = polygon[i], polygon[j]
+        if (lat_i > lat) != (lat_j > lat) and lng < (lng_j - lng_i) * (lat - lat_i) / (lat_j - lat_i) + lng_i:
+            inside = not inside
+        j = i
+    return inside
+
+# Internal Cell
+class Grid():
+    """ A spatial index that puts points into cells of cell_size x cell_size degrees.
+        Queries only look at the cells that overlap the area they are interested in.
+    """
+    def __init__(self, cell_size:float=0.05):
+        self.cell_size = cell_size
+        self.columns = max(1, round(360 / cell_size))
+        self.cells = {} # (row, column) -> {id: (lat, lng)}
+        self.points = {} # id -> (row, column)
+
+    def _cell(self, lat:float, lng:float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_size), math.floor((lng + 180) / self.cell_size) % self.columns
+
+    def add(self, id:int, lat:float, lng:float):
+        self.remove(id)
+        cell = self._cell(lat, lng)
+        self.cells.setdefault(cell, {})[id] = (lat, lng)
+        self.points[id] = cell
+
+    def remove(self, id:int):
+        cell = self.points.pop(id, None)
+        if cell is None: return
+        del self.cells[cell][id]
+        if not self.cells[cell]: del self.cells[cell]
+
+    def box(self, lat1:float, lng1:float, lat2:float, lng2:float) -> Iterator[Tuple[int, float, float]]:
+        """ Yield (id, lat, lng) of all points in the box between the two corners.
+            If lng1 > lng2, the box crosses the antimeridian.
+        """
+        lat1, lat2 = min(lat1, lat2), max(lat1, lat2)
+        wraps = lng1 > lng2
+        row1, col1 = self._cell(lat1, lng1)
+        row2, col2 = self._cell(lat2, lng2)
+        if wraps: ncols = (col2 - col1) % self.columns + 1 if col2 != col1 else self.columns
+        else: ncols = min(self.columns, math.floor((lng2 + 180) / self.cell_size)
+                                        - math.floor((lng1 + 180) / self.cell_size) + 1)
+        if len(self.cells) < (row2 - row1 + 1) * ncols: # fewer filled cells than cells in the box
+            cells = [c for c in self.cells if row1 <= c[0] <= row2 and (c[1] - col1) % self.columns < ncols]
+        else:
+            cells = [(r, (col1 + c) % self.columns) for r in range(row1, row2 + 1) for c in range(ncols)]
+        for cell in cells:
+            for id, (lat, lng) in self.cells.get(cell, {}).items():
+                if lat1 <= lat <= lat2 and ((lng1 <= lng <= lng2) if not wraps else (lng >= lng1 or lng <= lng2)):
+                    yield id, lat, lng
+
+    def radius(self, lat:float, lng:float, meters:float) -> Iterator[Tuple[int, float]]:
+        """Yield (id, distance) of all points at most meters away from (lat, lng)"""
+        dlat = meters / _meters_per_degree
+        lat1, lat2 = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+        widest = max(abs(lat1), abs(lat2))
+        if widest >= 90 or meters >= math.pi * _earth_radius / 2: dlng = 180.0
+        else: dlng = min(180.0, dlat / math.cos(math.radians(widest)))
+        if dlng >= 180: lng1, lng2 = -180.0, 180.0
+        else: lng1, lng2 = (lng - dlng + 180) % 360 - 180, (lng + dlng + 180) % 360 - 180
+        for id, plat, plng in self.box(lat1, lng1, lat2, lng2):
+            d = distance(lat, lng, plat, plng)
+            if d <= meters: yield id, d
+
+    def nearest(self, lat:float, lng:float, n:int, max_meters:float=None,
+                accept:Callable[[int], bool]=None) -> List[Tuple[int, float]]:
+        """ Return (id, distance) of the n points closest to (lat, lng), closest first.
+            The search radius starts at about one cell and doubles until n points are inside of it.
+            Only points for which accept(id) is True are counted.
+        """
+        limit = math.pi * _earth_radius if max_meters is None else max_meters
+        meters = min(limit, self.cell_size * _meters_per_degree)
+        while True:
+            found = [(id, d) for id, d in self.radius(lat, lng, meters) if accept is None or accept(id)]
+            if len(found) >= n or meters >= limit:
+                return sorted(found, key=lambda p: p[1])[:n]
+            meters = min(limit, 2 * meters)
+
+# Cell
+#######################################
+#              SENSORS                #
+#######################################
+
+# Cell
+class SensorCatalog():
+    """ Keeps all Sensors in memory, together with a spatial index on their locations,
+        so that getSensors() and getSensor() are answered locally, without a request per lookup.
+        The Sensor list is downloaded once, and again by refresh(), or on use once it is older than ttl seconds.
+        A refresh only updates the index for Sensors that were added, changed or deleted since the last one.
+        Lookups go on with the old list while the new one downloads, and only wait for the index to be updated.
+
+        Input:
+            - ttl: How many seconds the Sensor list is used before it's downloaded again. None means never.
+            - cell_size: The size of the cells of the index, in degrees. Queries look at whole cells,
+              so it should be a bit larger than a typical query area, but small compared to the whole catalog.
+            - reference: The ReferenceCache used to look up the Licenses for the license filters.
+        Note: Points are given in the order [lat, lng], like the location of a Sensor.
+              A boundingBox is two opposite corners [lat1, lng1, lat2, lng2],
+              a boundingPolygon is a List of corners, either flat or as [lat, lng] pairs.
+        Example:
+            catalog = SensorCatalog(ttl=60*60)
+            catalog.getSensors(refPoint=[52.51, 13.32], numNearest=5, measurandId=1)
+            catalog.getSensors(boundingBox=[52.3, 13.0, 52.7, 13.8], allowsRedistribution=True)
+    """
+    def __init__(self, ttl:float=None, cell_size:float=0.05, reference:ReferenceCache=None):
+        self.ttl = ttl
+        self.reference = reference or ReferenceCache()
+        self.lock = threading.RLock()
+        self.refreshing = threading.RLock() # only one refresh at a time, without blocking the lookups
+        self.sensors, self.grid, self.loaded = {}, Grid(cell_size), None
+
+    def refresh(self) -> Dict[str, int]:
+        """ Download the Sensor list again, and apply the differences to the index.
+            Returns how many Sensors were added, updated and removed.
+        """
+        stats = {'added': 0, 'updated': 0, 'removed': 0}
+        with self.refreshing:
+            fresh = {sensor['id']: sensor for sensor in streamSensors()} # downloaded without holding the lock
+            with self.lock:
+                for id, sensor in fresh.items():
+                    old = self.sensors.get(id)
+                    if old == sensor: continue
+                    stats['updated' if old is not None else 'added'] += 1
+                    self._put(sensor)
+                for id in [id for id in self.sensors if id not in fresh]:
+                    self._drop(id)
+                    stats['removed'] += 1
+                self.loaded = time.time()
+        return stats
+
+    def update(self, ids:Iterable[int]):
+        """Request the Sensors with the given ids on their own and update them, e.g. after changing them"""
+        for id in ids:
+            try: sensor = getSensor(id)
+            except Exception: sensor = None
+            with self.lock:
+                if sensor and 'id' in sensor: self._put(sensor)
+                else: self._drop(id)
+
+    def _put(self, sensor:Sensor):
+        self.sensors[sensor['id']] = sensor
+        location = sensor.get('location') or {}
+        if location.get('lat') is None or location.get('lng') is None: return self.grid.remove(sensor['id'])
+        self.grid.add(sensor['id'], location['lat'], location['lng'])
+
+    def _drop(self, id:int):
+        self.sensors.pop(id, None)
+        self.grid.remove(id)
+
+    def _due(self) -> bool:
+        return self.loaded is None or (self.ttl is not None and time.time() - self.loaded > self.ttl)
+
+    def _ensure(self):
+        """Refresh the list if it's due. While another thread refreshes it, the old one is used, if there is one."""
+        if not self._due() or not self.refreshing.acquire(blocking=self.loaded is None): return
+        try:
+            if self._due(): self.refresh()
+        finally: self.refreshing.release()
+
+    def getSensor(self, id:int) -> Sensor:
+        """Cached version of osnapi.core.getSensor()"""
+        self._ensure()
+        with self.lock:
+            if id in self.sensors: return self.sensors[id]
+        return getSensor(id)
+
+    def getSensors(self,
+                   measurandId:int=None,
+                   refPoint:List[float]=None,
+                   maxDistance:float=None,
+                   numNearest:int=None,
+                   boundingBox:List[float]=None,
+                   boundingPolygon:List[float]=None,
+                   minAccuracy:int=None,
+                   maxAccuracy:int=None,
+                   maxSensors:int=None,
+                   allowsDerivatives:bool=None,
+                   allowsRedistribution:bool=None,
+                   requiresAttribution:bool=None,
+                   requiresChangeNote:bool=None,
+                   requiresShareAlike:bool=None,
+                   requiresKeepOpen:bool=None) -> List[Sensor]:
+        """ Cached version of osnapi.core.getSensors()
+            Note: maxDistance is in meters. With a refPoint, the Sensors are sorted by their distance to it.
+        """
+        licenses = {key: value for key, value in locals().items() if value and key.startswith(('allows', 'requires'))}
+        allowed = None
+        if licenses: allowed = {l['id'] for l in self.reference.getLicenses(**licenses)}
+
+        self._ensure()
+        with self.lock:
+            def accept(id):
+                s = self.sensors[id]
+                return ((not measurandId or s.get('measurandId') == measurandId)
+                        and (not minAccuracy or (s.get('accuracy') is not None and s['accuracy'] >= minAccuracy))
+                        and (not maxAccuracy or (s.get('accuracy') is not None and s['accuracy'] <= maxAccuracy))
+                        and (allowed is None or s.get('licenseId') in allowed))
+
+            polygon = to_points(boundingPolygon) if boundingPolygon else None
+            box = to_points(boundingBox) if boundingBox else None
+            if box and len(box) != 2: raise Exception(f'boundingBox needs two corners, got {boundingBox!r}')
+            def inside(id):
+                lat, lng = self.grid.cells[self.grid.points[id]][id]
+                return ((box is None or (min(box[0][0], box[1][0]) <= lat <= max(box[0][0], box[1][0])
+                                         and min(box[0][1], box[1][1]) <= lng <= max(box[0][1], box[1][1])))
+                        and (polygon is None or in_polygon(lat, lng, polygon)))
+
+            if refPoint:
+                (lat, lng), = to_points(refPoint)
+                if numNearest:
+                    found = self.grid.nearest(lat, lng, numNearest, maxDistance, lambda id: accept(id) and inside(id))
+                else:
+                    meters = maxDistance if maxDistance else math.pi * _earth_radius
+                    found = sorted(((id, d) for id, d in self.grid.radius(lat, lng, meters)
+                                    if accept(id) and inside(id)), key=lambda p: p[1])
+                ids = [id for id, _ in found]
+            elif box or polygon:
+                corners = box or polygon
+                lats, lngs = [p[0] for p in corners], [p[1] for p in corners]
+                # the grid yields them cell by cell, so sort them by id, before maxSensors cuts them off
+                ids = sorted(id for id, _, _ in self.grid.box(min(lats), min(lngs), max(lats), max(lngs))
+                             if accept(id) and inside(id))
+            else:
+                ids = sorted(id for id in self.sensors if accept(id)) # refresh() adds new Sensors at the end
+            if maxSensors: ids = ids[:maxSensors]
+            return [self.sensors[id] for id in ids]
\ No newline at end of file
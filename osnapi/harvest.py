@@ -0,0 +1,258 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 13_harvest.ipynb (unless otherwise specified).
+
+__all__ = ['harvest', 'load_harvest', 'main']
+
+# Cell
+import os
+import json
+import argparse
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from .core import Settings, getSensors, getValuesForSensor, _to_builtin
+
+# Internal Cell
+from typing import List, Tuple, Dict, Union, Optional, Callable, Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+from .core import Sensor, format_timestamp
+from .stream import time_windows
+
+# Cell
+#######################################
+#               HELPERS               #
+#######################################
+
+# Internal Cell
+_extensions = {'npy': '.npy', 'parquet': '.parquet', 'arrow': '.arrow'}
+_settings = ('api_endpoint', 'username', 'password', 'auth_token', 'auth_token_expiry', 'timeout')
+
+def _write_json(path:str, data):
+    """Write data to path as json, replacing the old file only once the new one is complete"""
+    with open(path + '.tmp', 'w') as f: # default turns Records into dicts, see Settings.records
+        json.dump(data, f, indent=1, default=_to_builtin)
+    os.replace(path + '.tmp', path)
+
+def write_columns(path:str, columns:Dict, format:str):
+    """ Write the columns of one Sensor (see osnapi.columnar) to path, replacing the old file only once it's complete.
+        'npy' writes a structured numpy array with the fields timestamp and numberValue,
+        'parquet' and 'arrow' (Arrow IPC) a table with these columns, which needs pyarrow.
+    """
+    if format == 'npy':
+        import numpy as np
+        data = np.empty(len(columns['numberValue']), dtype=[('timestamp', 'datetime64[ms]'), ('numberValue', 'f8')])
+        data['timestamp'], data['numberValue'] = columns['timestamp'], columns['numberValue']
+        with open(path + '.tmp', 'wb') as f: np.save(f, data)
+    else:
+        try: import pyarrow as pa
+        except ImportError: raise Exception(f'Writing {format} files needs pyarrow. Install it, or use format=\'npy\'.')
+        table = pa.table({'timestamp': columns['timestamp'], 'numberValue': columns['numberValue']})
+        if format == 'parquet':
+            import pyarrow.parquet as pq
+            pq.write_table(table, path + '.tmp')
+        else:
+            with pa.OSFile(path + '.tmp', 'wb') as f, pa.ipc.new_file(f, table.schema) as writer: writer.write(table)
+    os.replace(path + '.tmp', path)
+
+def read_columns(path:str) -> Dict:
+    """The inverse of write_columns(), the format is taken from the file extension"""
+    import numpy as np
+    if path.endswith('.npy'):
+        data = np.load(path)
+        return {'timestamp': data['timestamp'], 'numberValue': data['numberValue']}
+    import pyarrow as pa
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+        table = pq.read_table(path)
+    else:
+        with pa.memory_map(path) as f: table = pa.ipc.open_file(f).read_all()
+    return {'timestamp': table['timestamp'].to_numpy().astype('datetime64[ms]'),
+            'numberValue': table['numberValue'].to_numpy()}
+
+# Internal Cell
+def load_checkpoint(path:str) -> Dict[Tuple[int, str], Dict]:
+    """ The (Sensor id, window start) pairs a shard has finished, from the checkpoint file at path.
+        A line that was only partly written when the process died is ignored.
+    """
+    done = {}
+    if not os.path.exists(path): return done
+    with open(path) as f:
+        for line in f:
+            try: record = json.loads(line)
+            except ValueError: continue
+            done[(record['id'], record['minTimestamp'])] = record
+    return done
+
+def _init_process(settings:Dict):
+    """Apply the Settings of the parent in a process of the pool, which starts out with the defaults"""
+    for key, value in settings.items(): setattr(Settings, key, value)
+    Settings.session = None # never share connections with the parent process
+
+def harvest_shard(path:str, shard:int, ids:List[int], windows:List[Tuple[str, str]], format:str,
+                  threads:int) -> Dict:
+    """ Download every (Sensor id, window) of one shard that isn't in its checkpoint yet, and write it to a file.
+        Runs with the Settings of the process, see _init_process().
+        Each finished unit is appended to the checkpoint right after its file is complete.
+    """
+    directory = os.path.join(path, f'shard-{shard:04d}')
+    os.makedirs(directory, exist_ok=True)
+    checkpoint = os.path.join(directory, 'checkpoint.jsonl')
+    done = load_checkpoint(checkpoint)
+    todo = [(id, start, stop) for id in ids for start, stop in windows if (id, start) not in done]
+    report = {'shard': shard, 'done': 0, 'skipped': len(ids) * len(windows) - len(todo), 'values': 0, 'failed': []}
+
+    def _fetch(id, start, stop):
+        return getValuesForSensor(id, minTimestamp=start, maxTimestamp=stop, columnar=True)
+
+    with open(checkpoint, 'a') as log, ThreadPoolExecutor(max_workers=threads) as pool:
+        def _handle(future):
+            id, start, stop = pending.pop(future)
+            try: columns = future.result()
+            except Exception as e: return report['failed'].append({'id': id, 'minTimestamp': start, 'error': repr(e)})
+            count, name = len(columns['numberValue']), None
+            if count:
+                name = f'{id}_{start.replace("-", "").replace(":", "")}{_extensions[format]}'
+                write_columns(os.path.join(directory, name), columns, format)
+            log.write(json.dumps({'id': id, 'minTimestamp': start, 'maxTimestamp': stop, 'count': count,
+                                  'file': name}) + '\n')
+            log.flush()
+            report['done'] += 1
+            report['values'] += count
+
+        pending = {}
+        for unit in todo:
+            pending[pool.submit(_fetch, *unit)] = unit
+            while len(pending) >= 2 * threads: # don't queue up more than needed
+                for future in wait(pending, return_when=FIRST_COMPLETED).done: _handle(future)
+        while pending:
+            for future in wait(pending, return_when=FIRST_COMPLETED).done: _handle(future)
+    return report
+
+# Cell
+#######################################
+#               HARVEST               #
+#######################################
+
+# Cell
+def harvest(path:str,
+            minTimestamp:Union[str, datetime],
+            maxTimestamp:Union[str, datetime]=None,
+            ids:List[int]=None,
+            window:timedelta=timedelta(days=30),
+            format:str='npy',
+            processes:int=None,
+            threads:int=4,
+            shards:int=None,
+            **filters) -> Dict:
+    """ HTTP: GET
+        Download all values of many Sensors into files in the directory path, using several processes.
+        The Sensor ids are split into shards, which are handed out to a pool of processes.
+        Each process requests the windows of its Sensors with up to threads requests at a time,
+        and writes every (Sensor, window) to its own file: path/shard-0003/<id>_<window start>.npy
+        An interrupted harvest continues where it stopped when it's called again with the same path and arguments,
+        because every finished (Sensor, window) is written to a checkpoint file of its shard.
+
+        Input:
+            - minTimestamp / maxTimestamp: The time range. maxTimestamp defaults to the time of the first run.
+            - ids: The Sensors to download. If None, all Sensors matching filters are downloaded.
+            - filters: Passed on to getSensors() to select the Sensors, e.g. measurandId=1 or boundingBox=[...].
+            - window: How much time to request per Sensor at once.
+            - format: 'npy', or 'parquet' / 'arrow' (Arrow IPC), which need pyarrow.
+            - processes: How many processes to use. Defaults to the number of CPUs. With 1, everything runs in this one.
+            - shards: How many shards to split the Sensors into. Defaults to 4 per process.
+        Note: path/manifest.json records what is harvested: the arguments, the Sensor ids, windows and shards.
+              path/sensors.json has the Sensors themselves.
+              Calling harvest() again on the same path with other arguments raises an Exception.
+        Note: Failed (Sensor, window) pairs are reported, and tried again on the next call.
+        Note: The processes are started with spawn, so a script that calls harvest() needs
+              the usual if __name__ == '__main__': guard.
+
+        Output:
+            - A summary: how many (Sensor, window) units there are, how many were done now, skipped because
+              they were done before, the number of values written, and the units that failed.
+        Example:
+            harvest('exports/temperature', minTimestamp='2019-01-01', maxTimestamp='2020-01-01', measurandId=1,
+                    boundingBox=[47.3, 5.9, 55.0, 15.0], processes=4)
+            load_harvest('exports/temperature')  # {id: {'timestamp': array([...]), 'numberValue': array([...])}}
+    """
+    if format not in _extensions: raise Exception(f'format has to be one of {", ".join(_extensions)}, not {format!r}')
+    if processes is None: processes = os.cpu_count() or 1
+    arguments = {'minTimestamp': format_timestamp(minTimestamp),
+                 'maxTimestamp': maxTimestamp and format_timestamp(maxTimestamp), 'ids': ids and sorted(ids),
+                 'window': window.total_seconds(), 'format': format, 'filters': filters}
+    os.makedirs(path, exist_ok=True)
+    manifest_path = os.path.join(path, 'manifest.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f: manifest = json.load(f)
+        given = {k: v for k, v in arguments.items() if k != 'maxTimestamp' or v is not None}
+        if any(json.dumps(manifest['arguments'][k]) != json.dumps(v) for k, v in given.items()):
+            raise Exception(f'{path} holds a harvest with other arguments: {manifest["arguments"]}. Use another path.')
+    else:
+        if ids is None:
+            sensors = getSensors(**filters)
+            ids = sorted(s['id'] for s in sensors)
+            _write_json(os.path.join(path, 'sensors.json'), sensors)
+        stop = format_timestamp(maxTimestamp or datetime.now(timezone.utc))
+        count = min(len(ids), shards or 4 * processes) or 1
+        ids = sorted(ids)
+        manifest = {'arguments': arguments, 'ids': ids, 'windows': list(time_windows(minTimestamp, stop, window)),
+                    'shards': [ids[i::count] for i in range(count)]}
+        _write_json(manifest_path, manifest)
+
+    windows = [tuple(w) for w in manifest['windows']]
+    jobs = [(path, i, shard, windows, format, threads) for i, shard in enumerate(manifest['shards'])]
+    if processes <= 1: reports = [harvest_shard(*job) for job in jobs]
+    else:
+        # spawn instead of fork, since the connection pools and timers of this process don't survive a fork
+        settings = {key: getattr(Settings, key) for key in _settings}
+        with ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_process, initargs=(settings,)) as pool:
+            reports = list(pool.map(harvest_shard, *zip(*jobs)))
+    return {'path': path, 'sensors': len(manifest['ids']), 'windows': len(windows),
+            'units': len(manifest['ids']) * len(windows),
+            **{key: sum(r[key] for r in reports) for key in ('done', 'skipped', 'values')},
+            'failed': [f for r in reports for f in r['failed']]}
+
+# Cell
+def load_harvest(path:str, ids:Iterable[int]=None) -> Dict[int, Dict]:
+    """ Read the files written by harvest() back in, as a Dict mapping each Sensor id to its columns,
+        oldest value first (see osnapi.columnar). Only the Sensors in ids, if given.
+    """
+    import numpy as np
+    wanted, parts = ids is not None and set(ids), {}
+    for shard in sorted(d for d in os.listdir(path) if d.startswith('shard-')):
+        checkpoint = os.path.join(path, shard, 'checkpoint.jsonl')
+        for (id, start), record in sorted(load_checkpoint(checkpoint).items()):
+            if record['file'] and (not wanted or id in wanted):
+                parts.setdefault(id, []).append(read_columns(os.path.join(path, shard, record['file'])))
+    return {id: {key: np.concatenate([p[key] for p in columns]) for key in ('timestamp', 'numberValue')}
+            for id, columns in sorted(parts.items())}
+
+# Cell
+def main(argv:List[str]=None):
+    """ Harvest values from the command line, see harvest():
+            python -m osnapi harvest exports/temperature --start 2019-01-01 --end 2020-01-01 --measurand 1
+            python -m osnapi harvest exports/berlin --start 2019-11-01 --box 52.3 13.0 52.7 13.8 --format parquet
+        Run the same command again to continue an interrupted harvest.
+    """
+    parser = argparse.ArgumentParser(prog='python -m osnapi harvest', description=main.__doc__.split('\n')[0])
+    parser.add_argument('path', help='the directory to write to')
+    parser.add_argument('--start', required=True, help='minTimestamp, e.g. 2019-11-01')
+    parser.add_argument('--end', help='maxTimestamp. Defaults to the time of the first run')
+    parser.add_argument('--ids', type=int, nargs='+', help='the Sensors to harvest, instead of the filters below')
+    parser.add_argument('--measurand', type=int, help='measurandId of the Sensors')
+    parser.add_argument('--box', type=float, nargs=4, metavar=('LAT1', 'LNG1', 'LAT2', 'LNG2'), help='boundingBox')
+    parser.add_argument('--polygon', type=float, nargs='+', help='boundingPolygon as lat lng pairs')
+    parser.add_argument('--window-days', type=float, default=30, help='days to request per Sensor at once')
+    parser.add_argument('--format', choices=list(_extensions), default='npy')
+    parser.add_argument('--processes', type=int, help='defaults to the number of CPUs')
+    parser.add_argument('--threads', type=int, default=4, help='requests at a time per process')
+    parser.add_argument('--endpoint', help='the api to use instead of Settings.api_endpoint')
+    args = parser.parse_args(argv)
+    if args.endpoint: Settings.api_endpoint = args.endpoint
+    filters = {k: v for k, v in (('measurandId', args.measurand), ('boundingBox', args.box),
+                                 ('boundingPolygon', args.polygon)) if v is not None}
+    summary = harvest(args.path, args.start, args.end, ids=args.ids, window=timedelta(days=args.window_days),
+                      format=args.format, processes=args.processes, threads=args.threads, **filters)
+    print(f'{summary["sensors"]} Sensors, {summary["windows"]} windows: {summary["done"]} done now, '
+          f'{summary["skipped"]} done before, {summary["values"]} values, {len(summary["failed"])} failed')
+    for failure in summary['failed']: print(f'failed: {failure}')
+    if summary['failed']: raise SystemExit(1)
\ No newline at end of file
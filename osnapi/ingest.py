@@ -0,0 +1,244 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 03_ingest.ipynb (unless otherwise specified).
+
+__all__ = ['addValuesInChunks', 'ValueWriter']
+
+# Cell
+import time
+import queue
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from .core import Settings, RequestTimeoutError, addMultipleValues, connection_error, build_query, send_post
+
+# Internal Cell
+from typing import List, Tuple, Dict, Union, Optional, Callable, Iterable, Iterator
+from .core import Value
+
+# Cell
+#######################################
+#               HELPERS               #
+#######################################
+
+# Internal Cell
+class ChunkSize():
+    """ The number of values per chunk, shared by everything that cuts or posts chunks.
+        When the Server rejects a chunk as too large, it drops to half the size of that chunk.
+        Because many chunks are in flight at once, it grows slowly,
+        and only after a chunk of the full size went through.
+    """
+    def __init__(self, value:int, minimum:int, maximum:int):
+        self.minimum, self.maximum = minimum, maximum
+        self.value = max(minimum, min(value, maximum))
+        self.lock = threading.Lock()
+
+    def shrink(self, rejected:int):
+        with self.lock: self.value = max(self.minimum, min(self.value, rejected // 2))
+
+    def grow(self, accepted:int):
+        with self.lock:
+            if accepted >= self.value: self.value = min(self.maximum, self.value + max(1, self.value // 16))
+
+# Internal Cell
+_envelope_size = len('{"collapsedMessages":[]}')
+
+def chunk_values(values:Iterable[Value], size:ChunkSize, max_bytes:int) -> Iterator[Dict]:
+    """ Cut values into chunks of at most size.value values and about max_bytes of encoded json.
+        size.value is looked up anew for every chunk, so changes to it apply to the next chunk.
+        A value that is larger than max_bytes on its own still gets a chunk of its own.
+        The values of a chunk are kept json encoded, so that they are encoded only once, see post_chunk().
+    """
+    chunk, nbytes, start, encode = [], _envelope_size, 0, Settings.json_codec.encode
+    for i, value in enumerate(values):
+        value = encode(value)
+        vbytes = len(value) + 1 # ',' separator
+        if chunk and (len(chunk) >= size.value or nbytes + vbytes > max_bytes):
+            yield {'start': start, 'values': chunk, 'bytes': nbytes, 'retries': 0, 'splits': 0}
+            chunk, nbytes, start = [], _envelope_size, i
+        chunk.append(value)
+        nbytes += vbytes
+    if chunk: yield {'start': start, 'values': chunk, 'bytes': nbytes, 'retries': 0, 'splits': 0}
+
+# Internal Cell
+def split_chunk(chunk:Dict) -> List[Dict]:
+    """Split chunk into two halves that remember how often their values have been retried and split"""
+    half = len(chunk['values']) // 2
+    parts = [(chunk['start'], chunk['values'][:half]), (chunk['start'] + half, chunk['values'][half:])]
+    return [{'start': start, 'values': values, 'bytes': _envelope_size + sum(len(v) + 1 for v in values),
+             'retries': chunk['retries'], 'splits': chunk['splits'] + 1} for start, values in parts]
+
+# Internal Cell
+def post_chunk(chunk:Dict) -> Optional[Exception]:
+    """ Send one chunk like addMultipleValues() does, and return the Exception it raised, if any.
+        The body is put together from the values that chunk_values() encoded already.
+    """
+    body = b'{"collapsedMessages":[' + b','.join(chunk['values']) + b']}'
+    try: send_post(build_query(target='/sensors/addMultipleValues'), body, requires_auth=True)
+    except Exception as e: return e
+
+# Cell
+#######################################
+#                VALUES               #
+#######################################
+
+# Cell
+def addValuesInChunks(values:Iterable[Value],
+                      chunk_size:int=1000,
+                      max_bytes:int=1_000_000,
+                      min_chunk_size:int=1,
+                      max_chunk_size:int=50_000,
+                      max_workers:int=None,
+                      retries:int=3) -> List[Dict]:
+    """ HTTP: POST
+        Note: This function requires previous authentication.
+        Like addMultipleValues(), but for any number of values, which are sent in chunks.
+
+        Input:
+            - values: An Iterable of Values, each including the sensorId that it should be added to.
+              It is only iterated once, and never held in memory as a whole.
+            - chunk_size: How many values to start out with per chunk.
+            - max_bytes: Upper limit for the size of the json encoded values in one chunk.
+            - min_chunk_size / max_chunk_size: The limits for the number of values per chunk.
+            - max_workers: How many chunks to send at the same time. Defaults to Settings.pool_maxsize
+            - retries: How often the values of a chunk are retried, before it's given up on.
+        Note: If the Server answers with 408 (request too large), the chunk is split in half and retried,
+              and the following chunks are at most half as large as the rejected one.
+              Splitting a chunk does not count towards its retries, only sending the same values again does.
+              After each chunk that went through, the chunk size grows slowly again.
+        Note: Connection errors are retried with the same chunk. Any other error fails the chunk right away.
+
+        Output:
+            - A List with one report per chunk that was sent, in the order of the values.
+              status is 'sent', 'retried' (sent, but only after a retry or a split) or 'failed'.
+              start is the index of the first value of the chunk within values.
+              retries is how often the chunk was sent again, splits how often its values were split in half.
+        Example:
+            [
+                {'start': 0,    'count': 1000, 'bytes': 78893, 'status': 'sent',    'retries': 0, 'splits': 0,
+                 'error': None},
+                {'start': 1000, 'count': 500,  'bytes': 39451, 'status': 'retried', 'retries': 0, 'splits': 1,
+                 'error': None},
+                {'start': 1500, 'count': 500,  'bytes': 39447, 'status': 'failed',  'retries': 3, 'splits': 1,
+                 'error': ConnectionError('Connection aborted.', ...)},
+            ]
+    """
+    if max_workers is None: max_workers = Settings.pool_maxsize
+    size = ChunkSize(chunk_size, min_chunk_size, max_chunk_size)
+    report, pending = [], {}
+
+    def _report(chunk, status, error=None):
+        report.append({'start': chunk['start'], 'count': len(chunk['values']), 'bytes': chunk['bytes'],
+                       'status': status, 'retries': chunk['retries'], 'splits': chunk['splits'], 'error': error})
+
+    def _handle(future):
+        chunk, error = pending.pop(future), future.result()
+        if error is None:
+            size.grow(len(chunk['values']))
+            return _report(chunk, 'sent' if chunk['retries'] == chunk['splits'] == 0 else 'retried')
+        if isinstance(error, RequestTimeoutError):
+            size.shrink(len(chunk['values']))
+            if len(chunk['values']) > 1:
+                for part in split_chunk(chunk): _submit(part)
+                return
+        elif connection_error(error) is None:
+            return _report(chunk, 'failed', error)
+        if chunk['retries'] >= retries: return _report(chunk, 'failed', error)
+        _submit({**chunk, 'retries': chunk['retries'] + 1})
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        def _submit(chunk): pending[pool.submit(post_chunk, chunk)] = chunk
+        for chunk in chunk_values(values, size, max_bytes):
+            _submit(chunk)
+            while len(pending) >= 2 * max_workers: # don't read ahead further than needed
+                for future in wait(pending, return_when=FIRST_COMPLETED).done: _handle(future)
+        while pending:
+            for future in wait(pending, return_when=FIRST_COMPLETED).done: _handle(future)
+    return sorted(report, key=lambda r: r['start'])
+
+# Cell
+class ValueWriter():
+    """ Collects values passed to write() and uploads them in the background, in batches,
+        instead of sending one request per value like addValue() does.
+        A batch is sent once it has max_values values, or max_delay seconds after its first value came in.
+        Note: This requires previous authentication, just like addMultipleValues().
+
+        Input:
+            - max_values: The largest number of values to send in one request.
+            - max_delay: How many seconds a value may wait for more values before it's sent.
+            - max_queue: How many values may wait to be sent. When the queue is full,
+              write() blocks until there is room again, so a slow Server slows down the writer.
+            - on_error: Called as on_error(exception, values) with the values that could not be sent.
+              If None, the pair is appended to the errors attribute instead.
+        Note: Batches the Server rejects as too large (408) are split in half and sent again.
+        Note: Remaining values are sent when close() is called, when leaving a with block,
+              and when the interpreter exits.
+        Example:
+            with ValueWriter(max_values=500, max_delay=2) as writer:
+                for reading in readings:
+                    writer.write({"sensorId": 61, "timestamp": reading.time, "numberValue": reading.value})
+    """
+    _flush, _stop = object(), object()
+
+    def __init__(self, max_values:int=1000, max_delay:float=1.0, max_queue:int=100_000, on_error:Callable=None):
+        self.max_values, self.max_delay, self.on_error = max_values, max_delay, on_error
+        self.sent, self.failed, self.errors = 0, 0, []
+        self.closed = False
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name='osnapi.ValueWriter', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def write(self, value:Value, block:bool=True, timeout:float=None):
+        """ Queue value to be sent. Only blocks when the queue is full.
+            If block is False, or the timeout runs out, queue.Full is raised instead.
+        """
+        if self.closed: raise Exception('Can\'t write to a closed ValueWriter.')
+        self._queue.put(value, block, timeout)
+
+    def flush(self):
+        """Send all values written so far, and wait until that is done"""
+        if self.closed: return
+        self._queue.put(self._flush)
+        self._queue.join()
+
+    def close(self):
+        """Send all values written so far, and stop the background thread"""
+        if self.closed: return
+        self.closed = True
+        self._queue.put(self._stop)
+        self._thread.join()
+        atexit.unregister(self.close)
+
+    def __enter__(self): return self
+    def __exit__(self, *args): self.close()
+
+    def _run(self):
+        stop = False
+        while not stop:
+            batch, item = [], self._queue.get()
+            deadline = time.monotonic() + self.max_delay
+            while True:
+                if item is self._stop: stop = True
+                elif item is not self._flush: batch.append(item)
+                if stop or item is self._flush or len(batch) >= self.max_values: break
+                try: item = self._queue.get(timeout=max(0, deadline - time.monotonic()))
+                except queue.Empty: break
+            self._send(batch)
+            for _ in range(len(batch) + (item is self._flush or item is self._stop)): self._queue.task_done()
+
+    def _send(self, values:List[Value]):
+        # no thread pool here, those can't be used anymore once the interpreter is shutting down
+        if not values: return
+        try: addMultipleValues({'collapsedMessages': values})
+        except RequestTimeoutError as e:
+            if len(values) == 1: return self._failed(e, values)
+            half = len(values) // 2
+            self._send(values[:half])
+            self._send(values[half:])
+        except Exception as e: self._failed(e, values)
+        else: self.sent += len(values)
+
+    def _failed(self, error:Exception, values:List[Value]):
+        self.failed += len(values)
+        if self.on_error is None: return self.errors.append((error, values))
+        try: self.on_error(error, values)
+        except Exception as e: self.errors.append((e, values))
\ No newline at end of file
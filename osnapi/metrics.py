@@ -0,0 +1,198 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 09_metrics.ipynb (unless otherwise specified).
+
+__all__ = ['Metrics', 'TracingHook']
+
+# Cell
+import bisect
+import threading
+from .core import Settings
+
+# Internal Cell
+from typing import List, Tuple, Dict, Union, Optional, Callable, Iterable
+
+# Cell
+#######################################
+#               HELPERS               #
+#######################################
+
+# Internal Cell
+class Histogram():
+    """ Counts observations in buckets with the given upper bounds, like a Prometheus histogram.
+        An observation is counted in the first bucket whose bound is not smaller than it, or in the +Inf bucket.
+    """
+    def __init__(self, buckets:Iterable[float]):
+        self.bounds = sorted(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum, self.count = 0.0, 0
+
+    def observe(self, value:float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def quantile(self, q:float) -> Optional[float]:
+        """ Estimate the q-quantile (0 <= q <= 1), interpolating linearly within the bucket it falls into.
+            Values in the +Inf bucket are reported as the largest bound.
+        """
+        if not self.count: return None
+        rank, seen = q * self.count, 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= rank:
+                if i == len(self.bounds): return self.bounds[-1] if self.bounds else None
+                lower = self.bounds[i - 1] if i else 0.0
+                return lower + (self.bounds[i] - lower) * (rank - seen) / n
+            seen += n
+        return self.bounds[-1] if self.bounds else None
+
+# Internal Cell
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(**labels) -> str:
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + '}'
+
+def _number(value:float) -> str:
+    return '+Inf' if value == float('inf') else repr(float(value)) if isinstance(value, float) else str(value)
+
+# Cell
+#######################################
+#               METRICS               #
+#######################################
+
+# Cell
+class Metrics():
+    """ Collects latency histograms and counters for all requests, per method and endpoint template,
+        using the after_request hook of the Settings. Call install() to start collecting.
+
+        Input:
+            - buckets: The upper bounds of the latency histograms, in seconds.
+            - phases: Whether to also keep a histogram for each phase of a request (connect, ttfb, download, decode).
+        Example:
+            metrics = Metrics().install()
+            getSensors(measurandId=1)
+            metrics.summary()     # {('GET', '/sensors'): {'count': 1, 'p50': 0.04, ...}}
+            print(metrics.prometheus())
+    """
+    default_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+    phases = ('connect', 'ttfb', 'download', 'decode')
+    totals_names = ('request_bytes', 'response_bytes', 'retries', 'token_refreshes', 'errors')
+
+    def __init__(self, buckets:Iterable[float]=default_buckets, phases:bool=True):
+        self.buckets, self.track_phases = tuple(buckets), phases
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget everything collected so far"""
+        with self.lock:
+            self.latency = {}  # (method, endpoint) -> Histogram of the duration
+            self.phase   = {}  # (method, endpoint, phase) -> Histogram
+            self.counts  = {}  # (method, endpoint, status, source) -> number of requests
+            self.totals  = {}  # (method, endpoint) -> {name: total for name in totals_names}
+
+    def install(self) -> 'Metrics':
+        """Start collecting, by adding self to Settings.after_request. Returns self."""
+        if self not in Settings.after_request: Settings.after_request.append(self)
+        return self
+
+    def uninstall(self):
+        """Stop collecting"""
+        if self in Settings.after_request: Settings.after_request.remove(self)
+
+    def __call__(self, info:Dict):
+        key = (info['method'], info['endpoint'])
+        status = info['status'] if info['status'] is not None else 'none'
+        with self.lock:
+            if key not in self.latency:
+                self.latency[key] = Histogram(self.buckets)
+                self.totals[key] = dict.fromkeys(self.totals_names, 0)
+            self.latency[key].observe(info['duration'])
+            if self.track_phases and info['source'] == 'network':
+                for phase in self.phases:
+                    if (*key, phase) not in self.phase: self.phase[(*key, phase)] = Histogram(self.buckets)
+                    self.phase[(*key, phase)].observe(info[phase])
+            count = (*key, status, info['source'])
+            self.counts[count] = self.counts.get(count, 0) + 1
+            totals = self.totals[key]
+            for name in self.totals_names[:-1]: totals[name] += info[name]
+            totals['errors'] += info['error'] is not None
+
+    def summary(self, quantiles:Iterable[float]=(0.5, 0.9, 0.99)) -> Dict[Tuple[str, str], Dict]:
+        """Return the number of requests, the mean and quantiles of their latency, and the totals, per endpoint"""
+        with self.lock:
+            return {key: {'count': h.count, 'mean': h.sum / h.count if h.count else None,
+                          **{f'p{round(q * 100)}': h.quantile(q) for q in quantiles}, **self.totals[key]}
+                    for key, h in self.latency.items()}
+
+    def prometheus(self, prefix:str='osnapi') -> str:
+        """Return everything collected in the Prometheus text exposition format"""
+        lines = []
+        def histogram(name, doc, histograms):
+            lines.extend([f'# HELP {prefix}_{name} {doc}', f'# TYPE {prefix}_{name} histogram'])
+            for labels, h in histograms:
+                cumulative = 0
+                for bound, n in zip(list(h.bounds) + [float('inf')], h.counts):
+                    cumulative += n
+                    lines.append(f'{prefix}_{name}_bucket{_labels(**labels, le=_number(bound))} {cumulative}')
+                lines.append(f'{prefix}_{name}_sum{_labels(**labels)} {_number(h.sum)}')
+                lines.append(f'{prefix}_{name}_count{_labels(**labels)} {h.count}')
+        def counter(name, doc, values):
+            lines.extend([f'# HELP {prefix}_{name} {doc}', f'# TYPE {prefix}_{name} counter'])
+            for labels, value in values: lines.append(f'{prefix}_{name}{_labels(**labels)} {value}')
+
+        with self.lock:
+            histogram('request_duration_seconds', 'Time from calling a send function until it returned.',
+                      [({'method': m, 'endpoint': e}, h) for (m, e), h in self.latency.items()])
+            if self.phase:
+                histogram('request_phase_seconds', 'Time spent in each phase of the requests sent over the network.',
+                          [({'method': m, 'endpoint': e, 'phase': p}, h) for (m, e, p), h in self.phase.items()])
+            counter('requests_total', 'Requests by final status code, and where the response came from.',
+                    [({'method': m, 'endpoint': e, 'status': s, 'source': src}, n)
+                     for (m, e, s, src), n in self.counts.items()])
+            for name, doc in (('request_bytes', 'Bytes sent in request bodies.'),
+                              ('response_bytes', 'Bytes received in response bodies, before decompression.'),
+                              ('retries', 'Requests sent again by the retry policy.'),
+                              ('token_refreshes', 'Logins done to refresh the token for a request.'),
+                              ('errors', 'Requests that raised an Exception.')):
+                counter(f'{name}_total', doc,
+                        [({'method': m, 'endpoint': e}, t[name]) for (m, e), t in self.totals.items()])
+        return '\n'.join(lines) + '\n'
+
+# Cell
+class TracingHook():
+    """ Turns every request into a span of an OpenTelemetry style tracer, using the before / after_request hooks.
+        Works with anything that has tracer.start_span(name, attributes=...) returning a span with
+        set_attribute(key, value), end(), and optionally record_exception(e), so the opentelemetry
+        package itself is not needed, e.g.:
+            from opentelemetry import trace
+            TracingHook(trace.get_tracer('osnapi')).install()
+        Note: The span is started when the request starts, but isn't made the current span.
+    """
+    def __init__(self, tracer):
+        self.tracer = tracer
+
+    def install(self) -> 'TracingHook':
+        """Start tracing, by adding the hooks to the Settings. Returns self."""
+        if self.before not in Settings.before_request: Settings.before_request.append(self.before)
+        if self.after  not in Settings.after_request:  Settings.after_request.append(self.after)
+        return self
+
+    def uninstall(self):
+        """Stop tracing"""
+        if self.before in Settings.before_request: Settings.before_request.remove(self.before)
+        if self.after  in Settings.after_request:  Settings.after_request.remove(self.after)
+
+    def before(self, info:Dict):
+        info['span'] = self.tracer.start_span(f'{info["method"]} {info["endpoint"]}',
+                                              attributes={'http.method': info['method'], 'http.url': info['url'],
+                                                          'http.route': info['endpoint']})
+
+    def after(self, info:Dict):
+        span = info.pop('span', None)
+        if span is None: return
+        if info['status'] is not None: span.set_attribute('http.status_code', info['status'])
+        for key in ('connect', 'ttfb', 'download', 'decode', 'request_bytes', 'response_bytes',
+                    'retries', 'token_refreshes', 'source'):
+            span.set_attribute(f'osnapi.{key}', info[key])
+        if info['error'] is not None and hasattr(span, 'record_exception'): span.record_exception(info['error'])
+        span.end()
\ No newline at end of file
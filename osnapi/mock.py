@@ -0,0 +1,499 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 10_mock.ipynb (unless otherwise specified).
+
+__all__ = ['MockServer']
+
+# Cell
+import re
+import gzip
+import json
+import math
+import zlib
+import time
+import base64
+import random
+import threading
+from collections import Counter
+from urllib.parse import urlsplit, parse_qsl
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from .core import JSONCodec, _zstd
+from .geo import distance, to_points, in_polygon
+
+# Internal Cell
+from typing import List, Tuple, Dict, Union, Optional, Callable, Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+from .core import Sensor, Value, parse_timestamp
+
+# Cell
+#######################################
+#               HELPERS               #
+#######################################
+
+# Internal Cell
+def _ms(timestamp:Union[str, datetime]) -> int:
+    """Milliseconds since the epoch of a timestamp as used by the api"""
+    return round(parse_timestamp(timestamp).timestamp() * 1000)
+
+def _timestamp(ms:int) -> str:
+    """The inverse of _ms(), e.g. '2019-11-23T01:23:45.678Z'"""
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(ms // 1000)) + f'.{ms % 1000:03d}Z'
+
+def _argument(value:str):
+    """Turn a query argument, as build_query() writes it, back into a python value"""
+    if value in ('True', 'False'): return value == 'True'
+    try: return json.loads(value)
+    except ValueError: return value
+
+def _b64(data:Dict) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip('=')
+
+def _brotli():
+    try: import brotli
+    except ImportError: return None
+    return brotli
+
+def _decompress(data:bytes, encoding:Optional[str]) -> bytes:
+    """Undo the Content-Encoding of a request body. Unknown encodings are answered with 415."""
+    encoding = (encoding or 'identity').strip().lower()
+    if encoding == 'identity': return data
+    if encoding == 'gzip':     return gzip.decompress(data)
+    if encoding == 'deflate':  return zlib.decompress(data)
+    module = _zstd() if encoding == 'zstd' else _brotli() if encoding == 'br' else None
+    if module is None: raise MockError(415, f'Unsupported Content-Encoding: {encoding}')
+    return module.decompress(data)
+
+def _compress(data:bytes, accept:Optional[str]) -> Tuple[bytes, Optional[str]]:
+    """ Compress a response body with the best encoding the client accepts and that is installed,
+        preferring zstd, then br, then gzip. Returns the body and its Content-Encoding, None if it's not compressed.
+    """
+    accepted = {e.split(';')[0].strip().lower() for e in (accept or '').split(',')}
+    for encoding, module in (('zstd', _zstd()), ('br', _brotli()), ('gzip', gzip)):
+        if encoding in accepted and module is not None: return module.compress(data), encoding
+    return data, None
+
+# Internal Cell
+_measurands = [{'id': 1, 'name': 'temperature',   'defaultUnitId': 1},
+               {'id': 2, 'name': 'noise',         'defaultUnitId': 3},
+               {'id': 3, 'name': 'humidity',      'defaultUnitId': 4},
+               {'id': 4, 'name': 'pressure',      'defaultUnitId': 5},
+               {'id': 5, 'name': 'wind speed',    'defaultUnitId': 6}]
+
+_units = [{'id': 1, 'name': 'celsius',    'measurandId': 1},
+          {'id': 2, 'name': 'fahrenheit', 'measurandId': 1},
+          {'id': 3, 'name': 'decibel',    'measurandId': 2},
+          {'id': 4, 'name': 'percent',    'measurandId': 3},
+          {'id': 5, 'name': 'hectopascal','measurandId': 4},
+          {'id': 6, 'name': 'm/s',        'measurandId': 5}]
+
+def _license(id, shortName, fullName, link, derivatives, attribution, share_alike):
+    return {'id': id, 'shortName': shortName, 'fullName': fullName, 'version': 1, 'referenceLink': link,
+            'description': '...', 'allowsRedistribution': True, 'allowsDerivatives': derivatives,
+            'requiresAttribution': attribution, 'requiresShareAlike': share_alike,
+            'requiresKeepOpen': False, 'requiresChangeNote': False}
+
+_licenses = [_license(1, 'ODC-PDDL-1.0', 'Open Data Commons Public Domain Dedication and License',
+                      'https://opendatacommons.org/licenses/pddl/1.0/', True, False, False),
+             _license(2, 'ODC-BY-1.0', 'Open Data Commons Attribution License',
+                      'https://opendatacommons.org/licenses/by/1.0/', True, True, False),
+             _license(3, 'ODbL-1.0', 'Open Data Commons Open Database License',
+                      'https://opendatacommons.org/licenses/odbl/1.0/', True, True, True),
+             _license(4, 'DL-DE-BY-2.0', 'Data licence Germany - attribution - version 2.0',
+                      'https://www.govdata.de/dl-de/by-2-0', True, True, False)]
+
+# Internal Cell
+class MockError(Exception):
+    """Makes the MockServer answer with status and message"""
+    def __init__(self, status:int, message:str):
+        super().__init__(message)
+        self.status, self.message = status, message
+
+# Cell
+#######################################
+#               SERVER                #
+#######################################
+
+# Internal Cell
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # keep-alive, like the real Server
+    disable_nagle_algorithm = True # headers and body are written separately
+    def log_message(self, *args): pass
+    def do_GET(self):    self.server.mock.handle(self)
+    def do_POST(self):   self.server.mock.handle(self)
+    def do_DELETE(self): self.server.mock.handle(self)
+
+class _HTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024 # the default of 5 refuses connections when many clients connect at once
+
+# Cell
+class MockServer():
+    """ A local stand-in for the opensense.network api, for tests and benchmarks without the real Server.
+        It answers all endpoints used by osnapi from synthetic data in memory, over plain HTTP on localhost.
+
+        The Sensors are spread over Germany, and each has values_per_sensor values, one every interval,
+        starting at start. The values are computed on request, so large data sets cost no memory.
+        Values that are added through the api are kept, and returned together with the generated ones.
+
+        Input:
+            - sensors: How many Sensors there are. Their ids are 1 to sensors.
+            - values_per_sensor / interval / start: The generated values of each Sensor.
+            - latency: Seconds to wait before answering a request, plus up to jitter seconds more.
+            - bandwidth: How many bytes per second a response body is sent with. None means as fast as possible.
+            - errors: Maps a status code (e.g. 408, 500, 401) to the probability of answering a request with it.
+            - token_ttl: How many seconds a login token is valid. Requests with an expired token get a 401.
+            - max_values: Requests for more values than this are answered with 408, like the real Server does.
+            - max_body: POST bodies larger than this many bytes are answered with 408.
+            - compress_responses: Compress response bodies of at least 1 KB, if the client accepts it.
+            - users: Maps usernames to passwords. Every tenth Sensor belongs to the first user.
+            - seed: Makes the Sensors, values and injected errors the same on every run.
+            - host / port: Where to listen. Port 0 picks a free one.
+        Note: aggregationType and aggregationRange are applied with osnapi.aggregate, which needs numpy.
+        Note: GET responses have an ETag, and a request with that ETag in If-None-Match is answered with 304.
+        Note: stats counts the requests per endpoint and status, the bytes sent and received, logins and added values.
+              bytes_in and bytes_out are the bytes on the wire, the _uncompressed ones what they decode to.
+        Example:
+            with MockServer(sensors=1000, latency=0.02, errors={408: 0.01}) as server:
+                Settings.api_endpoint = server.url
+                getValuesForSensor(14, minTimestamp='2019-11-01')
+                server.fail(500, count=2)  # the next two requests fail
+                server.stats
+    """
+    routes = [('GET',    r'/sensors',                                  'get_sensors'),
+              ('GET',    r'/sensors/mysensors',                        'my_sensors'),
+              ('GET',    r'/sensors/mysensorids',                      'my_sensor_ids'),
+              ('GET',    r'/sensors/(\d+)',                            'get_sensor'),
+              ('DELETE', r'/sensors/(\d+)',                            'delete_sensor'),
+              ('GET',    r'/sensors/(\d+)/values',                     'values_for_sensor'),
+              ('GET',    r'/sensors/(\d+)/values/(first|last|firstlast)', 'first_last'),
+              ('GET',    r'/values',                                   'get_values'),
+              ('POST',   r'/sensors/addSensor',                        'add_sensor'),
+              ('POST',   r'/sensors/addValue',                         'add_value'),
+              ('POST',   r'/sensors/addMultipleValues',                'add_multiple_values'),
+              ('POST',   r'/users/login',                              'login'),
+              ('GET',    r'/users/profile',                            'profile'),
+              ('GET',    r'/(measurands|units|licenses)',              'reference_list'),
+              ('GET',    r'/(measurands|units|licenses)/(\d+)',        'reference')]
+
+    def __init__(self,
+                 sensors:int=1000,
+                 values_per_sensor:int=1000,
+                 interval:timedelta=timedelta(minutes=10),
+                 start:Union[str, datetime]='2019-11-01T00:00:00.000Z',
+                 latency:float=0.0,
+                 jitter:float=0.0,
+                 bandwidth:float=None,
+                 errors:Dict[int, float]=None,
+                 token_ttl:float=60 * 60,
+                 max_values:int=500_000,
+                 max_body:int=10_000_000,
+                 compress_responses:bool=True,
+                 users:Dict[str, str]=None,
+                 seed:int=0,
+                 host:str='127.0.0.1',
+                 port:int=0):
+        self.values_per_sensor, self.interval = values_per_sensor, round(interval.total_seconds() * 1000)
+        self.start_ms = _ms(start)
+        # the same for every Sensor, so they are only computed once
+        self.timestamps = [_timestamp(self.start_ms + k * self.interval) for k in range(values_per_sensor)]
+        self.cycle = [10 + 8 * math.sin(2 * math.pi * k * self.interval / 86_400_000) for k in range(values_per_sensor)]
+        self.latency, self.jitter, self.bandwidth = latency, jitter, bandwidth
+        self.errors, self.token_ttl = dict(errors or {}), token_ttl
+        self.max_values, self.max_body, self.compress_responses = max_values, max_body, compress_responses
+        self.users = dict(users or {'user': 'password'})
+        self.user_ids = {name: i + 1 for i, name in enumerate(self.users)}
+        self.seed, self.random = seed, random.Random(seed)
+        self.codec = JSONCodec()
+        self.lock = threading.Lock()
+        self.tokens, self.forced, self.added = {}, [], {} # token -> (username, exp); [status]; id -> {ms: value}
+        self.sensors = {id: self._sensor(id) for id in range(1, sensors + 1)}
+        self.next_id = sensors + 1
+        self.reset_stats()
+        self.compiled = [(method, re.compile(pattern + '$'), getattr(self, name))
+                         for method, pattern, name in self.routes]
+        self.httpd, self.thread = _HTTPServer((host, port), _Handler), None
+        self.httpd.mock = self
+
+    def _sensor(self, id:int) -> Sensor:
+        rng = random.Random(self.seed * 1_000_003 + id)
+        measurand = _measurands[(id - 1) % len(_measurands)]
+        return {'id': id, 'userId': 1 if id % 10 == 0 else 0, 'measurandId': measurand['id'],
+                'unitId': measurand['defaultUnitId'],
+                'location': {'lat': round(rng.uniform(47.3, 55.0), 4), 'lng': round(rng.uniform(5.9, 15.0), 4)},
+                'altitudeAboveGround': round(rng.uniform(0, 20), 1), 'directionVertical': 0,
+                'directionHorizontal': 0, 'sensorModel': 'mock station', 'accuracy': rng.randint(1, 10),
+                'attributionText': 'osnapi MockServer', 'attributionURL': 'http://localhost/',
+                'licenseId': rng.randint(1, len(_licenses))}
+
+    def value(self, id:int, k:int) -> float:
+        """The k-th generated value of Sensor id: a daily cycle plus some noise"""
+        noise = ((id * 2654435761 + k * 40503 + self.seed) % 1000) / 250 - 2
+        return round(self.cycle[k] + id % 7 + noise, 2)
+
+    # --- running ---
+
+    @property
+    def url(self) -> str:
+        """The address to use as Settings.api_endpoint"""
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self) -> 'MockServer':
+        """Start answering requests on a background thread. Returns self."""
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.httpd.serve_forever, name='osnapi-mock', daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        """Stop answering requests and close the socket"""
+        if self.thread is not None:
+            self.httpd.shutdown()
+            self.thread.join()
+            self.thread = None
+        self.httpd.server_close()
+
+    def __enter__(self): return self.start()
+    def __exit__(self, *args): self.stop()
+
+    def reset_stats(self):
+        """Set all counters in stats back to zero"""
+        with self.lock:
+            self.stats = {'requests': Counter(), 'status': Counter(), 'bytes_in': 0, 'bytes_out': 0,
+                          'bytes_in_uncompressed': 0, 'bytes_out_uncompressed': 0, 'logins': 0, 'values_added': 0}
+
+    def fail(self, status:int, count:int=1):
+        """Answer the next count requests with status, e.g. fail(408) or fail(500, count=3)"""
+        with self.lock: self.forced.extend([status] * count)
+
+    def expire_tokens(self):
+        """Make all tokens handed out so far invalid, as if they had run out"""
+        with self.lock: self.tokens = {token: (user, 0) for token, (user, _) in self.tokens.items()}
+
+    # --- handling ---
+
+    def handle(self, request:BaseHTTPRequestHandler):
+        """Answer one request"""
+        length = int(request.headers.get('Content-Length') or 0)
+        raw = request.rfile.read(length) if length else b''
+        parts = urlsplit(request.path)
+        path = parts.path.rstrip('/') or '/'
+        args = {k: _argument(v) for k, v in parse_qsl(parts.query)}
+        endpoint, received = path, len(raw)
+        try:
+            for method, pattern, func in self.compiled:
+                match = pattern.match(path)
+                if match and method == request.command:
+                    endpoint = re.sub(r'\d+', '{id}', path)
+                    break
+            else: raise MockError(404, f'No such endpoint: {request.command} {path}')
+            self._inject()
+            if len(raw) > self.max_body: raise MockError(408, 'Request Timeout')
+            raw = _decompress(raw, request.headers.get('Content-Encoding'))
+            received = len(raw)
+            if received > self.max_body: raise MockError(408, 'Request Timeout')
+            body = self.codec.decode(raw) if raw else None
+            status, result = 200, func(*match.groups(), args=args, body=body, user=self._user(request))
+        except MockError as e: status, result = e.status, e.message
+        except Exception as e: status, result = 400, f'Bad Request: {e!r}'
+        data, etag = self.codec.encode(result), None
+        if status == 200 and request.command == 'GET':
+            etag = f'"{zlib.crc32(data):08x}"'
+            if request.headers.get('If-None-Match') == etag: status, data = 304, b''
+        plain, encoding = len(data), None
+        if self.compress_responses and plain >= 1024:
+            data, encoding = _compress(data, request.headers.get('Accept-Encoding'))
+        with self.lock:
+            self.stats['requests'][f'{request.command} {endpoint}'] += 1
+            self.stats['status'][status] += 1
+            self.stats['bytes_in'] += length
+            self.stats['bytes_out'] += len(data)
+            self.stats['bytes_in_uncompressed'] += received
+            self.stats['bytes_out_uncompressed'] += plain
+        if self.latency or self.jitter: time.sleep(self.latency + self.jitter * random.random())
+        request.send_response(status)
+        request.send_header('Content-Type', 'application/json' if status == 200 else 'text/plain')
+        if encoding: request.send_header('Content-Encoding', encoding)
+        if etag: request.send_header('ETag', etag)
+        request.send_header('Content-Length', str(len(data)))
+        request.end_headers()
+        if not self.bandwidth: return request.wfile.write(data)
+        step = 64 * 1024
+        for i in range(0, len(data), step):
+            request.wfile.write(data[i:i + step])
+            time.sleep(min(step, len(data) - i) / self.bandwidth)
+
+    def _inject(self):
+        """Raise the next forced error, or a random one according to errors"""
+        with self.lock:
+            status = self.forced.pop(0) if self.forced else None
+            if status is None:
+                roll = self.random.random()
+                for code, probability in self.errors.items():
+                    if roll < probability: status = code; break
+                    roll -= probability
+        if status is not None: raise MockError(status, f'Injected error {status}')
+
+    def _user(self, request:BaseHTTPRequestHandler) -> Optional[str]:
+        """The user the token in the request belongs to. Raises a 401 for unknown or expired tokens."""
+        token = request.headers.get('Authorization')
+        if token is None: return None
+        with self.lock: user, exp = self.tokens.get(token, (None, 0))
+        if user is None or exp < time.time(): raise MockError(401, 'Unauthorized')
+        return user
+
+    def _require(self, user:Optional[str]) -> int:
+        if user is None: raise MockError(401, 'Unauthorized')
+        return self.user_ids[user]
+
+    def _find(self, id) -> Sensor:
+        sensor = self.sensors.get(int(id))
+        if sensor is None: raise MockError(404, f'Sensor with id {id} not found')
+        return sensor
+
+    # --- sensors ---
+
+    def filter_sensors(self, args:Dict) -> List[Sensor]:
+        """The Sensors matching the filters of getSensors() / getValues(), nearest first if there's a refPoint"""
+        licenses = {k: v for k, v in args.items() if k.startswith(('allows', 'requires')) and v}
+        allowed = {l['id'] for l in _licenses if all(l[k] == v for k, v in licenses.items())}
+        box = to_points(args['boundingBox']) if args.get('boundingBox') else None
+        polygon = to_points(args['boundingPolygon']) if args.get('boundingPolygon') else None
+        found = []
+        for s in list(self.sensors.values()):
+            lat, lng = s['location']['lat'], s['location']['lng']
+            if args.get('measurandId') and s['measurandId'] != args['measurandId']: continue
+            if args.get('minAccuracy') and s['accuracy'] < args['minAccuracy']: continue
+            if args.get('maxAccuracy') and s['accuracy'] > args['maxAccuracy']: continue
+            if s['licenseId'] not in allowed: continue
+            if box and not (min(box[0][0], box[1][0]) <= lat <= max(box[0][0], box[1][0])
+                            and min(box[0][1], box[1][1]) <= lng <= max(box[0][1], box[1][1])): continue
+            if polygon and not in_polygon(lat, lng, polygon): continue
+            found.append(s)
+        if args.get('refPoint'):
+            (lat, lng), = to_points(args['refPoint'])
+            near = sorted(((distance(lat, lng, s['location']['lat'], s['location']['lng']), s['id'], s)
+                           for s in found), key=lambda t: t[:2])
+            if args.get('maxDistance'): near = [t for t in near if t[0] <= args['maxDistance']]
+            if args.get('numNearest'): near = near[:args['numNearest']]
+            found = [s for _, _, s in near]
+        if args.get('maxSensors'): found = found[:args['maxSensors']]
+        return found
+
+    def get_sensors(self, args, body, user): return self.filter_sensors(args)
+    def get_sensor(self, id, args, body, user): return self._find(id)
+
+    def my_sensors(self, args, body, user):
+        uid = self._require(user)
+        return [s for s in list(self.sensors.values()) if s['userId'] == uid]
+
+    def my_sensor_ids(self, args, body, user): return [s['id'] for s in self.my_sensors(args, body, user)]
+
+    def add_sensor(self, args, body, user):
+        uid = self._require(user)
+        with self.lock:
+            sensor = {**body, 'id': self.next_id, 'userId': uid}
+            self.sensors[sensor['id']] = sensor
+            self.next_id += 1
+        return sensor
+
+    def delete_sensor(self, id, args, body, user):
+        uid = self._require(user)
+        if self._find(id)['userId'] != uid: raise MockError(403, 'Forbidden')
+        with self.lock:
+            self.sensors.pop(int(id), None)
+            self.added.pop(int(id), None)
+        return 'OK'
+
+    # --- values ---
+
+    def values(self, id:int, minTimestamp=None, maxTimestamp=None, minValue=None, maxValue=None) -> List[Value]:
+        """The values of Sensor id in the given range, both the generated and the added ones, oldest first"""
+        lo = _ms(minTimestamp) if minTimestamp else None
+        hi = _ms(maxTimestamp) if maxTimestamp else None
+        first = 0 if lo is None else max(0, -(-(lo - self.start_ms) // self.interval))
+        last = self.values_per_sensor - 1 if hi is None else min(self.values_per_sensor - 1,
+                                                                 (hi - self.start_ms) // self.interval)
+        with self.lock: added = dict(self.added.get(id, {}))
+        if not added: values = [(self.timestamps[k], self.value(id, k)) for k in range(first, last + 1)]
+        else:
+            merged = {self.start_ms + k * self.interval: self.value(id, k) for k in range(first, last + 1)}
+            merged.update((ms, v) for ms, v in added.items()
+                          if (lo is None or ms >= lo) and (hi is None or ms <= hi))
+            values = [(_timestamp(ms), v) for ms, v in sorted(merged.items())]
+        return [{'timestamp': t, 'numberValue': v} for t, v in values
+                if (minValue is None or v >= minValue) and (maxValue is None or v <= maxValue)]
+
+    def _range(self, args:Dict) -> Dict:
+        return {k: args.get(k) for k in ('minTimestamp', 'maxTimestamp', 'minValue', 'maxValue')}
+
+    def _aggregate(self, values:List[Value], args:Dict) -> List[Value]:
+        """Aggregate values if the request asks for it with both aggregationType and aggregationRange"""
+        if not (values and args.get('aggregationType') and args.get('aggregationRange')): return values
+        from .aggregate import aggregate
+        return aggregate(values, args['aggregationRange'], args['aggregationType'])
+
+    def _limit(self, count:int):
+        if count > self.max_values: raise MockError(408, 'Request Timeout')
+
+    def values_for_sensor(self, id, args, body, user):
+        sensor = self._find(id)
+        values = self._aggregate(self.values(sensor['id'], **self._range(args)), args)
+        self._limit(len(values))
+        return {**sensor, 'values': values}
+
+    def first_last(self, id, which, args, body, user):
+        sensor = self._find(id)
+        values = self.values(sensor['id'])
+        if not values: return {**sensor, 'values': []}
+        return {**sensor, 'values': {'first': values[:1], 'last': values[-1:],
+                                     'firstlast': values[:1] + values[-1:]}[which]}
+
+    def get_values(self, args, body, user):
+        result, count, limits = [], 0, self._range(args)
+        for sensor in self.filter_sensors(args):
+            values = self._aggregate(self.values(sensor['id'], **limits), args)
+            count += len(values)
+            self._limit(count)
+            if values: result.append({**sensor, 'values': values})
+        return result
+
+    def _add(self, values:List[Value], uid:int):
+        for v in values:
+            sensor = self._find(v['sensorId'])
+            if sensor['userId'] != uid: raise MockError(403, f'Sensor {sensor["id"]} belongs to someone else')
+        with self.lock:
+            for v in values: self.added.setdefault(v['sensorId'], {})[_ms(v['timestamp'])] = v['numberValue']
+            self.stats['values_added'] += len(values)
+        return 'OK'
+
+    def add_value(self, args, body, user): return self._add([body], self._require(user))
+
+    def add_multiple_values(self, args, body, user):
+        values = body['collapsedMessages']
+        self._limit(len(values))
+        return self._add(values, self._require(user))
+
+    # --- users ---
+
+    def login(self, args, body, user):
+        if self.users.get(body.get('username')) != body.get('password'): raise MockError(401, 'Unauthorized')
+        exp = time.time() + self.token_ttl
+        with self.lock:
+            token = f'{_b64({"alg": "none"})}.{_b64({"sub": body["username"], "exp": exp})}.{len(self.tokens)}'
+            self.tokens[token] = (body['username'], exp)
+            self.stats['logins'] += 1
+        return {'id': token}
+
+    def profile(self, args, body, user):
+        return [{'username': user, 'id': self._require(user)}]
+
+    # --- reference data ---
+
+    tables = {'measurands': _measurands, 'units': _units, 'licenses': _licenses}
+
+    def reference_list(self, kind, args, body, user):
+        return [r for r in self.tables[kind] if all(r.get(k) == v for k, v in args.items() if v)]
+
+    def reference(self, kind, id, args, body, user):
+        for r in self.tables[kind]:
+            if r['id'] == int(id): return r
+        raise MockError(404, f'No {kind[:-1]} with id {id}')
\ No newline at end of file
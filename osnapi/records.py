@@ -0,0 +1,248 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 16_records.ipynb (unless otherwise specified).
+
+__all__ = ['Record', 'record_type', 'Values', 'to_records', 'to_dicts']
+
+# Cell
+import keyword
+from array import array
+from datetime import datetime, timedelta, timezone
+from .core import parse_timestamp
+
+# Internal Cell
+from typing import List, Tuple, Dict, Union, Optional, Callable, Iterable, Iterator
+from .core import Value
+
+# Cell
+#######################################
+#               RECORDS               #
+#######################################
+
+# Cell
+class Record():
+    """ The base class of the compact records that the api functions return if Settings.records is True.
+        A record keeps its attributes in slots instead of a dict, which takes about a third of the memory.
+        It is read like the dict it stands for, e.g. sensor['id'] or sensor.get('location'), or as sensor.id.
+        Existing attributes can be changed, but no new ones added. to_dict() turns it back into a dict.
+    """
+    __slots__ = ()
+    _fields = ()
+
+    def __getitem__(self, key:str):
+        if key not in self._fields: raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key:str, value):
+        if key not in self._fields: raise KeyError(f'{key!r} is not one of the fields {self._fields}, see to_dict()')
+        setattr(self, key, value)
+
+    def get(self, key:str, default=None): return getattr(self, key) if key in self._fields else default
+    def keys(self) -> Tuple[str, ...]: return self._fields
+    def items(self) -> Iterator[Tuple[str, object]]: return ((f, getattr(self, f)) for f in self._fields)
+    def __contains__(self, key:str) -> bool: return key in self._fields
+    def __iter__(self) -> Iterator[str]: return iter(self._fields)
+    def __len__(self) -> int: return len(self._fields)
+
+    def to_dict(self) -> Dict:
+        """The dict this record stands for, with the records and Values in it turned into dicts as well"""
+        return {f: to_dicts(getattr(self, f)) for f in self._fields}
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (Record, dict)): return NotImplemented
+        return len(self) == len(other) and all(f in other and getattr(self, f) == other[f] for f in self._fields)
+
+    __hash__ = None # mutable, like the dict
+
+    def __repr__(self) -> str: return f'Record({", ".join(f"{f}={getattr(self, f)!r}" for f in self._fields)})'
+    def __reduce__(self): return to_records, (self.to_dict(),) # the classes are made at runtime, so pickle the dict
+
+# Internal Cell
+_types = {} # fields -> the Record class made for them, or None if they can't be slots
+
+def _usable(fields:Tuple[str, ...]) -> bool:
+    """Whether fields can all be slots: valid attribute names that don't hide anything of Record"""
+    return all(isinstance(f, str) and f.isidentifier() and not keyword.iskeyword(f) and not f.startswith('_')
+               and not hasattr(Record, f) for f in fields)
+
+# Cell
+def record_type(fields:Tuple[str, ...]) -> Optional[type]:
+    """ The Record class with the given fields, made on first use, e.g. record_type(('id', 'name'))(1, 'temperature').
+        Every combination of fields gets one class, which all records with the same fields share.
+        Returns None if the fields can't be attributes, e.g. because they contain spaces.
+    """
+    if fields in _types: return _types[fields]
+    cls = None
+    if _usable(fields):
+        # like namedtuple, generate the __init__, because that's much faster than setting the fields in a loop
+        body = '; '.join(f'self.{f} = {f}' for f in fields) or 'pass'
+        namespace = {}
+        exec(f'def __init__(self, {", ".join(fields)}): {body}', namespace)
+        cls = type('Record', (Record,), {'__slots__': fields, '_fields': fields, '__init__': namespace['__init__'],
+                                         '__module__': __name__})
+    _types[fields] = cls
+    return cls
+
+# Cell
+#######################################
+#                VALUES               #
+#######################################
+
+# Internal Cell
+_epoch = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_days = {} # 'YYYY-MM-DD' -> milliseconds at the start of that day, as the values of a Sensor share a few days
+_nan = float('nan')
+
+def _ms(time:datetime) -> int: return round((time - _epoch).total_seconds() * 1000)
+
+def _parse_ms(timestamp:str) -> int:
+    """A timestamp like '2019-11-23T01:23:45.678Z' as milliseconds since 1970-01-01, fast for the format of the api"""
+    if len(timestamp) < 20 or timestamp[10] != 'T' or timestamp[-1] != 'Z': # some other format, the slow way
+        return _ms(parse_timestamp(timestamp))
+    day = _days.get(timestamp[:10])
+    if day is None: day = _days[timestamp[:10]] = _ms(parse_timestamp(timestamp[:10]))
+    return (day + int(timestamp[11:13]) * 3_600_000 + int(timestamp[14:16]) * 60_000
+            + round(float(timestamp[17:-1]) * 1000))
+
+def _format_ms(ms:int) -> str:
+    """The reverse of _parse_ms(), e.g. '2019-11-23T01:23:45.678Z'"""
+    return f'{_epoch + timedelta(milliseconds=ms):%Y-%m-%dT%H:%M:%S}.{ms % 1000:03d}Z'
+
+_width = len('2019-11-23T01:23:45.678Z') # of the timestamps in the format of the api
+
+def _parse_raw(raw:str) -> array:
+    """The timestamps joined in raw, as milliseconds since 1970-01-01, see Values"""
+    try: import numpy as np
+    except ImportError: np = None
+    if np is not None: # many times faster, but isn't needed to keep them
+        try:
+            chars = np.frombuffer(raw.encode('ascii'), dtype='S1').reshape(-1, _width)[:, :-1] # without the Z
+            return array('q', np.ascontiguousarray(chars).view(f'S{_width - 1}').ravel()
+                              .astype('datetime64[ms]').view('int64').tobytes())
+        except ValueError: pass # not quite the format of the api after all, so parse them one by one
+    return array('q', (_parse_ms(raw[i:i + _width]) for i in range(0, len(raw), _width)))
+
+_Value = record_type(('timestamp', 'numberValue'))
+
+# Cell
+class Values():
+    """ The values of a Sensor, kept in two arrays instead of a dict per value: the timestamps as milliseconds
+        since 1970-01-01 (UTC), and the numberValues as floats. That's 16 bytes per value, instead of hundreds.
+        It's a sequence of Records with a timestamp and a numberValue, like the usual List of Values,
+        but each one is only made when it's looked at.
+        Timestamps in the format of the api are kept as they came, in one string of 24 characters per value,
+        and only parsed into the array once it's needed, e.g. by to_columns(). Until then, a value costs 32 bytes.
+        Note: A numberValue of None is kept as nan, and comes back as None.
+        Example:
+            values = getValuesForSensor(14)['values']   # with Settings.records = True
+            values[0]                                   # Record(timestamp='2019-11-01T00:00:00.000Z', numberValue=3.5)
+            values.to_columns()                         # numpy arrays on the same memory, see osnapi.columnar
+    """
+    __slots__ = ('_timestamps', 'numbers', '_raw')
+
+    def __init__(self, timestamps:array=None, numbers:array=None, raw:str=None):
+        self._timestamps = array('q') if timestamps is None and raw is None else timestamps
+        self.numbers = array('d') if numbers is None else numbers
+        self._raw = raw # the timestamp strings, joined, while they're not parsed yet
+
+    @property
+    def timestamps(self) -> array:
+        """The timestamps as milliseconds since 1970-01-01, parsed on first use"""
+        if self._timestamps is None: self._timestamps, self._raw = _parse_raw(self._raw), None
+        return self._timestamps
+
+    @classmethod
+    def from_dicts(cls, values:Iterable[Value]) -> 'Values':
+        """Make Values from a List of Values (dicts or Records) with a timestamp and a numberValue each"""
+        values = values if isinstance(values, list) else list(values)
+        numbers = array('d', (_nan if v['numberValue'] is None else v['numberValue'] for v in values))
+        timestamps = [v['timestamp'] for v in values]
+        if all(isinstance(t, str) and len(t) == _width and t[10] == 'T' and t[-1] == 'Z' for t in timestamps):
+            return cls(None, numbers, ''.join(timestamps)) # parsed later, if at all
+        return cls(array('q', (_parse_ms(t) for t in timestamps)), numbers)
+
+    def __len__(self) -> int: return len(self.numbers)
+
+    def __getitem__(self, index:Union[int, slice]) -> Union[Record, 'Values']:
+        raw = self._raw
+        if isinstance(index, slice):
+            if raw is None: return Values(self._timestamps[index], self.numbers[index])
+            k = range(len(self))[index]
+            raw = (raw[k.start * _width:k.stop * _width] if k.step == 1 else
+                   ''.join(raw[i * _width:(i + 1) * _width] for i in k))
+            return Values(None, self.numbers[index], raw)
+        number, index = self.numbers[index], range(len(self))[index]
+        timestamp = _format_ms(self._timestamps[index]) if raw is None else raw[index * _width:(index + 1) * _width]
+        return _Value(timestamp, None if number != number else number)
+
+    def __iter__(self) -> Iterator[Record]:
+        if self._raw is None: timestamps = map(_format_ms, self._timestamps)
+        else: timestamps = (self._raw[i:i + _width] for i in range(0, len(self._raw), _width))
+        for timestamp, number in zip(timestamps, self.numbers):
+            yield _Value(timestamp, None if number != number else number)
+
+    def tolist(self) -> List[Value]:
+        """The values as the usual List of dicts"""
+        return [value.to_dict() for value in self]
+
+    def to_columns(self) -> Dict:
+        """ The values as numpy arrays, like osnapi.columnar.values_to_columns() makes them.
+            They share the memory of the arrays, so nothing is copied.
+        """
+        import numpy as np
+        return {'timestamp': np.frombuffer(self.timestamps, dtype=np.int64).view('datetime64[ms]'),
+                'numberValue': np.frombuffer(self.numbers, dtype=np.float64)}
+
+    @classmethod
+    def from_columns(cls, columns:Dict) -> 'Values':
+        """The reverse of to_columns(): Values from a timestamp and a numberValue array, see osnapi.columnar"""
+        import numpy as np
+        return cls(array('q', np.asarray(columns['timestamp'], dtype='datetime64[ms]').view('int64').tobytes()),
+                   array('d', np.asarray(columns['numberValue'], dtype=np.float64).tobytes()))
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Values):
+            # nan != nan, so compare the bytes, which also makes the Nones that became nan equal
+            return self.timestamps == other.timestamps and self.numbers.tobytes() == other.numbers.tobytes()
+        if isinstance(other, list): return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        if not len(self): return 'Values(0 values)'
+        return f'Values({len(self)} values, {self[0].timestamp} to {self[-1].timestamp})'
+
+    def __reduce__(self): return Values, (self._timestamps, self.numbers, self._raw)
+
+# Cell
+#######################################
+#             CONVERTING              #
+#######################################
+
+# Internal Cell
+def _are_values(values) -> bool:
+    """Whether values is a List of Values with a timestamp and a numberValue and nothing else, that fit in Values"""
+    return isinstance(values, list) and all(isinstance(v, (dict, Record)) and len(v) == 2 and 'timestamp' in v
+                                            and 'numberValue' in v for v in values)
+
+# Cell
+def to_records(data):
+    """ Turn what the api functions return into Records, like they do themselves if Settings.records is True.
+        Dicts become Records, and the values of a Sensor become Values. Lists, and anything else, are kept.
+        A dict whose keys can't be attributes stays a dict, but its contents are converted.
+        Example:
+            sensors = to_records(getValues(boundingBox=[52.3, 13.0, 52.7, 13.8]))
+            sensors[0].id, sensors[0]['values'][-1].numberValue
+    """
+    if isinstance(data, list): return [to_records(item) for item in data]
+    if not isinstance(data, dict): return data
+    converted = [Values.from_dicts(v) if k == 'values' and _are_values(v) else to_records(v) for k, v in data.items()]
+    cls = record_type(tuple(data))
+    return dict(zip(data, converted)) if cls is None else cls(*converted)
+
+def to_dicts(data):
+    """The reverse of to_records(): the same data as plain dicts and lists, like the api functions return by default"""
+    if isinstance(data, Record): return data.to_dict()
+    if isinstance(data, Values): return data.tolist()
+    if isinstance(data, list):   return [to_dicts(item) for item in data]
+    if isinstance(data, dict):   return {k: to_dicts(v) for k, v in data.items()}
+    return data
\ No newline at end of file
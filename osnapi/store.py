@@ -0,0 +1,110 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 07_store.ipynb (unless otherwise specified).
+
+__all__ = ['ValueStore']
+
+# Cell
+import os
+import sqlite3
+import threading
+from itertools import islice
+from .core import getFirstLastValueForSensor
+from .batch import map_ids
+from .stream import iterValuesForSensor
+
+# Internal Cell
+from typing import List, Tuple, Dict, Union, Optional, Callable, Iterable
+from datetime import datetime, timedelta
+from .core import Value, parse_timestamp, format_timestamp
+
+# Cell
+class ValueStore():
+    """ A local copy of the values of Sensors, kept in an sqlite file.
+        sync() only downloads the values that are newer than the newest one already stored for a Sensor,
+        so after the first download, keeping the copy up to date is cheap.
+        Queries are answered from the file, using an index on (sensorId, timestamp).
+
+        Input:
+            - path: The sqlite file to use. It's created if it doesn't exist yet.
+        Note: Timestamps are stored as the strings the api uses, e.g. '2019-11-23T01:23:45.678Z',
+              which sort the same way as the times they stand for.
+        Example:
+            store = ValueStore('values.sqlite')
+            store.sync([14, 61])  # the first time downloads everything, afterwards only what's new
+            store.query(14, minTimestamp='2019-11-01', maxTimestamp='2019-12-01')
+    """
+    def __init__(self, path:str):
+        self.path = os.path.expanduser(path)
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(self.path, check_same_thread=False)
+        with self.db:
+            self.db.execute('CREATE TABLE IF NOT EXISTS "values" (sensorId INTEGER, timestamp TEXT, numberValue REAL,'
+                            ' PRIMARY KEY (sensorId, timestamp)) WITHOUT ROWID')
+
+    def close(self):
+        with self.lock: self.db.close()
+
+    def __enter__(self): return self
+    def __exit__(self, *args): self.close()
+
+    def sensor_ids(self) -> List[int]:
+        """The ids of all Sensors that have values in the store"""
+        with self.lock: return [r[0] for r in self.db.execute('SELECT DISTINCT sensorId FROM "values"')]
+
+    def high_water_mark(self, id:int) -> Optional[str]:
+        """The timestamp of the newest stored value of Sensor id, or None if there is none"""
+        with self.lock:
+            return self.db.execute('SELECT MAX(timestamp) FROM "values" WHERE sensorId = ?', (id,)).fetchone()[0]
+
+    def add(self, id:int, values:Iterable[Value], batch_size:int=10_000) -> int:
+        """ Store values for Sensor id, skipping the ones already stored. Returns how many were new.
+            Each batch is committed on its own, so an interrupted add() keeps what it stored so far.
+        """
+        values, added = iter(values), 0
+        while True:
+            batch = [(id, v['timestamp'], v['numberValue']) for v in islice(values, batch_size)]
+            if not batch: return added
+            with self.lock, self.db:
+                before = self.db.total_changes
+                self.db.executemany('INSERT OR IGNORE INTO "values" VALUES (?, ?, ?)', batch)
+                added += self.db.total_changes - before
+
+    def sync_one(self, id:int, window:timedelta=timedelta(days=30)) -> int:
+        """ Download the values of Sensor id that are newer than the newest stored one.
+            Returns how many values were added.
+        """
+        newest = self.high_water_mark(id)
+        remote = getFirstLastValueForSensor(id, first=newest is None, last=True).get('values', [])
+        if not remote: return 0
+        last = remote[-1]['timestamp']
+        if newest is None: start = remote[0]['timestamp']
+        elif parse_timestamp(last) <= parse_timestamp(newest): return 0
+        else: start = format_timestamp(parse_timestamp(newest) + timedelta(milliseconds=1))
+        return self.add(id, iterValuesForSensor(id, start, last, window=window))
+
+    def sync(self, ids:List[int], window:timedelta=timedelta(days=30),
+             max_workers:int=None) -> Tuple[List[Optional[int]], Dict[int, Exception]]:
+        """ HTTP: GET
+            Bring the stored values of all Sensors in ids up to date, see sync_one().
+            The Sensors are synced in parallel, using up to max_workers threads.
+
+            Output:
+                - A List of how many values were added for each id, in the same order as ids.
+                  Failed ids have None in their place.
+                - A Dict mapping each failed id to the Exception that was raised for it.
+        """
+        return map_ids(self.sync_one, ids, max_workers, window=window)
+
+    def query(self, id:int, minTimestamp:Union[str, datetime]=None, maxTimestamp:Union[str, datetime]=None,
+              columnar:bool=False) -> Union[List[Value], Dict]:
+        """ Return the stored values of Sensor id from minTimestamp to maxTimestamp (both inclusive), oldest first.
+            Like getValuesForSensor(), but only looks at the local copy.
+            If columnar is True, the values are returned as numpy arrays, see osnapi.columnar.
+        """
+        sql, args = 'SELECT timestamp, numberValue FROM "values" WHERE sensorId = ?', [id]
+        if minTimestamp is not None: sql += ' AND timestamp >= ?'; args.append(format_timestamp(minTimestamp))
+        if maxTimestamp is not None: sql += ' AND timestamp <= ?'; args.append(format_timestamp(maxTimestamp))
+        with self.lock: rows = self.db.execute(sql + ' ORDER BY timestamp', args).fetchall()
+        values = [{'timestamp': t, 'numberValue': v} for t, v in rows]
+        if not columnar: return values
+        from .columnar import values_to_columns
+        return values_to_columns(values)
\ No newline at end of file
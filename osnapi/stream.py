@@ -0,0 +1,288 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 04_stream.ipynb (unless otherwise specified).
+
+__all__ = ['streamSensors', 'streamMySensors', 'iterValuesForSensor', 'iterValues', 'streamValues']
+
+# Cell
+import json
+import time
+import codecs
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor
+from .core import Settings, build_query, getValues, getValuesForSensor, getFirstLastValueForSensor
+from .core import send_request, check_status, decode_body, observe, _observing, _records
+
+# Internal Cell
+from typing import List, Tuple, Dict, Union, Optional, Callable, Iterable, Iterator
+from datetime import datetime, timedelta, timezone
+from .core import Sensor, SensorWithValue, Value, parse_timestamp, format_timestamp
+
+# Cell
+#######################################
+#               HELPERS               #
+#######################################
+
+# Internal Cell
+def time_windows(minTimestamp:Union[str, datetime],
+                 maxTimestamp:Union[str, datetime],
+                 window:timedelta) -> Iterator[Tuple[str, str]]:
+    """ Split the time from minTimestamp to maxTimestamp (both inclusive) into consecutive windows,
+        each at most window long, and yield them as (minTimestamp, maxTimestamp) pairs.
+        Windows don't overlap, the next one starts one millisecond after the last one ended.
+    """
+    assert window >= timedelta(milliseconds=1), 'window has to be at least one millisecond long'
+    start, end, ms = parse_timestamp(minTimestamp), parse_timestamp(maxTimestamp), timedelta(milliseconds=1)
+    while start <= end:
+        stop = min(start + window - ms, end)
+        yield format_timestamp(start), format_timestamp(stop)
+        start = stop + ms
+
+# Internal Cell
+def prefetch(func:Callable, kwargs:Iterable[Dict]) -> Iterator:
+    """ Yield func(**kw) for every kw in kwargs, in order.
+        While the caller works on one result, the next one is already being requested in the background.
+    """
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = None
+        for kw in kwargs:
+            following = pool.submit(func, **kw)
+            if future is not None: yield future.result()
+            future = following
+        if future is not None: yield future.result()
+
+# Internal Cell
+_whitespace = ' \t\n\r'
+
+def iter_json_array(chunks:Iterable[bytes]) -> Iterator:
+    """ Incrementally decode a json array that arrives in chunks of bytes, yielding one item at a time,
+        as soon as it is complete. Only the unfinished item is kept in memory.
+        If the document is not an array, it is decoded as a whole and yielded as a single item.
+    """
+    decoder, text = json.JSONDecoder(), codecs.getincrementaldecoder('utf-8')()
+    buf, pos, started, retry_at = '', 0, None, 0
+    for chunk in chain(chunks, [None]):
+        final = chunk is None
+        buf = buf[pos:] + text.decode(b'' if final else chunk, final=final)
+        pos, retry_at = 0, max(0, retry_at - pos)
+        while True:
+            while pos < len(buf) and buf[pos] in _whitespace: pos += 1
+            if pos == len(buf): break
+            if started is None:
+                started = buf[pos] == '['
+                if started: pos += 1
+                continue
+            if not started: # not an array, decode it as a whole at the end
+                if final: yield json.loads(buf)
+                break
+            if buf[pos] == ',': pos += 1; continue
+            if buf[pos] == ']': return
+            # re-parsing an unfinished item is expensive, so wait until the buffer has grown a good bit
+            if not final and len(buf) < retry_at: break
+            try: item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if final: raise
+                end = len(buf)
+            if buf[pos] not in '{["': # a number might go on in the next chunk, e.g. '-25.' + '5', so wait for a , or ]
+                after = end
+                while after < len(buf) and buf[after] in _whitespace: after += 1
+                if after < len(buf) and buf[after] not in ',]':
+                    if final: raise json.JSONDecodeError('Expecting \',\' delimiter', buf, after)
+                    end = len(buf)
+            if end == len(buf) and not final: # the item isn't complete yet
+                retry_at = pos + 2 * (len(buf) - pos)
+                break
+            retry_at = 0
+            yield item
+            pos = end
+
+# Internal Cell
+def stream_get(query:str, requires_auth:bool=False, chunk_size:int=64 * 1024) -> Iterator:
+    """ Sends an HTTP GET request using query as URL, and yields the items of the json array
+        in the response body while it's still being downloaded, as Records if Settings.records is True.
+        Errors are handled like in send_get(), including the retries and the login.
+        The request is observed like the others, see osnapi.core.observe(), with the time spent waiting for chunks
+        as download. Its duration ends with the last item, so it includes the time the caller took meanwhile.
+    """
+    # not local, since other requests can run on this thread between two items
+    with observe('GET', query, local=False) as info:
+        with _observing(info): response = send_request('GET', query, requires_auth, stream=True)
+        with response:
+            if response.status_code != 200:
+                check_status(query, response.status_code, decode_body(response.content))
+            received, chunks = response.received(), _timed(response.iter_content(chunk_size), info)
+            yield from map(_records, iter_json_array(chunks))
+            for _ in chunks: pass # the end of the body, so that the connection can be kept alive
+            info['response_bytes'] += response.received() - received
+
+def _timed(chunks:Iterable[bytes], info:Dict) -> Iterator[bytes]:
+    """Yield the chunks, adding the time it takes to get each one to info['download']"""
+    chunks = iter(chunks)
+    while True:
+        start = time.perf_counter()
+        chunk = next(chunks, None)
+        info['download'] += time.perf_counter() - start
+        if chunk is None: return
+        yield chunk
+
+# Cell
+#######################################
+#              SENSORS                #
+#######################################
+
+# Cell
+def streamSensors(measurandId:int=None,
+                  refPoint:List[float]=None,
+                  maxDistance:float=None,
+                  numNearest:int=None,
+                  boundingBox:List[float]=None,
+                  boundingPolygon:List[float]=None,
+                  minAccuracy:int=None,
+                  maxAccuracy:int=None,
+                  maxSensors:int=None,
+                  allowsDerivatives:bool=None,
+                  allowsRedistribution:bool=None,
+                  requiresAttribution:bool=None,
+                  requiresChangeNote:bool=None,
+                  requiresShareAlike:bool=None,
+                  requiresKeepOpen:bool=None) -> Iterator[Sensor]:
+    """ HTTP: GET
+        Like getSensors(), but the Sensors are yielded one at a time, while the response is still downloading.
+        Only a single Sensor is decoded and held in memory at a time.
+
+        Input:
+        Note: All parameters are optional, and are the same as for getSensors().
+
+        Output:
+            - An Iterator over Sensors.
+    """
+    args = locals()
+    query = build_query(target='/sensors', **args)
+    return stream_get(query)
+
+# Cell
+def streamMySensors() -> Iterator[Sensor]:
+    """ HTTP: GET
+        Note: This function requires previous authentication.
+        Like mySensors(), but the Sensors are yielded one at a time, while the response is still downloading.
+
+        Output:
+            - An Iterator over the Sensors you've created / own.
+    """
+    query = build_query(target='/sensors/mysensors')
+    return stream_get(query, requires_auth=True)
+
+# Cell
+#######################################
+#                VALUES               #
+#######################################
+
+# Cell
+def iterValuesForSensor(id:int,
+                        minTimestamp:Union[str, datetime]=None,
+                        maxTimestamp:Union[str, datetime]=None,
+                        window:timedelta=timedelta(days=7),
+                        aggregationType:str=None,
+                        aggregationRange:str=None,
+                        minValue:float=None,
+                        maxValue:float=None) -> Iterator[Value]:
+    """ HTTP: GET
+        Like getValuesForSensor(), but the time range is requested in windows, one after the other,
+        and the values are yielded one at a time.
+        Only the current and the next window are kept in memory, no matter how long the time range is.
+
+        Input:
+            - id: The id of the Sensor you want to get values from
+            - minTimestamp / maxTimestamp: Where to start and stop. Default to the first / last value of the Sensor.
+            - window: How much time to request at once.
+        Note: All other parameters are optional, and are passed on to getValuesForSensor().
+
+        Output:
+            - An Iterator over the values of the Sensor.
+        Example:
+            for value in iterValuesForSensor(123, '2015-01-01', '2020-01-01', window=timedelta(days=30)):
+                print(value) # {'timestamp': '2015-01-01T00:00:00.000Z', 'numberValue': 1.0}
+    """
+    if minTimestamp is None or maxTimestamp is None:
+        values = getFirstLastValueForSensor(id, first=minTimestamp is None, last=maxTimestamp is None)['values']
+        if not values: return
+        if minTimestamp is None: minTimestamp = values[0]['timestamp']
+        if maxTimestamp is None: maxTimestamp = values[-1]['timestamp']
+    kwargs = ({'id': id, 'minTimestamp': start, 'maxTimestamp': stop, 'aggregationType': aggregationType,
+               'aggregationRange': aggregationRange, 'minValue': minValue, 'maxValue': maxValue}
+              for start, stop in time_windows(minTimestamp, maxTimestamp, window))
+    for sensor in prefetch(getValuesForSensor, kwargs):
+        yield from sensor.get('values', [])
+
+# Cell
+def iterValues(minTimestamp:Union[str, datetime],
+               maxTimestamp:Union[str, datetime]=None,
+               window:timedelta=timedelta(days=1),
+               measurandId:int=None,
+               refPoint:List[float]=None,
+               maxDistance:float=None,
+               boundingBox:List[float]=None,
+               boundingPolygon:List[float]=None,
+               maxSensors:int=None,
+               aggregationType:str=None,
+               aggregationRange:str=None,
+               minValue:float=None,
+               maxValue:float=None,
+               allowsDerivatives:bool=None,
+               allowsRedistribution:bool=None,
+               requiresAttribution:bool=None,
+               requiresChangeNote:bool=None,
+               requiresShareAlike:bool=None,
+               requiresKeepOpen:bool=None) -> Iterator[SensorWithValue]:
+    """ HTTP: GET
+        Like getValues(), but the time range is requested in windows, one after the other.
+        Only the current and the next window are kept in memory, no matter how long the time range is.
+
+        Input:
+            - minTimestamp: Where to start.
+            - maxTimestamp: Where to stop. Defaults to now.
+            - window: How much time to request at once.
+        Note: All other parameters are optional, and are passed on to getValues().
+
+        Output:
+            - An Iterator over Sensors, each including its values from one window in the 'values' attribute.
+        Note: Each Sensor is yielded once per window in which it has values.
+    """
+    args = locals()
+    for key in ('minTimestamp', 'maxTimestamp', 'window'): args.pop(key)
+    if maxTimestamp is None: maxTimestamp = datetime.now(timezone.utc)
+    kwargs = ({**args, 'minTimestamp': start, 'maxTimestamp': stop}
+              for start, stop in time_windows(minTimestamp, maxTimestamp, window))
+    for sensors in prefetch(getValues, kwargs):
+        yield from sensors
+
+# Cell
+def streamValues(measurandId:int=None,
+                 refPoint:List[float]=None,
+                 maxDistance:float=None,
+                 boundingBox:List[float]=None,
+                 boundingPolygon:List[float]=None,
+                 maxSensors:int=None,
+                 minTimestamp:str=None,
+                 maxTimestamp:str=None,
+                 aggregationType:str=None,
+                 aggregationRange:str=None,
+                 minValue:float=None,
+                 maxValue:float=None,
+                 allowsDerivatives:bool=None,
+                 allowsRedistribution:bool=None,
+                 requiresAttribution:bool=None,
+                 requiresChangeNote:bool=None,
+                 requiresShareAlike:bool=None,
+                 requiresKeepOpen:bool=None) -> Iterator[SensorWithValue]:
+    """ HTTP: GET
+        Like getValues(), but the Sensors are yielded one at a time, while the response is still downloading.
+        Only a single Sensor and its values are decoded and held in memory at a time.
+
+        Input:
+        Note: All parameters are optional, and are the same as for getValues().
+
+        Output:
+            - An Iterator over Sensors, each including its matching values in the 'values' attribute.
+    """
+    args = locals()
+    query = build_query(target='/values', **args)
+    return stream_get(query)
\ No newline at end of file
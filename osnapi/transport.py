@@ -0,0 +1,249 @@
+# AUTOGENERATED! DO NOT EDIT! File to edit: 15_transport.ipynb (unless otherwise specified).
+
+__all__ = ['RequestsTransport', 'HTTPClientTransport']
+
+# Cell
+import zlib
+import time
+import select
+import threading
+import http.client
+from urllib.parse import urlsplit, quote
+from .core import Settings, ConnectFailed, get_session, record
+
+# Internal Cell
+from typing import List, Tuple, Dict, Union, Optional, Callable, Iterator
+
+# Cell
+#######################################
+#              REQUESTS               #
+#######################################
+
+# Internal Cell
+_adapter = None
+
+def timed_adapter():
+    """ The class of an HTTPAdapter whose connections report how long it took to open them, see observe().
+        It's only defined on first use, because that needs requests and urllib3.
+    """
+    global _adapter
+    if _adapter is not None: return _adapter
+    import urllib3
+    import requests.adapters
+
+    def _connect(connect):
+        def _timed(self):
+            start = time.perf_counter()
+            try: connect(self)
+            finally: record('connect', time.perf_counter() - start)
+        return _timed
+
+    class TimedHTTPConnection(urllib3.connection.HTTPConnection):
+        connect = _connect(urllib3.connection.HTTPConnection.connect)
+
+    class TimedHTTPSConnection(urllib3.connection.HTTPSConnection):
+        connect = _connect(urllib3.connection.HTTPSConnection.connect)
+
+    class TimedHTTPConnectionPool(urllib3.HTTPConnectionPool):
+        ConnectionCls = TimedHTTPConnection
+
+    class TimedHTTPSConnectionPool(urllib3.HTTPSConnectionPool):
+        ConnectionCls = TimedHTTPSConnection
+
+    class TimedAdapter(requests.adapters.HTTPAdapter):
+        def init_poolmanager(self, *args, **kwargs):
+            super().init_poolmanager(*args, **kwargs)
+            self.poolmanager.pool_classes_by_scheme = {'http': TimedHTTPConnectionPool,
+                                                       'https': TimedHTTPSConnectionPool}
+    _adapter = TimedAdapter
+    return _adapter
+
+# Cell
+class RequestsTransport():
+    """ Sends requests with the requests package, over the Session of get_session(), see Settings.session.
+        requests asks for every encoding urllib3 can decode, e.g. br and zstd if brotli and zstandard are installed.
+    """
+    def request(self, method:str, url:str, headers:Dict[str, str], data:bytes=None, timeout=None,
+                stream:bool=False) -> 'RequestsResponse':
+        return RequestsResponse(get_session().request(method, url, headers=headers, data=data, timeout=timeout,
+                                                      stream=stream))
+
+    def close(self): pass # the Session is closed by close_session()
+
+# Internal Cell
+class RequestsResponse():
+    """ A requests.Response, as every transport returns it: status_code, headers, content, iter_content(),
+        elapsed (seconds until the headers were read), request_bytes, received() and close().
+    """
+    def __init__(self, response):
+        self.response, self.status_code, self.headers = response, response.status_code, response.headers
+        self.elapsed = response.elapsed.total_seconds()
+        self.request_bytes = len(response.request.body) if response.request.body else 0
+
+    @property
+    def content(self) -> bytes: return self.response.content
+
+    def iter_content(self, chunk_size:int) -> Iterator[bytes]: return self.response.iter_content(chunk_size)
+
+    def received(self) -> int:
+        """The bytes of the body read so far, as sent by the Server, before they're decompressed"""
+        return self.response.raw.tell()
+
+    def close(self): self.response.close()
+    def __enter__(self): return self
+    def __exit__(self, *args): self.close()
+
+# Cell
+#######################################
+#             HTTP.CLIENT             #
+#######################################
+
+# Internal Cell
+class _Timed():
+    """Makes a connection report how long it took to open it, and raise ConnectFailed if that didn't work"""
+    read_timeout = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try: super().connect()
+        except OSError as e: raise ConnectFailed(f'Could not connect to {self.host}:{self.port}: {e!r}') from e
+        finally: record('connect', time.perf_counter() - start)
+        self.sock.settimeout(self.read_timeout)
+
+class TimedHTTPConnection(_Timed, http.client.HTTPConnection): pass
+class TimedHTTPSConnection(_Timed, http.client.HTTPSConnection): pass
+
+_idempotent = {'GET', 'HEAD', 'DELETE'} # sending these twice does no harm
+
+def _alive(connection:http.client.HTTPConnection) -> bool:
+    """Whether an idle connection is still open. If the Server closed it, its socket is readable (at the end)."""
+    if connection.sock is None: return False
+    try: readable, _, _ = select.select([connection.sock], [], [], 0)
+    except (OSError, ValueError): return False
+    return not readable
+
+# Cell
+class HTTPClientTransport():
+    """ Sends requests with http.client from the standard library, so nothing has to be installed,
+        and only modules that python itself uses are imported. Decodes gzip and deflate responses.
+
+        Input:
+            - pool_maxsize / keep_alive: Up to pool_maxsize idle connections per host are kept open for the next
+              requests, unless keep_alive is False. Default to the Settings.
+        Note: Proxies from the environment (HTTPS_PROXY, ...) are not used, unlike with requests.
+        Note: An idle connection that the Server closed is dropped before it's used. If one breaks anyway,
+              GET, HEAD and DELETE requests are sent again on a new one, but a POST raises the error.
+    """
+    accept_encoding = 'gzip, deflate'
+
+    def __init__(self, pool_maxsize:int=None, keep_alive:bool=None):
+        self.pool_maxsize = Settings.pool_maxsize if pool_maxsize is None else pool_maxsize
+        self.keep_alive = Settings.keep_alive if keep_alive is None else keep_alive
+        self.idle, self.lock = {}, threading.Lock() # (scheme, host, port) -> connections that are free to use
+
+    def _connection(self, key:Tuple[str, str, int], timeout) -> Tuple[http.client.HTTPConnection, bool]:
+        """An idle connection to key, or a new one that isn't open yet. Also returns whether it was used before."""
+        while True:
+            with self.lock:
+                idle = self.idle.get(key)
+                connection = idle.pop() if idle else None
+            if connection is None: break
+            if _alive(connection): return connection, True
+            connection.close()
+        scheme, host, port = key
+        cls = TimedHTTPSConnection if scheme == 'https' else TimedHTTPConnection
+        return cls(host, port, timeout=timeout), False
+
+    def release(self, key:Tuple[str, str, int], connection:http.client.HTTPConnection):
+        """Keep connection around for the next request to key, if there is room for it"""
+        with self.lock:
+            idle = self.idle.setdefault(key, [])
+            if self.keep_alive and len(idle) < self.pool_maxsize: return idle.append(connection)
+        connection.close()
+
+    def request(self, method:str, url:str, headers:Dict[str, str], data:bytes=None, timeout=None,
+                stream:bool=False) -> 'HTTPClientResponse':
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port)
+        connect_timeout, read_timeout = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+        path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+        path = quote(path, safe="!#$%&'()*+,/:;=?@[]~") # like requests does, e.g. for the spaces in boundingBox=[...]
+        headers = {'accept-encoding': self.accept_encoding, **headers}
+        if not self.keep_alive: headers['connection'] = 'close'
+        while True:
+            connection, reused = self._connection(key, connect_timeout)
+            connection.read_timeout = read_timeout
+            start = time.perf_counter()
+            try:
+                connection.request(method, path, body=data, headers=headers)
+                response = connection.getresponse()
+            except (ConnectionError, http.client.BadStatusLine) as e:
+                connection.close()
+                # the Server probably closed the idle connection before it got the request. That's only safe to
+                # send again if it changes nothing. A POST might have gone through, so Settings.retry_policy decides.
+                if reused and method in _idempotent and not isinstance(e, ConnectFailed): continue
+                raise
+            except BaseException:
+                connection.close()
+                raise
+            return HTTPClientResponse(response, self, key, connection, time.perf_counter() - start,
+                                      len(data) if data else 0, stream)
+
+    def close(self):
+        """Close all idle connections"""
+        with self.lock: idle, self.idle = self.idle, {}
+        for connection in (c for connections in idle.values() for c in connections): connection.close()
+
+# Internal Cell
+class HTTPClientResponse():
+    """ A response of the HTTPClientTransport, with the same attributes as a RequestsResponse.
+        Unless stream is True, the body is read right away, like requests does.
+        Once the body is read completely, the connection goes back to the transport for the next request.
+    """
+    def __init__(self, response:http.client.HTTPResponse, transport:HTTPClientTransport, key:Tuple[str, str, int],
+                 connection:http.client.HTTPConnection, elapsed:float, request_bytes:int, stream:bool):
+        self.status_code, self.headers = response.status, response.headers
+        self.elapsed, self.request_bytes = elapsed, request_bytes
+        self._response, self._transport, self._key, self._connection = response, transport, key, connection
+        self._received, self._content = 0, None
+        encoding = (response.getheader('content-encoding') or '').strip().lower()
+        self._decoder = (zlib.decompressobj(16 + zlib.MAX_WBITS) if encoding == 'gzip' else
+                         zlib.decompressobj() if encoding == 'deflate' else None)
+        if not stream: self._content = b''.join(self._chunks(64 * 1024))
+
+    def _chunks(self, chunk_size:int) -> Iterator[bytes]:
+        while True:
+            chunk = self._response.read(chunk_size)
+            if not chunk: break
+            self._received += len(chunk)
+            yield self._decoder.decompress(chunk) if self._decoder else chunk
+        if self._decoder: yield self._decoder.flush()
+        self._done()
+
+    def _done(self):
+        """The body was read completely, so the connection can be used again"""
+        connection, self._connection = self._connection, None
+        if connection is None: return
+        if self._response.will_close: connection.close()
+        else: self._transport.release(self._key, connection)
+
+    @property
+    def content(self) -> bytes:
+        if self._content is None: self._content = b''.join(self._chunks(64 * 1024))
+        return self._content
+
+    def iter_content(self, chunk_size:int) -> Iterator[bytes]:
+        if self._content is not None: yield self._content; return
+        yield from (chunk for chunk in self._chunks(chunk_size) if chunk)
+
+    def received(self) -> int:
+        """The bytes of the body read so far, as sent by the Server, before they're decompressed"""
+        return self._received
+
+    def close(self):
+        """Close the connection, unless the body was read completely and it went back to the transport"""
+        connection, self._connection = self._connection, None
+        if connection is not None: connection.close()
+
+    def __enter__(self): return self
+    def __exit__(self, *args): self.close()
\ No newline at end of file
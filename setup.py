@@ -21,6 +21,11 @@ statuses = [ '1 - Planning', '2 - Pre-Alpha', '3 - Alpha',
 py_versions = '2.0 2.1 2.2 2.3 2.4 2.5 2.6 2.7 3.0 3.1 3.2 3.3 3.4 3.5 3.6 3.7 3.8'.split()
 
 requirements = cfg.get('requirements','').split()
+extras_require = {} # 'extra:requirement' pairs, e.g. pip install osnapi[aio]
+for o in cfg.get('extras_requirements','').split():
+    extra, req = o.split(':', 1)
+    extras_require.setdefault(extra, []).append(req)
+extras_require['all'] = sorted({r for reqs in extras_require.values() for r in reqs})
 lic = licenses[cfg['license']]
 min_python = cfg['min_python']
 
@@ -37,6 +42,7 @@ setuptools.setup(
     packages = setuptools.find_packages(),
     include_package_data = True,
     install_requires = requirements,
+    extras_require = extras_require,
     dependency_links = cfg.get('dep_links','').split(),
     python_requires  = '>=' + cfg['min_python'],
     long_description = open('README.md').read(),